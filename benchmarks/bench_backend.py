@@ -0,0 +1,275 @@
+"""
+Benchmark das funções de backend sobre projetos Unreal sintéticos.
+
+Gera um ou mais projetos com benchmarks/synthetic_project.py e mede, sem interface
+gráfica, get_folder_size, calculate_project_cache_size, clean_project_cache,
+discover_unreal_projects e o motor de deleção (delete_tree) contra shutil.rmtree. Para cada etapa reporta tempo, arquivos/s, MB/s e o pico
+de memória (RSS) do processo até aquele ponto.
+
+Uso:
+    python benchmarks/bench_backend.py --files 200000 --projects 3
+    python benchmarks/bench_backend.py --files 50000 --json resultados.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import psutil  # noqa: E402
+
+from limpador.cleaning import clean_project_cache  # noqa: E402
+from limpador.config import POTENTIAL_CACHE_MAIN_FOLDERS  # noqa: E402
+from limpador.deletion import delete_tree  # noqa: E402
+from limpador.discovery import discover_unreal_projects  # noqa: E402
+from limpador.logger import ConsoleLogger, NullLogger  # noqa: E402
+from limpador.sizes import (  # noqa: E402
+    DirectorySizeIndex,
+    calculate_project_cache_size,
+    get_folder_size,
+)
+from synthetic_project import (  # noqa: E402
+    SIZE_DISTRIBUTIONS,
+    churn_saved_logs,
+    generate_project,
+)
+
+
+def peak_rss_mb():
+    """Pico de RSS do processo em MB (ru_maxrss no Linux/macOS; psutil no Windows)."""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta em KB, macOS em bytes
+        return peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+    except ImportError:
+        memory_info = psutil.Process().memory_info()
+        return getattr(memory_info, "peak_wset", memory_info.rss) / (1024 * 1024)
+
+
+def run_step(results, label, func, files, logical_bytes, repeats=1):
+    """Executa 'func' 'repeats' vezes, guarda o melhor tempo e imprime a linha do relatório."""
+    best = None
+    value = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    best = max(best, 1e-9)
+    row = {
+        "step": label,
+        "seconds": round(best, 4),
+        "files_per_second": round(files / best, 1),
+        "mb_per_second": round(logical_bytes / (1024 * 1024) / best, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    results.append(row)
+    print(
+        f"  {label:<38} {row['seconds']:9.3f}s "
+        f"{row['files_per_second']:>12,.0f} arq/s "
+        f"{row['mb_per_second']:>10,.1f} MB/s  "
+        f"pico RSS {row['peak_rss_mb']:,.1f} MB"
+    )
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--files", type=int, default=100_000, help="Arquivos por projeto"
+    )
+    parser.add_argument("--projects", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--files-per-dir", type=int, default=64)
+    parser.add_argument("--ddc-fanout", type=int, default=16)
+    parser.add_argument(
+        "--size-distribution", choices=SIZE_DISTRIBUTIONS, default="lognormal"
+    )
+    parser.add_argument("--mean-kb", type=float, default=64)
+    parser.add_argument("--saved-logs", type=int, default=200)
+    parser.add_argument(
+        "--churn", type=int, default=50, help="Logs girados antes da reanálise"
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--work-dir", help="Pasta de trabalho (padrão: temporária)")
+    parser.add_argument("--keep", action="store_true", help="Não apaga os projetos")
+    parser.add_argument("--json", help="Grava os resultados neste arquivo JSON")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Mostra os logs do backend"
+    )
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="bench_backend_")
+    projects_root = os.path.join(work_dir, "Projects")
+    os.makedirs(projects_root, exist_ok=True)
+    results = []
+
+    try:
+        print(
+            f"Gerando {args.projects} projeto(s) com {args.files} arquivos "
+            f"em '{projects_root}'..."
+        )
+        start = time.perf_counter()
+        projects = [
+            generate_project(
+                projects_root,
+                name=f"SynthProject{index:02d}",
+                files=args.files,
+                depth=args.depth,
+                files_per_dir=args.files_per_dir,
+                ddc_fanout=args.ddc_fanout,
+                size_distribution=args.size_distribution,
+                mean_kb=args.mean_kb,
+                saved_logs=args.saved_logs,
+                seed=args.seed + index,
+            )
+            for index in range(args.projects)
+        ]
+        print(f"  Geração concluída em {time.perf_counter() - start:.1f}s.")
+
+        logger = ConsoleLogger("DEBUG") if args.verbose else NullLogger()
+        total_files = sum(project["files"] for project in projects)
+        total_bytes = sum(project["bytes"] for project in projects)
+        project = projects[0]
+        all_items = sorted(project["items"])
+
+        print(f"Melhor de {args.repeats} execução(ões):")
+        discovered_projects, _ = run_step(
+            results,
+            "discover_unreal_projects",
+            lambda: discover_unreal_projects(projects_root, logger),
+            len(projects),
+            0,
+            args.repeats,
+        )
+        if len(discovered_projects) != len(projects):
+            print("ERRO: a descoberta não encontrou todos os projetos sintéticos!")
+            return 1
+
+        run_step(
+            results,
+            "get_folder_size (todos os projetos)",
+            lambda: sum(
+                get_folder_size(os.path.join(p["path"], folder_name))
+                for p in projects
+                for folder_name in POTENTIAL_CACHE_MAIN_FOLDERS
+            ),
+            total_files,
+            total_bytes,
+            args.repeats,
+        )
+
+        measured = run_step(
+            results,
+            "calculate_project_cache_size",
+            lambda: calculate_project_cache_size(
+                project["path"], all_items, logger
+            ),
+            project["files"],
+            project["bytes"],
+            args.repeats,
+        )
+        if measured != project["bytes"]:
+            print(
+                f"ERRO: tamanho medido ({measured}) difere do gerado "
+                f"({project['bytes']})!"
+            )
+            return 1
+
+        # Índice de tamanhos: primeira análise, reanálise sem mudanças e após churn de logs
+        size_index = DirectorySizeIndex(os.path.join(work_dir, "size_index.json"))
+        for label in ("calculate (índice frio)", "calculate (índice quente)"):
+            run_step(
+                results,
+                label,
+                lambda: calculate_project_cache_size(
+                    project["path"], all_items, logger, size_index=size_index
+                ),
+                project["files"],
+                project["bytes"],
+            )
+        churn_saved_logs(project["path"], args.churn, seed=args.seed)
+        run_step(
+            results,
+            f"calculate (índice, {args.churn} logs girados)",
+            lambda: calculate_project_cache_size(
+                project["path"], all_items, logger, size_index=size_index
+            ),
+            project["files"],
+            project["bytes"],
+        )
+
+        # A limpeza é destrutiva: roda uma vez, sobre o último projeto gerado
+        cleaned_project = projects[-1]
+        cleaned_items = sorted(cleaned_project["items"])
+        cleaned_files = cleaned_project["files"]
+        cleaned_bytes = calculate_project_cache_size(
+            cleaned_project["path"], cleaned_items, logger
+        )
+        space_freed, _, errors = run_step(
+            results,
+            "clean_project_cache",
+            lambda: clean_project_cache(
+                cleaned_project["path"], logger, cleaned_items
+            ),
+            cleaned_files,
+            cleaned_bytes,
+        )
+        if errors:
+            print(f"AVISO: {len(errors)} erro(s) durante a limpeza.")
+        print(
+            f"  Espaço liberado reportado: {space_freed} bytes "
+            f"(esperado {cleaned_bytes})."
+        )
+
+        # Motor de deleção contra shutil.rmtree, sobre duas cópias idênticas do mesmo projeto
+        for label, delete in (
+            ("shutil.rmtree (projeto inteiro)", shutil.rmtree),
+            ("delete_tree (projeto inteiro)", delete_tree),
+        ):
+            copy = generate_project(
+                os.path.join(work_dir, "DeleteCopies"),
+                name=f"DeleteCopy{len(results)}",
+                files=args.files,
+                depth=args.depth,
+                files_per_dir=args.files_per_dir,
+                ddc_fanout=args.ddc_fanout,
+                size_distribution=args.size_distribution,
+                mean_kb=args.mean_kb,
+                saved_logs=args.saved_logs,
+                seed=args.seed,
+            )
+            run_step(
+                results,
+                label,
+                lambda: delete(copy["path"]),
+                copy["files"],
+                copy["bytes"],
+            )
+            if os.path.exists(copy["path"]):
+                print(f"ERRO: '{copy['path']}' não foi apagado por {label}!")
+                return 1
+
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"arguments": vars(args), "results": results}, f, indent=2
+                )
+            print(f"Resultados gravados em '{args.json}'.")
+    finally:
+        if not args.keep and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Benchmark do motor de tamanho de pastas.
+
+Gera uma árvore sintética (por padrão 1.000.000 de arquivos) e compara o
+get_folder_size atual (os.scandir + pool de threads) com o walker antigo
+baseado em os.walk + os.path.islink + os.path.getsize.
+
+Uso:
+    python benchmarks/bench_folder_size.py --files 1000000 --tree-dir D:\\bench_tree
+    python benchmarks/bench_folder_size.py --tree-dir D:\\bench_tree --keep   (reaproveita a árvore)
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limpador.sizes import get_folder_size  # noqa: E402
+
+
+def legacy_get_folder_size(folder_path):
+    """Walker original (os.walk + islink + getsize), mantido aqui só para comparação."""
+    total_size = 0
+    if not os.path.exists(folder_path):
+        return 0
+    for dirpath, dirnames, filenames in os.walk(folder_path):
+        for f in filenames:
+            fp = os.path.join(dirpath, f)
+            if not os.path.islink(fp):
+                try:
+                    total_size += os.path.getsize(fp)
+                except FileNotFoundError:
+                    pass
+    return total_size
+
+
+def generate_tree(root_path, total_files, files_per_dir, fanout, seed):
+    """
+    Cria uma árvore com 'total_files' arquivos distribuídos em pastas de até
+    'files_per_dir' arquivos, com 'fanout' subpastas por nível (parecido com o
+    layout em hash do DerivedDataCache). Os tamanhos são definidos com truncate,
+    então a árvore não ocupa o espaço lógico que reporta.
+    """
+    rng = random.Random(seed)
+    dir_count = max(1, (total_files + files_per_dir - 1) // files_per_dir)
+    created = 0
+    for dir_index in range(dir_count):
+        # Caminho do tipo 3/a/7 a partir do índice, com 'fanout' filhos por nível
+        parts = []
+        value = dir_index
+        while True:
+            parts.append(format(value % fanout, "x"))
+            value //= fanout
+            if value == 0:
+                break
+        dir_path = os.path.join(root_path, *parts)
+        os.makedirs(dir_path, exist_ok=True)
+        for file_index in range(min(files_per_dir, total_files - created)):
+            file_path = os.path.join(dir_path, f"{file_index:04d}.udd")
+            with open(file_path, "wb") as f:
+                f.truncate(rng.randint(0, 256 * 1024))
+            created += 1
+        if dir_index % 1000 == 0:
+            print(f"  Gerando árvore: {created}/{total_files} arquivos...", end="\r")
+    print(f"  Árvore gerada: {created} arquivos em {dir_count} pastas.          ")
+
+
+def time_call(label, func, path, repeats):
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<28} {best:8.2f}s  ({result} bytes)")
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--files-per-dir", type=int, default=250)
+    parser.add_argument("--fanout", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--tree-dir", help="Pasta da árvore sintética (padrão: pasta temporária)"
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Não apaga a árvore ao final"
+    )
+    args = parser.parse_args()
+
+    tree_dir = args.tree_dir or tempfile.mkdtemp(prefix="bench_folder_size_")
+    if not os.path.isdir(tree_dir) or not os.listdir(tree_dir):
+        print(f"Gerando {args.files} arquivos em '{tree_dir}'...")
+        generate_tree(
+            tree_dir, args.files, args.files_per_dir, args.fanout, args.seed
+        )
+    else:
+        print(f"Reaproveitando árvore existente em '{tree_dir}'.")
+
+    try:
+        print(f"Melhor de {args.repeats} execução(ões):")
+        legacy_time, legacy_total = time_call(
+            "os.walk (antigo)", legacy_get_folder_size, tree_dir, args.repeats
+        )
+        new_time, new_total = time_call(
+            "os.scandir + pool (atual)", get_folder_size, tree_dir, args.repeats
+        )
+        if legacy_total != new_total:
+            print("ERRO: os totais divergem!")
+            return 1
+        print(f"  Speedup: {legacy_time / new_time:.2f}x")
+    finally:
+        if not args.keep and not args.tree_dir:
+            shutil.rmtree(tree_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Benchmark do tempo de inicialização a frio dos dois caminhos de entrada.
+
+Cada medida roda um interpretador novo e reporta o melhor tempo de parede de: importar
+só o backend (limpador.cli), rodar 'app.py --help' (CLI) e importar a interface gráfica
+(limpador.gui, que traz customtkinter). Também confere que a CLI não carrega nenhum
+módulo de interface.
+
+Uso:
+    python benchmarks/bench_startup.py --repeats 10
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_MODULES = ("customtkinter", "tkinter", "pystray", "PIL", "winreg")
+
+STARTUP_CASES = (
+    ("python (interpretador vazio)", ["-c", "pass"]),
+    ("import limpador.cli", ["-c", "import limpador.cli"]),
+    ("app.py --help (CLI)", ["app.py", "--help"]),
+    ("import limpador.gui", ["-c", "import limpador.gui"]),
+)
+
+
+def time_command(arguments, repeats):
+    """Melhor tempo (s) de 'repeats' execuções de um interpretador novo, ou None se falhar."""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, *arguments],
+            cwd=REPOSITORY_PATH,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        elapsed = time.perf_counter() - start
+        if completed.returncode != 0:
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def gui_modules_loaded_by_cli():
+    """Módulos de interface presentes em sys.modules depois de importar limpador.cli."""
+    check = (
+        "import sys, limpador.cli; "
+        f"print(','.join(m for m in {GUI_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", check],
+        cwd=REPOSITORY_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    return [name for name in output.split(",") if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Melhor de {args.repeats} execução(ões):")
+    for label, arguments in STARTUP_CASES:
+        best = time_command(arguments, args.repeats)
+        if best is None:
+            print(f"  {label:<32} falhou (dependência ausente ou sem display?)")
+        else:
+            print(f"  {label:<32} {best * 1000:9.1f} ms")
+
+    loaded = gui_modules_loaded_by_cli()
+    if loaded:
+        print(f"ERRO: limpador.cli carregou módulos de interface: {', '.join(loaded)}")
+        return 1
+    print("OK: limpador.cli não carrega módulos de interface.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Gerador de projetos Unreal sintéticos para os benchmarks.
+
+Cria uma pasta de projeto com .uproject, Content, Intermediate, DerivedDataCache
+(com o layout em hash de DerivedDataCache/VT) e Saved (Logs, Autosaves, Config,
+arquivos soltos). Os tamanhos são definidos com truncate, então a árvore não ocupa
+o espaço lógico que reporta.
+
+Uso direto (gera e mantém o projeto):
+    python benchmarks/synthetic_project.py --root /tmp/synth --files 200000 --depth 3
+"""
+
+import argparse
+import math
+import os
+import random
+
+SIZE_DISTRIBUTIONS = ("lognormal", "uniform", "fixed")
+
+# Fração dos arquivos de cache que vai para cada pasta principal
+CACHE_FILE_SHARES = {"DerivedDataCache": 0.6, "Intermediate": 0.3, "Saved": 0.1}
+INTERMEDIATE_SUBFOLDERS = (
+    "Build",
+    "ShaderAutogen",
+    "ProjectFiles",
+    "CachedAssetRegistry",
+)
+SAVED_SUBFOLDERS = ("Autosaves", "Config", "Crashes")
+
+
+def draw_file_size(rng, distribution, mean_kb):
+    """Sorteia o tamanho de um arquivo (em bytes) segundo a distribuição escolhida."""
+    mean_bytes = mean_kb * 1024
+    if distribution == "fixed":
+        return int(mean_bytes)
+    if distribution == "uniform":
+        return rng.randint(0, int(2 * mean_bytes))
+    # lognormal: muitos arquivos pequenos e uma cauda de arquivos grandes, como no DDC
+    sigma = 1.2
+    mu = max(0.0, math.log(max(1.0, mean_bytes)) - sigma * sigma / 2)
+    return min(int(rng.lognormvariate(mu, sigma)), 512 * 1024 * 1024)
+
+
+def _write_file(path, size):
+    with open(path, "wb") as f:
+        f.truncate(size)
+
+
+def _hashed_dir(root_path, index, fanout, depth):
+    """Pasta do tipo a/3/f ('depth' níveis, 'fanout' filhos por nível) a partir de um índice."""
+    parts = []
+    value = index
+    for _ in range(depth):
+        parts.append(format(value % fanout, "x"))
+        value //= fanout
+    return os.path.join(root_path, *parts)
+
+
+def _fill_tree(
+    root_path,
+    file_count,
+    files_per_dir,
+    fanout,
+    depth,
+    rng,
+    distribution,
+    mean_kb,
+    suffix,
+):
+    """Distribui 'file_count' arquivos em pastas com hash sob 'root_path'. Retorna (arquivos, bytes)."""
+    total_bytes = 0
+    created = 0
+    dir_index = 0
+    while created < file_count:
+        dir_path = _hashed_dir(root_path, dir_index, fanout, depth)
+        os.makedirs(dir_path, exist_ok=True)
+        for file_index in range(min(files_per_dir, file_count - created)):
+            size = draw_file_size(rng, distribution, mean_kb)
+            file_name = f"{dir_index:05x}_{file_index:04d}{suffix}"
+            _write_file(os.path.join(dir_path, file_name), size)
+            total_bytes += size
+            created += 1
+        dir_index += 1
+    return created, total_bytes
+
+
+def generate_project(
+    root_dir,
+    name="SynthProject",
+    files=20000,
+    depth=3,
+    files_per_dir=64,
+    ddc_fanout=16,
+    size_distribution="lognormal",
+    mean_kb=64,
+    saved_logs=200,
+    seed=42,
+):
+    """
+    Gera um projeto sintético em root_dir/name e retorna um resumo:
+        {"path", "uproject", "files", "bytes", "items": {item_id: (arquivos, bytes)}}
+    'items' usa os mesmos identificadores de item de limpeza do aplicativo (pasta principal
+    para arquivos soltos, caminho relativo normalizado para subpastas).
+    """
+    if size_distribution not in SIZE_DISTRIBUTIONS:
+        raise ValueError(
+            f"Distribuição de tamanho desconhecida: '{size_distribution}'"
+        )
+    rng = random.Random(seed)
+    project_path = os.path.join(root_dir, name)
+    os.makedirs(os.path.join(project_path, "Content"), exist_ok=True)
+    uproject_path = os.path.join(project_path, f"{name}.uproject")
+    with open(uproject_path, "w", encoding="utf-8") as f:
+        f.write('{"FileVersion": 3, "EngineAssociation": "5.3"}\n')
+    _write_file(os.path.join(project_path, "Content", "Placeholder.uasset"), 4096)
+
+    items = {}
+
+    def add_item(item_id, tree_path, file_count, tree_depth, fanout, suffix):
+        count, size = _fill_tree(
+            tree_path,
+            file_count,
+            files_per_dir,
+            fanout,
+            tree_depth,
+            rng,
+            size_distribution,
+            mean_kb,
+            suffix,
+        )
+        previous = items.get(item_id, (0, 0))
+        items[item_id] = (previous[0] + count, previous[1] + size)
+
+    # DerivedDataCache: quase tudo em VT/ com fan-out em hash, como o DDC local do editor
+    ddc_files = int(files * CACHE_FILE_SHARES["DerivedDataCache"])
+    ddc_path = os.path.join(project_path, "DerivedDataCache")
+    add_item(
+        os.path.normpath("DerivedDataCache/VT"),
+        os.path.join(ddc_path, "VT"),
+        ddc_files,
+        depth,
+        ddc_fanout,
+        ".udd",
+    )
+
+    # Intermediate: algumas subpastas com árvores mais rasas
+    intermediate_files = int(files * CACHE_FILE_SHARES["Intermediate"])
+    intermediate_path = os.path.join(project_path, "Intermediate")
+    per_subfolder = max(1, intermediate_files // len(INTERMEDIATE_SUBFOLDERS))
+    for subfolder in INTERMEDIATE_SUBFOLDERS:
+        add_item(
+            os.path.normpath(f"Intermediate/{subfolder}"),
+            os.path.join(intermediate_path, subfolder),
+            per_subfolder,
+            max(1, depth - 1),
+            8,
+            ".obj",
+        )
+    add_item("Intermediate", intermediate_path, 4, 0, 1, ".txt")  # Arquivos soltos
+
+    # Saved: logs (girados por churn_saved_logs), subpastas e arquivos soltos
+    saved_path = os.path.join(project_path, "Saved")
+    logs_path = os.path.join(saved_path, "Logs")
+    os.makedirs(logs_path, exist_ok=True)
+    log_bytes = 0
+    for log_index in range(saved_logs):
+        size = draw_file_size(rng, size_distribution, mean_kb)
+        log_name = f"{name}-backup-{log_index:06d}.log"
+        _write_file(os.path.join(logs_path, log_name), size)
+        log_bytes += size
+    items[os.path.normpath("Saved/Logs")] = (saved_logs, log_bytes)
+    saved_files = max(
+        len(SAVED_SUBFOLDERS), int(files * CACHE_FILE_SHARES["Saved"]) - saved_logs
+    )
+    per_subfolder = max(1, saved_files // len(SAVED_SUBFOLDERS))
+    for subfolder in SAVED_SUBFOLDERS:
+        add_item(
+            os.path.normpath(f"Saved/{subfolder}"),
+            os.path.join(saved_path, subfolder),
+            per_subfolder,
+            1,
+            4,
+            ".sav",
+        )
+    add_item("Saved", saved_path, 3, 0, 1, ".txt")  # Arquivos soltos
+
+    return {
+        "path": project_path,
+        "uproject": uproject_path,
+        "files": sum(count for count, _ in items.values()),
+        "bytes": sum(size for _, size in items.values()),
+        "items": items,
+    }
+
+
+def churn_saved_logs(
+    project_path, rotate_count, seed=0, mean_kb=64, size_distribution="lognormal"
+):
+    """
+    Simula a rotação de logs do editor: apaga os 'rotate_count' logs mais antigos de Saved/Logs
+    e cria o mesmo número de logs novos. Retorna a variação de bytes.
+    """
+    rng = random.Random(seed)
+    logs_path = os.path.join(project_path, "Saved", "Logs")
+    log_names = sorted(os.listdir(logs_path))
+    delta = 0
+    for log_name in log_names[:rotate_count]:
+        log_path = os.path.join(logs_path, log_name)
+        delta -= os.path.getsize(log_path)
+        os.remove(log_path)
+    next_index = len(log_names)
+    for offset in range(rotate_count):
+        size = draw_file_size(rng, size_distribution, mean_kb)
+        log_name = f"churn-{seed:04d}-{next_index + offset:06d}.log"
+        _write_file(os.path.join(logs_path, log_name), size)
+        delta += size
+    return delta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--root", required=True, help="Pasta onde o projeto será criado"
+    )
+    parser.add_argument("--name", default="SynthProject")
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--files-per-dir", type=int, default=64)
+    parser.add_argument("--ddc-fanout", type=int, default=16)
+    parser.add_argument(
+        "--size-distribution", choices=SIZE_DISTRIBUTIONS, default="lognormal"
+    )
+    parser.add_argument("--mean-kb", type=float, default=64)
+    parser.add_argument("--saved-logs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    summary = generate_project(
+        args.root,
+        name=args.name,
+        files=args.files,
+        depth=args.depth,
+        files_per_dir=args.files_per_dir,
+        ddc_fanout=args.ddc_fanout,
+        size_distribution=args.size_distribution,
+        mean_kb=args.mean_kb,
+        saved_logs=args.saved_logs,
+        seed=args.seed,
+    )
+    print(
+        f"Projeto gerado em '{summary['path']}': {summary['files']} arquivos, "
+        f"{summary['bytes'] / (1024 ** 2):.1f} MB lógicos."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Limpador de cache de projetos Unreal.
+
+O backend (config, sizes, cleaning, processes, scheduler, watcher, discovery) não depende
+da interface gráfica e recebe um 'logger' (ver limpador.logger). A interface fica em
+limpador.gui e a linha de comando em limpador.cli.
+"""
@@ -0,0 +1,726 @@
+"""Limpeza das pastas de cache de um projeto e pipeline de limpeza em segundo plano."""
+
+import os
+import queue
+import threading
+import time
+
+from .deletion import delete_tree
+from .eviction import evict_to_budget
+from .logger import log_level_enabled
+from .processes import is_unreal_project_open
+from .purge import DEFAULT_DELETION_MODE, DELETION_MODE_STAGED
+from .retention import apply_retention_rule
+from .scheduler import IO_KIND_DELETE, IOScheduler
+from .sizes import calculate_project_cache_size, format_size
+
+
+def clean_project_cache(
+    project_path,
+    logger,
+    selected_cleanup_items,
+    cancel_event=None,
+    progress_callback=None,
+    size_index=None,
+    deletion_mode=DEFAULT_DELETION_MODE,
+    purger=None,
+    ddc_eviction_budget_bytes=None,
+    ddc_eviction_index=None,
+    retention_rules=None,
+):
+    """
+    Deleta os itens de cache selecionados para um projeto, incluindo arquivos soltos
+    nas pastas principais se suas subpastas forem limpas ou se a própria pasta principal
+    for selecionada para limpeza de arquivos soltos.
+
+    'selected_cleanup_items' é uma lista de strings:
+        - Nomes de pastas principais (ex: "Saved") para limpar arquivos soltos.
+        - Caminhos relativos normalizados de subpastas (ex: os.path.normpath("Saved/Logs")).
+    'cancel_event' (threading.Event, opcional): verificado antes de cada item; se marcado,
+        a limpeza é interrompida e os itens restantes não são tocados.
+    'progress_callback' (opcional): chamado como progress_callback(bytes_liberados, item_id)
+        ao terminar cada subpasta ou cada pasta principal de arquivos soltos.
+    'size_index' (opcional): entradas das subpastas deletadas são descartadas do índice.
+    'deletion_mode': com DELETION_MODE_STAGED e um 'purger' (BackgroundPurger), cada subpasta
+        é movida para a pasta de preparo e apagada em segundo plano; os bytes dessas subpastas
+        são reportados pelo purgador conforme são liberados, não no total retornado aqui.
+        Se o rename falhar (outro volume, arquivos em uso), a subpasta é apagada diretamente.
+    'ddc_eviction_budget_bytes' (opcional): as subpastas selecionadas do DerivedDataCache não
+        são apagadas inteiras; os arquivos menos usados recentemente delas são apagados até o
+        total caber no orçamento (ver eviction.evict_to_budget, que usa 'ddc_eviction_index').
+        Essas subpastas continuam existindo e não entram na lista de subpastas deletadas.
+    'retention_rules' (opcional): {item_id: regra} (ver retention.get_project_retention_rules).
+        Subpastas com regra não são apagadas inteiras: só os arquivos que a regra não mantém.
+    Retorna: space_freed_total, successfully_deleted_relative_subfolder_paths, errors
+    'space_freed_total' soma os bytes dos arquivos efetivamente apagados (contados durante a
+    deleção), então uma subpasta apagada só em parte contribui apenas com o que saiu do disco.
+    """
+    space_freed_total = 0
+    trace_enabled = log_level_enabled(logger, "TRACE")
+    successfully_deleted_relative_subfolder_paths = []
+    # Conjunto para rastrear pastas principais cujos arquivos soltos devem ser limpos
+    # (seja por seleção direta da pasta principal ou por limpeza de uma de suas subpastas)
+    main_folders_to_clean_loose_files = set()
+    errors = []
+
+    logger.log_message(
+        f"CLEAN_BACKEND: Iniciando limpeza para '{project_path}' com itens selecionados: {selected_cleanup_items}",
+        level="INFO",
+    )
+
+    # Passo 1: Deletar subpastas selecionadas e registrar suas pastas principais
+    subfolder_ids_to_delete = [
+        item for item in selected_cleanup_items if os.sep in item or "/" in item
+    ]
+    ddc_eviction_item_ids = []
+    if ddc_eviction_budget_bytes is not None:
+        ddc_eviction_item_ids = [
+            item for item in subfolder_ids_to_delete if _is_ddc_subfolder_item(item)
+        ]
+        subfolder_ids_to_delete = [
+            item for item in subfolder_ids_to_delete if item not in ddc_eviction_item_ids
+        ]
+    retention_item_ids = []
+    if retention_rules:
+        retention_item_ids = [
+            item
+            for item in subfolder_ids_to_delete
+            if os.path.normpath(item) in retention_rules
+        ]
+        subfolder_ids_to_delete = [
+            item for item in subfolder_ids_to_delete if item not in retention_item_ids
+        ]
+
+    cancelled = False
+    for relative_subfolder_path in subfolder_ids_to_delete:
+        if cancel_event is not None and cancel_event.is_set():
+            cancelled = True
+            break
+        space_freed_before_item = space_freed_total
+        abs_subfolder_path = os.path.join(project_path, relative_subfolder_path)
+        logger.log_message(
+            f"CLEAN_BACKEND: Verificando subpasta para limpeza: {abs_subfolder_path}",
+            level="DEBUG",
+        )
+
+        if os.path.exists(abs_subfolder_path) and os.path.isdir(abs_subfolder_path):
+            logger.log_message(
+                f"CLEAN_BACKEND: Tentando deletar subpasta {abs_subfolder_path}...",
+                level="INFO",
+            )
+            staged_path = None
+            if deletion_mode == DELETION_MODE_STAGED and purger is not None:
+                try:
+                    staged_path = purger.stage(
+                        project_path, relative_subfolder_path, abs_subfolder_path
+                    )
+                    logger.log_message(
+                        f"CLEAN_BACKEND: Subpasta {abs_subfolder_path} movida para '{staged_path}' (purga em segundo plano).",
+                        level="DEBUG",
+                    )
+                except OSError as e:
+                    logger.log_message(
+                        f"CLEAN_BACKEND: Não foi possível mover {abs_subfolder_path} para purga ({e}). Deletando diretamente.",
+                        level="WARNING",
+                    )
+            try:
+                if staged_path is None:
+                    # Bytes contados pelo próprio motor a partir do stat de cada arquivo apagado:
+                    # sem varredura prévia e exatos mesmo se alguns arquivos estiverem em uso
+                    deletion = delete_tree(abs_subfolder_path)
+                    space_freed_total += deletion["bytes_freed"]
+                    logger.log_message(
+                        f"CLEAN_BACKEND: {deletion['files_deleted']} arquivos e {deletion['dirs_deleted']} pastas apagados em {deletion['elapsed_seconds']:.2f}s ({deletion['files_per_second']:,.0f} arq/s, {format_size(deletion['bytes_per_second'])}/s).",
+                        level="DEBUG",
+                    )
+                    if deletion["errors_total"]:
+                        logger.log_message(
+                            f"CLEAN_BACKEND: {deletion['errors_total']} erro(s) ao deletar {abs_subfolder_path}. Primeiro: {deletion['errors'][0]}",
+                            level="ERROR",
+                        )
+                        errors.extend(
+                            f"CLEAN_BACKEND: Erro ao deletar {error}"
+                            for error in deletion["errors"]
+                        )
+                        if deletion["errors_total"] > len(deletion["errors"]):
+                            errors.append(
+                                f"CLEAN_BACKEND: ... e mais {deletion['errors_total'] - len(deletion['errors'])} erro(s) em {abs_subfolder_path}"
+                            )
+                # No modo "staged" os bytes são reportados pelo purgador conforme ele apaga
+
+                if not os.path.exists(abs_subfolder_path):  # Confirma que foi deletado
+                    if staged_path is not None:
+                        logger.log_message(
+                            f"CLEAN_BACKEND: Subpasta {abs_subfolder_path} movida, purga pendente (o espaço aparece conforme o purgador apaga).",
+                            level="SUCCESS",
+                        )
+                    else:
+                        logger.log_message(
+                            f"CLEAN_BACKEND: Deletada com sucesso subpasta: {abs_subfolder_path} ({format_size(space_freed_total - space_freed_before_item)})",
+                            level="SUCCESS",
+                        )
+                    successfully_deleted_relative_subfolder_paths.append(
+                        relative_subfolder_path
+                    )
+                    if size_index is not None:
+                        size_index.forget(abs_subfolder_path)
+
+                    # Adiciona a pasta pai (Saved, Intermediate, etc.) ao conjunto para limpeza de arquivos soltos
+                    # Pega o primeiro componente do caminho relativo (ex: "Saved" de "Saved/Logs")
+                    parent_folder_name = relative_subfolder_path.split(os.sep)[0]
+                    if parent_folder_name in [
+                        "Intermediate",
+                        "DerivedDataCache",
+                        "Saved",
+                    ]:
+                        main_folders_to_clean_loose_files.add(parent_folder_name)
+                        logger.log_message(
+                            f"CLEAN_BACKEND: Pasta principal '{parent_folder_name}' marcada para limpeza de arquivos soltos devido à deleção de subpasta.",
+                            level="TRACE",
+                        )
+                else:
+                    logger.log_message(
+                        f"CLEAN_BACKEND: Subpasta {abs_subfolder_path} ainda existe após a tentativa de deleção ({format_size(space_freed_total - space_freed_before_item)} liberados).",
+                        level="WARNING",
+                    )
+                    errors.append(f"Falha ao confirmar deleção de {abs_subfolder_path}")
+            except OSError as e:
+                error_msg = (
+                    f"CLEAN_BACKEND: Erro ao deletar subpasta {abs_subfolder_path}: {e}"
+                )
+                logger.log_message(error_msg, level="ERROR")
+                errors.append(error_msg)
+        else:
+            logger.log_message(
+                f"CLEAN_BACKEND: Subpasta '{relative_subfolder_path}' não encontrada ou não é diretório em '{project_path}'.",
+                level="WARNING",
+            )
+
+        if progress_callback is not None:
+            progress_callback(
+                space_freed_total - space_freed_before_item, relative_subfolder_path
+            )
+
+    # Passo 1b: Despejo LRU das subpastas do DerivedDataCache até o orçamento
+    if ddc_eviction_item_ids and not (
+        cancelled or (cancel_event is not None and cancel_event.is_set())
+    ):
+        logger.log_message(
+            f"CLEAN_BACKEND: Despejando arquivos menos usados de {ddc_eviction_item_ids} até {format_size(ddc_eviction_budget_bytes)}...",
+            level="INFO",
+        )
+        eviction = evict_to_budget(
+            [os.path.join(project_path, item) for item in ddc_eviction_item_ids],
+            ddc_eviction_budget_bytes,
+            logger,
+            index=ddc_eviction_index,
+            stop_event=cancel_event,
+        )
+        space_freed_total += eviction["bytes_freed"]
+        logger.log_message(
+            f"CLEAN_BACKEND: Despejo do DerivedDataCache: {eviction['files_deleted']} arquivos e {eviction['dirs_pruned']} pastas vazias removidos, {format_size(eviction['bytes_before'])} -> {format_size(eviction['bytes_after'])} em {eviction['elapsed_seconds']:.2f}s.",
+            level="SUCCESS" if eviction["bytes_freed"] else "INFO",
+        )
+        if eviction["errors_total"]:
+            logger.log_message(
+                f"CLEAN_BACKEND: {eviction['errors_total']} erro(s) no despejo do DerivedDataCache. Primeiro: {eviction['errors'][0]}",
+                level="ERROR",
+            )
+            errors.extend(
+                f"CLEAN_BACKEND: Erro ao despejar {error}"
+                for error in eviction["errors"]
+            )
+        if progress_callback is not None:
+            # Os bytes do despejo vão todos no primeiro item; os demais só fecham a contagem
+            for position, item_id in enumerate(ddc_eviction_item_ids):
+                progress_callback(eviction["bytes_freed"] if position == 0 else 0, item_id)
+
+    # Passo 1c: Regras de retenção (apaga só os arquivos que a regra não mantém)
+    for relative_subfolder_path in retention_item_ids:
+        if cancelled or (cancel_event is not None and cancel_event.is_set()):
+            cancelled = True
+            break
+        abs_subfolder_path = os.path.join(project_path, relative_subfolder_path)
+        rule = retention_rules[os.path.normpath(relative_subfolder_path)]
+        retention = {"bytes_reclaimed": 0}
+        if os.path.isdir(abs_subfolder_path):
+            retention = apply_retention_rule(
+                abs_subfolder_path, rule, stop_event=cancel_event
+            )
+            space_freed_total += retention["bytes_reclaimed"]
+            logger.log_message(
+                f"CLEAN_BACKEND: Retenção {rule} em '{relative_subfolder_path}': {format_size(retention['bytes_reclaimed'])} liberados ({retention['files_deleted']} arquivos), {format_size(retention['bytes_retained'])} retidos ({retention['files_retained']} arquivos).",
+                level="SUCCESS" if retention["bytes_reclaimed"] else "INFO",
+            )
+            if retention["errors_total"]:
+                logger.log_message(
+                    f"CLEAN_BACKEND: {retention['errors_total']} erro(s) ao aplicar a retenção em {abs_subfolder_path}. Primeiro: {retention['errors'][0]}",
+                    level="ERROR",
+                )
+                errors.extend(
+                    f"CLEAN_BACKEND: Erro ao deletar {error}"
+                    for error in retention["errors"]
+                )
+        else:
+            logger.log_message(
+                f"CLEAN_BACKEND: Subpasta '{relative_subfolder_path}' não encontrada ou não é diretório em '{project_path}'.",
+                level="WARNING",
+            )
+        if progress_callback is not None:
+            progress_callback(retention["bytes_reclaimed"], relative_subfolder_path)
+
+    # Passo 2: Adicionar pastas principais que foram explicitamente selecionadas para limpeza de arquivos soltos
+    explicitly_selected_main_folder_ids = [
+        item
+        for item in selected_cleanup_items
+        if (os.sep not in item and "/" not in item)
+        and item in ["Intermediate", "DerivedDataCache", "Saved"]
+    ]
+    for main_folder_name in explicitly_selected_main_folder_ids:
+        main_folders_to_clean_loose_files.add(main_folder_name)
+        logger.log_message(
+            f"CLEAN_BACKEND: Pasta principal '{main_folder_name}' explicitamente selecionada para limpeza de arquivos soltos.",
+            level="TRACE",
+        )
+
+    # Passo 3: Deletar arquivos soltos das pastas principais identificadas
+    cleaned_loose_files_summary = (
+        []
+    )  # Para logar quais pastas tiveram arquivos soltos limpos
+
+    for main_folder_name in main_folders_to_clean_loose_files:
+        if cancelled or (cancel_event is not None and cancel_event.is_set()):
+            cancelled = True
+            break
+        space_freed_before_item = space_freed_total
+        abs_main_folder_path = os.path.join(project_path, main_folder_name)
+        logger.log_message(
+            f"CLEAN_BACKEND: Verificando arquivos soltos para limpeza em: {abs_main_folder_path}",
+            level="DEBUG",
+        )
+
+        if os.path.exists(abs_main_folder_path) and os.path.isdir(abs_main_folder_path):
+            files_deleted_count_in_main = 0
+            space_freed_this_main_loose = 0
+            try:
+                for item_name in os.listdir(abs_main_folder_path):
+                    item_abs_path = os.path.join(abs_main_folder_path, item_name)
+                    if os.path.isfile(item_abs_path) and not os.path.islink(
+                        item_abs_path
+                    ):
+                        if trace_enabled:
+                            logger.log_message(
+                                f"CLEAN_BACKEND: Tentando deletar arquivo solto: {item_abs_path}",
+                                level="TRACE",
+                            )
+                        try:
+                            file_size = os.path.getsize(item_abs_path)
+                            os.remove(item_abs_path)
+                            space_freed_total += file_size  # Adiciona ao total geral
+                            space_freed_this_main_loose += file_size
+                            files_deleted_count_in_main += 1
+                        except Exception as e_file_del:
+                            error_msg_file = f"CLEAN_BACKEND: Erro ao deletar arquivo solto {item_abs_path}: {e_file_del}"
+                            logger.log_message(error_msg_file, level="ERROR")
+                            errors.append(error_msg_file)
+
+                if files_deleted_count_in_main > 0:
+                    log_msg_loose = f"Deletados {files_deleted_count_in_main} arquivos soltos de '{main_folder_name}', liberando {format_size(space_freed_this_main_loose)}."
+                    logger.log_message(
+                        f"CLEAN_BACKEND: {log_msg_loose}", level="SUCCESS"
+                    )
+                    cleaned_loose_files_summary.append(
+                        f"{main_folder_name} ({format_size(space_freed_this_main_loose)})"
+                    )
+                else:
+                    logger.log_message(
+                        f"CLEAN_BACKEND: Nenhum arquivo solto encontrado ou deletado em '{main_folder_name}'.",
+                        level="DEBUG",
+                    )
+
+            except Exception as e_list_main:
+                error_msg_list = f"CLEAN_BACKEND: Erro ao listar arquivos em {abs_main_folder_path} para limpeza de arquivos soltos: {e_list_main}"
+                logger.log_message(error_msg_list, level="ERROR")
+                errors.append(error_msg_list)
+        else:
+            logger.log_message(
+                f"CLEAN_BACKEND: Pasta principal '{main_folder_name}' não encontrada para verificar arquivos soltos.",
+                level="WARNING",
+            )
+
+        if progress_callback is not None:
+            progress_callback(
+                space_freed_total - space_freed_before_item, main_folder_name
+            )
+
+    if cancelled:
+        logger.log_message(
+            f"CLEAN_BACKEND: Limpeza de '{project_path}' cancelada antes de concluir todos os itens.",
+            level="WARNING",
+        )
+
+    # Monta a lista final de itens limpos para o log (subpastas + indicação de arquivos soltos)
+    final_cleaned_items_summary = successfully_deleted_relative_subfolder_paths[
+        :
+    ]  # Cria uma cópia
+    if cleaned_loose_files_summary:
+        final_cleaned_items_summary.append(
+            f"Arquivos soltos de: {', '.join(cleaned_loose_files_summary)}"
+        )
+
+    logger.log_message(
+        f"CLEAN_BACKEND: Limpeza concluída para '{project_path}'. Total liberado: {format_size(space_freed_total)}. Itens afetados: {final_cleaned_items_summary if final_cleaned_items_summary else 'Nenhum'}. Erros: {len(errors)}",
+        level="INFO",
+    )
+
+    # Retorna os caminhos das SUBPASTAS que foram deletadas (para atualização da UI)
+    return space_freed_total, successfully_deleted_relative_subfolder_paths, errors
+
+
+# Ordem em que a limpeza automática remove os itens selecionados até atingir o alvo (low
+# watermark). Cada entrada é um item exato ("Saved/Logs") ou uma pasta principal ("Saved"),
+# que vale para os itens dela não listados antes. Itens que não casam com nada vão por último.
+# O DerivedDataCache fica no fim porque reconstruí-lo é o que mais custa ao reabrir o editor.
+DEFAULT_CLEANUP_PRIORITY_ORDER = [
+    os.path.normpath("Saved/Logs"),
+    os.path.normpath("Saved/Crashes"),
+    os.path.normpath("Saved/Telemetry"),
+    "Saved",
+    "Intermediate",
+    "DerivedDataCache",
+]
+
+
+def order_cleanup_items(item_ids, priority_order=None):
+    """Ordena itens de limpeza segundo 'priority_order' (ordem original entre empates)."""
+    if priority_order is None:
+        priority_order = DEFAULT_CLEANUP_PRIORITY_ORDER
+    ranks = {}
+    for rank, entry in enumerate(priority_order):
+        ranks.setdefault(os.path.normpath(entry), rank)
+
+    def item_rank(item_id):
+        normalized_item_id = os.path.normpath(item_id)
+        if normalized_item_id in ranks:
+            return ranks[normalized_item_id]
+        return ranks.get(normalized_item_id.split(os.sep)[0], len(ranks))
+
+    return sorted(item_ids, key=item_rank)
+
+
+def _is_ddc_subfolder_item(item_id):
+    parts = os.path.normpath(item_id).split(os.sep)
+    return len(parts) > 1 and parts[0] == "DerivedDataCache"
+
+
+def plan_cleanup_to_target(
+    item_sizes,
+    target_bytes,
+    priority_order=None,
+    ddc_eviction_budget_bytes=None,
+    retained_item_ids=(),
+):
+    """
+    Escolhe, na ordem de prioridade, os itens a limpar para que o tamanho selecionado caia
+    para 'target_bytes' ou menos. 'item_sizes' é {item_id: bytes} dos itens selecionados.
+
+    Limpar uma subpasta também apaga os arquivos soltos da pasta principal dela (ver
+    clean_project_cache), então o item da pasta principal, se selecionado, conta junto.
+    Com 'ddc_eviction_budget_bytes', as subpastas do DerivedDataCache são despejadas juntas
+    até o orçamento: entram todas de uma vez e liberam só o que passa do orçamento.
+    Itens em 'retained_item_ids' (com regra de retenção) nunca são escolhidos para limpeza
+    inteira; o tamanho deles continua no projetado.
+    Retorna (itens_a_limpar, tamanho_projetado).
+    """
+    projected_size = sum(item_sizes.values())
+    items_to_clean = []
+    freed_items = set()
+    ddc_eviction_item_ids = []
+    if ddc_eviction_budget_bytes is not None:
+        ddc_eviction_item_ids = [
+            item_id for item_id in item_sizes if _is_ddc_subfolder_item(item_id)
+        ]
+    for item_id in order_cleanup_items(list(item_sizes), priority_order):
+        if projected_size <= target_bytes:
+            break
+        if item_id in freed_items or item_id in retained_item_ids:
+            continue
+        if item_id in ddc_eviction_item_ids:
+            items_to_clean.extend(ddc_eviction_item_ids)
+            freed_items.update(ddc_eviction_item_ids)
+            projected_size -= max(
+                0,
+                sum(item_sizes[ddc_item] for ddc_item in ddc_eviction_item_ids)
+                - ddc_eviction_budget_bytes,
+            )
+            continue
+        items_to_clean.append(item_id)
+        freed_items.add(item_id)
+        projected_size -= item_sizes[item_id]
+        parent_folder_name = os.path.normpath(item_id).split(os.sep)[0]
+        if parent_folder_name != os.path.normpath(item_id):
+            for main_item_id in item_sizes:
+                if (
+                    main_item_id not in freed_items
+                    and os.path.normpath(main_item_id) == parent_folder_name
+                ):
+                    freed_items.add(main_item_id)
+                    projected_size -= item_sizes[main_item_id]
+    return items_to_clean, max(0, projected_size)
+
+
+# Quantos projetos de um mesmo volume (disco) podem ser limpos ao mesmo tempo.
+DEFAULT_MAX_CLEANS_PER_VOLUME = 1
+
+
+def get_volume_key(path):
+    """
+    Identifica o volume de um caminho: a letra do drive no Windows (ex: "C:")
+    ou o st_dev nos demais sistemas. Usado para agrupar projetos por disco.
+    """
+    drive, _ = os.path.splitdrive(os.path.abspath(path))
+    if drive:
+        return drive.upper()
+    try:
+        return f"dev:{os.stat(path).st_dev}"
+    except OSError:
+        return path
+
+
+class CleaningPipeline:
+    """
+    Limpeza de vários projetos em segundo plano, fora da thread do Tk.
+
+    Cada projeto passa pelos estágios: elegibilidade (projeto aberto no editor?),
+    deleção (clean_project_cache) e re-medição dos itens que continuam selecionados.
+    Cada projeto é uma tarefa de limpeza no 'io_scheduler' (IOScheduler) compartilhado: os
+    limites por disco valem junto com as análises em andamento, discos diferentes rodam em
+    paralelo e, no mesmo disco, análises e limpezas se alternam. Sem 'io_scheduler', um
+    agendador próprio com 'max_cleans_per_volume' limpezas por disco é usado. Com
+    'deletion_mode' DELETION_MODE_STAGED, o estágio de deleção só move as subpastas e o
+    'purger' as apaga depois.
+
+    O progresso é publicado em 'progress_queue' como tuplas (evento, chave, dados):
+        ("stage", chave, nome_do_estagio)
+        ("item_done", chave, {"item_id", "bytes_freed", "items_remaining", "bytes_freed_total"})
+        ("project_done", chave, resultado)
+        ("finished", None, resumo)
+    """
+
+    def __init__(
+        self,
+        jobs,
+        logger,
+        max_cleans_per_volume=DEFAULT_MAX_CLEANS_PER_VOLUME,
+        size_index=None,
+        editor_index=None,
+        deletion_mode=DEFAULT_DELETION_MODE,
+        purger=None,
+        ddc_eviction_index=None,
+        io_scheduler=None,
+    ):
+        # jobs: lista de dicts {"key", "path", "name", "selected_items", "uproject_path",
+        # "ddc_eviction_budget_bytes" e "retention_rules" (opcionais)} capturados na
+        # thread do Tk
+        self.jobs = list(jobs)
+        self.logger = logger
+        self.size_index = size_index
+        self.editor_index = editor_index
+        self.deletion_mode = deletion_mode
+        self.purger = purger
+        self.ddc_eviction_index = ddc_eviction_index
+        if io_scheduler is None:
+            io_scheduler = IOScheduler(max_deletes_per_device=max_cleans_per_volume)
+        self.io_scheduler = io_scheduler
+        self.cancel_event = threading.Event()
+        self.progress_queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._items_remaining = sum(len(job["selected_items"]) for job in self.jobs)
+        self._bytes_freed_total = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="CleaningPipeline", daemon=True
+        )
+        self._thread.start()
+
+    def cancel(self):
+        """Pede o cancelamento: o item em andamento termina, os restantes não são tocados."""
+        self.cancel_event.set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout=None):
+        """Espera a thread do pipeline terminar (ou 'timeout' segundos)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        started_at = time.perf_counter()
+        results = []
+        try:
+            futures = [
+                self.io_scheduler.submit(
+                    None,
+                    self._run_job,
+                    args=(job,),
+                    path=job["path"],
+                    kind=IO_KIND_DELETE,
+                    collect_result=False,
+                )
+                for job in self.jobs
+            ]
+            for job, future in zip(self.jobs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # _run_job já trata os erros do projeto; isto cobre falhas do agendador
+                    result = self._new_job_result(job)
+                    result["status"] = "error"
+                    result["errors"].append(str(e))
+                    results.append(result)
+                    self.progress_queue.put(("project_done", job["key"], result))
+        finally:
+            # Sempre publicado: a interface só sai do estado "limpando" com este evento
+            self.progress_queue.put(
+                ("finished", None, self._summarize(results, started_at))
+            )
+
+    def _summarize(self, results, started_at):
+        return {
+            "projects_total": len(results),
+            "projects_cleaned": sum(
+                1
+                for r in results
+                if r["deleted_subfolders"] or r["bytes_freed"] > 0 or r["errors"]
+            ),
+            "projects_skipped_open": sum(1 for r in results if r["status"] == "open"),
+            "projects_cancelled": sum(
+                1 for r in results if r["status"] == "cancelled"
+            ),
+            "projects_with_errors": sum(1 for r in results if r["errors"]),
+            "bytes_freed": sum(r["bytes_freed"] for r in results),
+            "cancelled": self.cancel_event.is_set(),
+            "elapsed_seconds": time.perf_counter() - started_at,
+        }
+
+    def _report_item_done(self, job, bytes_freed, item_id):
+        with self._lock:
+            self._bytes_freed_total += bytes_freed
+            if item_id in job["selected_items"]:
+                self._items_remaining = max(0, self._items_remaining - 1)
+            items_remaining = self._items_remaining
+            bytes_freed_total = self._bytes_freed_total
+        self.progress_queue.put(
+            (
+                "item_done",
+                job["key"],
+                {
+                    "item_id": item_id,
+                    "bytes_freed": bytes_freed,
+                    "items_remaining": items_remaining,
+                    "bytes_freed_total": bytes_freed_total,
+                },
+            )
+        )
+
+    @staticmethod
+    def _new_job_result(job):
+        return {
+            "status": "cancelled",
+            "items": list(job["selected_items"]),
+            "bytes_freed": 0,
+            "deleted_subfolders": [],
+            "errors": [],
+            "remaining_size": None,
+            "duration_seconds": None,
+        }
+
+    def _run_job(self, job):
+        """
+        Roda os estágios de um projeto. Qualquer exceção vira um erro no resultado (status
+        "error" se a deleção nem começou) e "project_done" é sempre publicado.
+        """
+        result = self._new_job_result(job)
+        try:
+            self._run_job_stages(job, result)
+        except Exception as e:
+            self.logger.log_message(
+                f"Limpeza Global: Erro inesperado em '{job['name']}': {e}",
+                level="ERROR",
+            )
+            result["errors"].append(str(e))
+            if result["status"] == "cancelled" and not self.cancel_event.is_set():
+                result["status"] = "error"
+        finally:
+            self.progress_queue.put(("project_done", job["key"], result))
+        return result
+
+    def _run_job_stages(self, job, result):
+        if self.cancel_event.is_set():
+            return
+
+        # Estágio 1: elegibilidade
+        self.progress_queue.put(("stage", job["key"], "eligibility"))
+        if is_unreal_project_open(
+            job["path"],
+            self.editor_index,
+            job.get("uproject_path"),
+        ):
+            self.logger.log_message(
+                f"Limpeza Global: Projeto '{job['name']}' está aberto. Pulando.",
+                level="WARNING",
+            )
+            result["status"] = "open"
+            return
+
+        # Estágio 2: deleção
+        self.progress_queue.put(("stage", job["key"], "delete"))
+        delete_started_at = time.perf_counter()
+        try:
+            space_freed, deleted_subfolders, errors = clean_project_cache(
+                job["path"],
+                self.logger,
+                job["selected_items"],
+                cancel_event=self.cancel_event,
+                size_index=self.size_index,
+                deletion_mode=self.deletion_mode,
+                purger=self.purger,
+                ddc_eviction_budget_bytes=job.get("ddc_eviction_budget_bytes"),
+                ddc_eviction_index=self.ddc_eviction_index,
+                retention_rules=job.get("retention_rules"),
+                progress_callback=lambda freed, item_id: self._report_item_done(
+                    job, freed, item_id
+                ),
+            )
+        except Exception as e:
+            space_freed, deleted_subfolders, errors = 0, [], [str(e)]
+            self.logger.log_message(
+                f"Limpeza Global: Erro inesperado ao limpar '{job['name']}': {e}",
+                level="ERROR",
+            )
+        result["duration_seconds"] = time.perf_counter() - delete_started_at
+        result["bytes_freed"] = space_freed
+        result["deleted_subfolders"] = deleted_subfolders
+        result["errors"] = errors
+        result["status"] = (
+            "cancelled" if self.cancel_event.is_set() else "cleaned"
+        )
+
+        # Estágio 3: re-medição do que continua selecionado (itens não deletados)
+        self.progress_queue.put(("stage", job["key"], "measure"))
+        deleted_set = {os.path.normpath(p) for p in deleted_subfolders}
+        remaining_items = [
+            item_id
+            for item_id in job["selected_items"]
+            if os.path.normpath(item_id) not in deleted_set
+        ]
+        result["remaining_size"] = (
+            calculate_project_cache_size(
+                job["path"], remaining_items, self.logger, size_index=self.size_index
+            )
+            if remaining_items
+            else 0
+        )
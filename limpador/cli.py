@@ -0,0 +1,568 @@
+"""
+Linha de comando do Limpador (sem interface gráfica).
+
+Subcomandos:
+    scan      mede as pastas de cache de um ou mais projetos
+    clean     limpa itens de cache de um projeto
+    discover  procura projetos Unreal em uma ou mais pastas
+    watch     acompanha as mudanças de tamanho do cache dos projetos
+    pressure  limpa projetos dos volumes com pouco espaço livre até voltar ao alvo
+    history   mostra os itens que mais cresceram e o que as limpezas liberaram
+
+Este módulo não importa customtkinter, pystray, PIL nem winreg, então roda em máquinas
+sem display (agentes de build Linux). Sem caminhos, scan/watch usam os projetos salvos
+no arquivo de configuração da interface gráfica.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+
+from .cleaning import clean_project_cache
+from .config import (
+    ABSOLUTE_CONFIG_PATH,
+    ABSOLUTE_DDC_EVICTION_INDEX_PATH,
+    ABSOLUTE_DISCOVERY_CACHE_PATH,
+    ABSOLUTE_HISTORY_DB_PATH,
+    ABSOLUTE_PURGE_JOURNAL_PATH,
+    ABSOLUTE_SIZE_INDEX_PATH,
+    load_config_data,
+)
+from .discovery import (
+    ProjectDiscoveryCache,
+    discover_unreal_projects,
+    get_project_search_settings,
+)
+from .eviction import DdcEvictionIndex, get_project_ddc_eviction_budget
+from .history import ScanHistoryStore
+from .logger import DEFAULT_LOG_LEVEL, LOG_LEVEL_ORDER, ConsoleLogger
+from .pressure import get_disk_pressure_watermarks, relieve_disk_pressure
+from .processes import is_unreal_project_open
+from .purge import (
+    DEFAULT_DELETION_MODE,
+    DELETION_MODE_STAGED,
+    DELETION_MODES,
+    BackgroundPurger,
+)
+from .retention import get_project_retention_rules
+from .sizes import (
+    DirectorySizeIndex,
+    calculate_project_cache_size,
+    calculate_selected_size_from_breakdown,
+    format_size,
+    scan_project_cache_breakdown,
+)
+from .watcher import CacheChangeWatcher
+
+CLI_SUBCOMMANDS = ("scan", "clean", "discover", "watch", "pressure", "history")
+
+
+def _configured_projects(config_path):
+    """Projetos salvos pela interface gráfica: lista de dicts com "path" e "selected_cleanup_items"."""
+    return [
+        project
+        for project in load_config_data(config_path).get("projects", [])
+        if project.get("path")
+    ]
+
+
+def _resolve_projects(paths, config_path):
+    """Projetos a partir dos caminhos informados ou, sem caminhos, do arquivo de configuração."""
+    configured = {
+        os.path.normcase(os.path.normpath(project["path"])): project
+        for project in _configured_projects(config_path)
+    }
+    if not paths:
+        return list(configured.values())
+    projects = []
+    for path in paths:
+        key = os.path.normcase(os.path.normpath(os.path.abspath(path)))
+        projects.append(configured.get(key, {"path": os.path.abspath(path)}))
+    return projects
+
+
+def _open_size_index(args):
+    if args.no_size_index:
+        return None
+    size_index = DirectorySizeIndex(args.size_index)
+    size_index.load()
+    return size_index
+
+
+def _breakdown_items(breakdown):
+    """Lista (item_id, bytes) de um detalhamento: arquivos soltos de cada pasta principal e subpastas."""
+    items = []
+    for folder_name, folder_info in breakdown["main_folders"].items():
+        items.append((folder_name, folder_info["loose"]))
+        items.extend(sorted(folder_info["subfolders"].items()))
+    return items
+
+
+def _command_scan(args, logger):
+    projects = _resolve_projects(args.paths, args.config)
+    if not projects:
+        print("Nenhum projeto informado nem salvo na configuração.", file=sys.stderr)
+        return 2
+    size_index = _open_size_index(args)
+    results = []
+    for project in projects:
+        project_path = project["path"]
+        if not os.path.isdir(project_path):
+            logger.log_message(
+                f"SCAN: Pasta do projeto não encontrada: '{project_path}'",
+                level="ERROR",
+            )
+            continue
+        breakdown = scan_project_cache_breakdown(project_path, logger, size_index)
+        selected_items = args.items or project.get("selected_cleanup_items") or []
+        selected_size, missing_items = calculate_selected_size_from_breakdown(
+            breakdown, selected_items
+        )
+        for item_id in missing_items:
+            logger.log_message(
+                f"SCAN: Item '{item_id}' não existe em '{project_path}'.",
+                level="DEBUG",
+            )
+        results.append(
+            {
+                "path": project_path,
+                "total": breakdown["total"],
+                "selected": selected_size,
+                "items": dict(_breakdown_items(breakdown)),
+            }
+        )
+        if not args.json:
+            print(f"{project_path}")
+            print(f"  Total potencial: {format_size(breakdown['total'])}")
+            if selected_items:
+                print(f"  Itens selecionados: {format_size(selected_size)}")
+            for item_id, item_size in _breakdown_items(breakdown):
+                marker = "*" if item_id in selected_items else " "
+                print(f"  {marker} {item_id:<40} {format_size(item_size):>12}")
+    if size_index is not None:
+        size_index.save(force=True)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0 if len(results) == len(projects) else 1
+
+
+def _command_clean(args, logger):
+    project = _resolve_projects([args.path], args.config)[0]
+    project_path = project["path"]
+    if not os.path.isdir(project_path):
+        print(f"Pasta do projeto não encontrada: '{project_path}'", file=sys.stderr)
+        return 2
+    selected_items = args.items or project.get("selected_cleanup_items") or []
+    if not selected_items:
+        print(
+            "Nenhum item de limpeza informado (--items) nem salvo na configuração.",
+            file=sys.stderr,
+        )
+        return 2
+    if is_unreal_project_open(project_path):
+        print(
+            f"O projeto '{project_path}' está aberto no editor; limpeza cancelada.",
+            file=sys.stderr,
+        )
+        return 3
+
+    size_index = _open_size_index(args)
+    if not args.yes:
+        breakdown = scan_project_cache_breakdown(project_path, logger, size_index)
+        selected_size, _ = calculate_selected_size_from_breakdown(
+            breakdown, selected_items
+        )
+        print(f"Itens a limpar em '{project_path}': {', '.join(selected_items)}")
+        answer = input(f"Liberar {format_size(selected_size)}? [s/N] ")
+        if answer.strip().lower() not in ("s", "sim", "y", "yes"):
+            print("Limpeza cancelada.")
+            return 1
+
+    deletion_mode = args.deletion_mode or load_config_data(args.config).get(
+        "settings", {}
+    ).get("deletion_mode", DEFAULT_DELETION_MODE)
+    ddc_eviction_budget_bytes = get_project_ddc_eviction_budget(
+        (
+            {"ddc_eviction_budget_gb": args.ddc_budget_gb, "path": project_path}
+            if args.ddc_budget_gb is not None
+            else project
+        ),
+        logger,
+    )
+    ddc_eviction_index = None
+    if ddc_eviction_budget_bytes is not None:
+        ddc_eviction_index = DdcEvictionIndex(ABSOLUTE_DDC_EVICTION_INDEX_PATH)
+        ddc_eviction_index.load()
+    purger = None
+    if deletion_mode == DELETION_MODE_STAGED:
+        purger = BackgroundPurger(logger, ABSOLUTE_PURGE_JOURNAL_PATH)
+        purger.start()
+
+    space_freed, _, errors = clean_project_cache(
+        project_path,
+        logger,
+        selected_items,
+        size_index=size_index,
+        deletion_mode=deletion_mode,
+        purger=purger,
+        ddc_eviction_budget_bytes=ddc_eviction_budget_bytes,
+        ddc_eviction_index=ddc_eviction_index,
+        retention_rules=get_project_retention_rules(project, logger),
+    )
+    if size_index is not None:
+        size_index.save(force=True)
+    if ddc_eviction_index is not None:
+        ddc_eviction_index.save()
+    if purger is not None:
+        # O projeto já está limpo; espera o purgador apagar as subpastas movidas
+        print(
+            f"Projeto limpo. Apagando em segundo plano "
+            f"({purger.pending_count()} pasta(s))..."
+        )
+        try:
+            purger.wait_until_idle()
+        except KeyboardInterrupt:
+            print("Interrompido; a purga será retomada na próxima execução.")
+        purger.stop(timeout=2)
+        space_freed += purger.bytes_freed_total
+    print(f"Espaço liberado: {format_size(space_freed)}")
+    for error in errors:
+        print(f"  Erro: {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def _command_discover(args, logger):
+    settings = dict(load_config_data(args.config).get("settings", {}))
+    if args.base_paths:
+        settings["project_search_roots"] = args.base_paths
+    if args.max_depth is not None:
+        settings["project_search_max_depth"] = args.max_depth
+    search_roots, max_depth = get_project_search_settings(settings, logger)
+    discovery_cache = ProjectDiscoveryCache(ABSOLUTE_DISCOVERY_CACHE_PATH)
+    if not args.refresh:
+        discovery_cache.load()
+    projects, error_message = discover_unreal_projects(
+        search_roots, logger, max_depth, cache=discovery_cache
+    )
+    discovery_cache.save()
+    if args.json:
+        json.dump(projects, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for project in projects:
+            print(f"{project['name']:<32} {project['path']}")
+    if error_message and not projects:
+        print(error_message, file=sys.stderr)
+        return 1
+    return 0
+
+
+def _command_watch(args, logger):
+    projects = _resolve_projects(args.paths, args.config)
+    if not projects:
+        print("Nenhum projeto informado nem salvo na configuração.", file=sys.stderr)
+        return 2
+    size_index = _open_size_index(args)
+    watcher = CacheChangeWatcher(logger, size_index)
+    stop_event = threading.Event()
+    project_paths = {
+        CacheChangeWatcher.project_key(project["path"]): project["path"]
+        for project in projects
+    }
+    try:
+        watcher.set_watched_projects(project_paths.values())
+        mode = "inotify" if watcher.uses_inotify else "polling"
+        print(f"Observando {len(project_paths)} projeto(s) ({mode}). Ctrl+C para sair.")
+        while True:
+            changes = watcher.wait_for_changes(args.interval, stop_event)
+            for key, item_changes in changes.items():
+                project_path = project_paths.get(key, key)
+                for item_id, change in sorted(item_changes.items()):
+                    if change["dirty"] or item_id == CacheChangeWatcher.ALL_ITEMS:
+                        print(f"{project_path}: {item_id} mudou (tamanho a medir)")
+                    else:
+                        sign = "+" if change["delta"] >= 0 else "-"
+                        print(
+                            f"{project_path}: {item_id} "
+                            f"{sign}{format_size(abs(change['delta']))}"
+                        )
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        watcher.close()
+        if size_index is not None:
+            size_index.save(force=True)
+    return 0
+
+
+def _command_pressure(args, logger):
+    config_data = load_config_data(args.config)
+    settings = dict(config_data.get("settings", {}))
+    if args.low_free_gb is not None:
+        settings["disk_pressure_low_free_gb"] = args.low_free_gb
+    if args.target_free_gb is not None:
+        settings["disk_pressure_target_free_gb"] = args.target_free_gb
+    watermarks = get_disk_pressure_watermarks(settings, logger)
+    if watermarks is None:
+        print(
+            "Limite de espaço livre não configurado "
+            "('disk_pressure_low_free_gb' ou --low-free-gb).",
+            file=sys.stderr,
+        )
+        return 2
+    # Só projetos com "Permitir Limpeza" e itens selecionados na configuração
+    projects = [
+        {
+            "path": project["path"],
+            "name": project.get("name") or os.path.basename(project["path"]),
+            "data": project,
+            "selected_items": [
+                os.path.normpath(item_id)
+                for item_id in project.get("selected_cleanup_items", [])
+            ],
+        }
+        for project in _configured_projects(args.config)
+        if project.get("allow_clean")
+        and project.get("selected_cleanup_items")
+        and os.path.isdir(project["path"])
+    ]
+    if not projects:
+        print("Nenhum projeto com limpeza permitida na configuração.", file=sys.stderr)
+        return 2
+
+    size_index = _open_size_index(args)
+    ddc_eviction_index = DdcEvictionIndex(ABSOLUTE_DDC_EVICTION_INDEX_PATH)
+    ddc_eviction_index.load()
+    all_errors = []
+
+    def measure_reclaimable(project):
+        return calculate_project_cache_size(
+            project["path"], project["selected_items"], logger, size_index=size_index
+        )
+
+    def clean_project(project, reclaimable_bytes):
+        if is_unreal_project_open(project["path"]):
+            logger.log_message(
+                f"PRESSURE: Projeto '{project['name']}' está aberto, pulando.",
+                level="INFO",
+            )
+            return None
+        space_freed, _, errors = clean_project_cache(
+            project["path"],
+            logger,
+            project["selected_items"],
+            size_index=size_index,
+            ddc_eviction_budget_bytes=get_project_ddc_eviction_budget(
+                project["data"], logger
+            ),
+            ddc_eviction_index=ddc_eviction_index,
+            retention_rules=get_project_retention_rules(project["data"], logger),
+        )
+        all_errors.extend(errors)
+        return space_freed
+
+    low_free_bytes, target_free_bytes = watermarks
+    summaries = relieve_disk_pressure(
+        projects,
+        low_free_bytes,
+        target_free_bytes,
+        logger,
+        measure_reclaimable,
+        clean_project,
+    )
+    if size_index is not None:
+        size_index.save(force=True)
+    ddc_eviction_index.save()
+    if not summaries:
+        print(
+            f"Todos os volumes têm mais de {format_size(low_free_bytes)} livres. "
+            "Nada a fazer."
+        )
+    for summary in summaries:
+        print(
+            f"{summary['volume']}: {format_size(summary['free_before'])} -> "
+            f"{format_size(summary['free_after'])} livres, "
+            f"{format_size(summary['bytes_freed'])} liberados "
+            f"({', '.join(summary['projects_cleaned']) or 'nenhum projeto limpo'})"
+        )
+    for error in all_errors:
+        print(f"  Erro: {error}", file=sys.stderr)
+    if all_errors:
+        return 1
+    return 0 if all(s["bytes_freed"] >= s["bytes_needed"] for s in summaries) else 1
+
+
+def _command_history(args, logger):
+    if not os.path.exists(args.history_db):
+        print(f"Nenhum histórico em '{args.history_db}'.", file=sys.stderr)
+        return 1
+    history_store = ScanHistoryStore(args.history_db)
+    try:
+        report = {
+            "top_offenders": history_store.top_offenders(args.days, args.limit),
+            "cleanups": history_store.cleanup_totals(args.days),
+        }
+        if args.paths:
+            report["growth_per_day"] = {
+                path: history_store.growth_per_day(path, days=args.days)
+                for path in args.paths
+            }
+    finally:
+        history_store.close()
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    for path, growth in report.get("growth_per_day", {}).items():
+        growth_text = "sem amostras" if growth is None else f"{format_size(growth)}/dia"
+        print(f"{path}: {growth_text}")
+    print(f"Itens que mais cresceram nos últimos {args.days} dia(s):")
+    for offender in report["top_offenders"]:
+        print(
+            f"  {format_size(offender['growth_per_day']):>12}/dia  "
+            f"{offender['item_id']:<28} {offender['project_path']} "
+            f"(agora {format_size(offender['latest_bytes'])})"
+        )
+    print(f"Limpezas nos últimos {args.days} dia(s):")
+    for totals in report["cleanups"]:
+        print(
+            f"  {format_size(totals['bytes_freed']):>12}  {totals['cleanups']} limpeza(s), "
+            f"{totals['error_count']} erro(s)  {totals['project_path']}"
+        )
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="limpador", description="Limpador de cache de projetos Unreal (CLI)."
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=list(LOG_LEVEL_ORDER),
+        default=DEFAULT_LOG_LEVEL,
+        help="Nível mínimo dos logs escritos em stderr",
+    )
+    parser.add_argument(
+        "--config",
+        default=ABSOLUTE_CONFIG_PATH,
+        help="Arquivo de configuração com os projetos salvos",
+    )
+    parser.add_argument("--size-index", default=ABSOLUTE_SIZE_INDEX_PATH)
+    parser.add_argument(
+        "--no-size-index",
+        action="store_true",
+        help="Mede tudo do disco, sem ler nem gravar o índice de tamanhos",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser("scan", help="Mede o cache dos projetos")
+    scan_parser.add_argument("paths", nargs="*", help="Pastas de projeto")
+    scan_parser.add_argument(
+        "--items", nargs="+", help="Itens de limpeza a somar (ex: Saved/Logs)"
+    )
+    scan_parser.add_argument("--json", action="store_true")
+    scan_parser.set_defaults(handler=_command_scan)
+
+    clean_parser = subparsers.add_parser("clean", help="Limpa o cache de um projeto")
+    clean_parser.add_argument("path", help="Pasta do projeto")
+    clean_parser.add_argument(
+        "--items", nargs="+", help="Itens de limpeza (padrão: os salvos na configuração)"
+    )
+    clean_parser.add_argument(
+        "--yes", action="store_true", help="Não pede confirmação"
+    )
+    clean_parser.add_argument(
+        "--deletion-mode",
+        choices=DELETION_MODES,
+        help="direct: apaga na hora; staged: move e apaga em segundo plano "
+        "(padrão: 'deletion_mode' da configuração)",
+    )
+    clean_parser.add_argument(
+        "--ddc-budget-gb",
+        type=float,
+        help="Em vez de apagar as subpastas do DerivedDataCache, apaga os arquivos menos "
+        "usados até caberem neste orçamento (padrão: 'ddc_eviction_budget_gb' do projeto)",
+    )
+    clean_parser.set_defaults(handler=_command_clean)
+
+    discover_parser = subparsers.add_parser(
+        "discover", help="Procura projetos Unreal em uma ou mais pastas"
+    )
+    discover_parser.add_argument(
+        "base_paths",
+        nargs="*",
+        help="Pastas raiz da busca (padrão: 'project_search_roots' da configuração)",
+    )
+    discover_parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="Quantos níveis abaixo de cada raiz procurar "
+        "(padrão: 'project_search_max_depth' da configuração)",
+    )
+    discover_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Lista todas as pastas de novo, sem usar o cache de descoberta",
+    )
+    discover_parser.add_argument("--json", action="store_true")
+    discover_parser.set_defaults(handler=_command_discover)
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Acompanha as mudanças no cache dos projetos"
+    )
+    watch_parser.add_argument("paths", nargs="*", help="Pastas de projeto")
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=60,
+        help="Segundos máximos entre relatórios (e entre varreduras no polling)",
+    )
+    watch_parser.set_defaults(handler=_command_watch)
+
+    pressure_parser = subparsers.add_parser(
+        "pressure",
+        help="Limpa os projetos (com limpeza permitida) dos volumes com pouco espaço livre",
+    )
+    pressure_parser.add_argument(
+        "--low-free-gb",
+        type=float,
+        help="Limpa volumes com menos que isto livre (padrão: 'disk_pressure_low_free_gb')",
+    )
+    pressure_parser.add_argument(
+        "--target-free-gb",
+        type=float,
+        help="Espaço livre a recuperar (padrão: 'disk_pressure_target_free_gb')",
+    )
+    pressure_parser.set_defaults(handler=_command_pressure)
+
+    history_parser = subparsers.add_parser(
+        "history", help="Mostra o crescimento do cache e o resultado das limpezas"
+    )
+    history_parser.add_argument(
+        "paths", nargs="*", help="Projetos para mostrar o crescimento por dia"
+    )
+    history_parser.add_argument(
+        "--days", type=float, default=7, help="Janela de tempo em dias (padrão: 7)"
+    )
+    history_parser.add_argument(
+        "--limit", type=int, default=10, help="Quantos itens listar (padrão: 10)"
+    )
+    history_parser.add_argument("--history-db", default=ABSOLUTE_HISTORY_DB_PATH)
+    history_parser.add_argument("--json", action="store_true")
+    history_parser.set_defaults(handler=_command_history)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "items", None):
+        args.items = [os.path.normpath(item) for item in args.items]
+    logger = ConsoleLogger(args.log_level)
+    return args.handler(args, logger)
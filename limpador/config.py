@@ -0,0 +1,226 @@
+"""Caminhos, nomes de arquivos e pastas de cache conhecidas, compartilhados por GUI e CLI."""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+
+if hasattr(sys, "frozen") and sys.frozen:  # Rodando como .exe (PyInstaller)
+    APPLICATION_PATH = os.path.dirname(sys.executable)
+else:  # Rodando como script .py: a raiz do repositório (pasta de app.py)
+    APPLICATION_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POTENTIAL_CACHE_MAIN_FOLDERS = ["Intermediate", "DerivedDataCache", "Saved"]
+CONFIG_FILE_NAME = "clean_unreal_config.json"
+ABSOLUTE_CONFIG_PATH = os.path.join(APPLICATION_PATH, CONFIG_FILE_NAME)
+CONFIG_BACKUP_SUFFIX = ".bak"  # Cópia da versão anterior do arquivo de configuração
+CONFIG_SAVE_DEBOUNCE_SECONDS = 2.0
+SIZE_INDEX_FILE_NAME = "clean_unreal_size_index.json"
+ABSOLUTE_SIZE_INDEX_PATH = os.path.join(APPLICATION_PATH, SIZE_INDEX_FILE_NAME)
+PURGE_JOURNAL_FILE_NAME = "clean_unreal_purge_journal.json"
+ABSOLUTE_PURGE_JOURNAL_PATH = os.path.join(APPLICATION_PATH, PURGE_JOURNAL_FILE_NAME)
+DDC_EVICTION_INDEX_FILE_NAME = "clean_unreal_ddc_eviction_index.json"
+ABSOLUTE_DDC_EVICTION_INDEX_PATH = os.path.join(
+    APPLICATION_PATH, DDC_EVICTION_INDEX_FILE_NAME
+)
+DISCOVERY_CACHE_FILE_NAME = "clean_unreal_discovery_cache.json"
+ABSOLUTE_DISCOVERY_CACHE_PATH = os.path.join(APPLICATION_PATH, DISCOVERY_CACHE_FILE_NAME)
+HISTORY_DB_FILE_NAME = "clean_unreal_history.sqlite3"
+ABSOLUTE_HISTORY_DB_PATH = os.path.join(APPLICATION_PATH, HISTORY_DB_FILE_NAME)
+
+# --- Configurações Iniciais ---
+user_home_path = os.path.expanduser("~")
+UNREAL_PROJECTS_DEFAULT_PATH = os.path.join(
+    user_home_path, "Documents", "Unreal Projects"
+)
+KNOWN_SUBFOLDER_DESCRIPTIONS = {
+    os.path.normpath("Saved/Logs"): "Logs de execução do editor e do jogo.",
+    os.path.normpath("Saved/Crashes"): "Relatórios de crash.",
+    os.path.normpath(
+        "Saved/Autosaves"
+    ): "Cópias de segurança automáticas de assets e mapas.",
+    os.path.normpath(
+        "Saved/Config"
+    ): "Arquivos de configuração (NÃO RECOMENDADO LIMPAR).",
+    os.path.normpath(
+        "Saved/SaveGames"
+    ): "Arquivos de jogos salvos (NÃO RECOMENDADO LIMPAR).",
+    # Removido: os.path.normpath("Saved/Intermediate"): "Subpasta 'Intermediate' dentro de 'Saved' (raro).",
+    # Removido: os.path.normpath("Saved/DerivedDataCache"): "Subpasta 'DerivedDataCache' dentro de 'Saved' (raro).",
+    os.path.normpath("Saved/SourceControl"): "Informações de controle de versão.",
+    os.path.normpath(
+        "Saved/Telemetry"
+    ): "Dados de telemetria (geralmente seguro limpar).",
+    # Se você tem um webcache específico, mantenha. Se o nome varia, precisaria de outra lógica.
+    # os.path.normpath("Saved/webcache_4430"): "Cache de conteúdo web específico do editor.",
+    os.path.normpath("Intermediate/Build"): "Arquivos de compilação da plataforma.",
+    os.path.normpath(
+        "Intermediate/ProjectFiles"
+    ): "Arquivos de projeto do IDE (Visual Studio, etc.).",
+    # Adicione mais subpastas de Intermediate que você vê na sua imagem image_59c8da.png
+    os.path.normpath("Intermediate/DataprepTemp"): "Arquivos temporários do Dataprep.",
+    os.path.normpath(
+        "Intermediate/DatasmithContentTemp"
+    ): "Arquivos temporários de conteúdo Datasmith.",
+    os.path.normpath(
+        "Intermediate/PipInstall"
+    ): "Arquivos relacionados à instalação de pacotes Python via pip (se usado).",
+    os.path.normpath(
+        "Intermediate/ReimportCache"
+    ): "Cache para o processo de reimportação de assets.",
+    os.path.normpath("Intermediate/ShaderAutogen"): "Shaders gerados automaticamente.",
+    os.path.normpath("DerivedDataCache/VT"): "Cache de Virtual Texturing.",
+    # Se houver outras subpastas comuns em DerivedDataCache, adicione aqui.
+}
+
+
+# Cache folders a serem consideradas (relativo à pasta raiz do projeto)
+# Vamos começar com estes, que são geralmente os maiores e mais seguros para limpar
+CACHE_SUBFOLDERS_TO_SCAN = ["Intermediate", "DerivedDataCache"]
+# Pastas 'Saved' são mais sensíveis. Poderíamos adicionar "Saved/Logs", "Saved/Crashes"
+# mas é bom ter cuidado com "Saved/Config" ou "Saved/SaveGames"
+# CACHE_SUBFOLDERS_TO_CLEAN = ["Intermediate", "DerivedDataCache", "Saved/Logs", "Saved/Crashes"]
+CACHE_SUBFOLDERS_TO_CLEAN = ["Intermediate", "DerivedDataCache"]
+
+
+def load_config_data(config_path=ABSOLUTE_CONFIG_PATH, logger=None):
+    """
+    Lê o arquivo de configuração ({"settings": {...}, "projects": [...]}).
+    Retorna um dict vazio se o arquivo não existir. Se ele estiver corrompido (ex: gravação
+    interrompida por uma versão antiga), usa a cópia da versão anterior (CONFIG_BACKUP_SUFFIX).
+    """
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        backup_path = config_path + CONFIG_BACKUP_SUFFIX
+        if not os.path.exists(backup_path):
+            raise
+        message = f"CONFIG: '{config_path}' inválido ({e}). Usando a cópia '{backup_path}'."
+        if logger is not None:
+            logger.log_message(message, level="WARNING")
+        else:
+            print(message)
+        with open(backup_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _file_sha256(file_path):
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _fsync_directory(dir_path):
+    """Garante no disco a troca de nome feita na pasta (POSIX; no Windows não há como abrir pastas)."""
+    if sys.platform == "win32":
+        return
+    try:
+        dir_fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class ConfigStore:
+    """
+    Gravação do arquivo de configuração.
+
+    request_save() junta os pedidos feitos dentro de 'debounce_seconds' em uma gravação só
+    (vale o último); save() e flush() gravam na hora (ex: ao fechar o programa). Cada gravação
+    escreve um arquivo temporário, faz fsync, copia a versão atual para '<arquivo>.bak' e
+    substitui o arquivo com os.replace: uma queda no meio deixa o arquivo antigo ou o novo,
+    nunca um arquivo pela metade. Se o conteúdo serializado tem o mesmo hash do último
+    gravado (ou do arquivo que já estava no disco), nada é escrito.
+    """
+
+    def __init__(
+        self, config_path, logger, debounce_seconds=CONFIG_SAVE_DEBOUNCE_SECONDS
+    ):
+        self.config_path = config_path
+        self.backup_path = config_path + CONFIG_BACKUP_SUFFIX
+        self.logger = logger
+        self.debounce_seconds = debounce_seconds
+        self._pending_payload = None
+        self._timer = None
+        self._last_hash = None
+        self._lock = threading.Lock()  # Protege o pedido pendente e o timer
+        self._write_lock = threading.Lock()  # Uma gravação por vez
+
+    @staticmethod
+    def _serialize(data):
+        return json.dumps(data, indent=4)
+
+    def request_save(self, data):
+        """Agenda a gravação de 'data' para daqui a 'debounce_seconds' (pode ser chamada de qualquer thread)."""
+        payload = self._serialize(data)  # Serializa já: 'data' pode mudar depois
+        with self._lock:
+            self._pending_payload = payload
+            if self._timer is None:
+                self._timer = threading.Timer(self.debounce_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _take_pending(self):
+        with self._lock:
+            payload, self._pending_payload = self._pending_payload, None
+            timer, self._timer = self._timer, None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        return payload
+
+    def flush(self):
+        """Grava agora o pedido pendente, se houver. Retorna True se o arquivo foi escrito."""
+        payload = self._take_pending()
+        if payload is None:
+            return False
+        return self._write(payload)
+
+    def save(self, data):
+        """Grava 'data' agora, descartando o pedido pendente (mais antigo). True se o arquivo foi escrito."""
+        self._take_pending()
+        return self._write(self._serialize(data))
+
+    def _write(self, payload):
+        encoded = payload.encode("utf-8")
+        content_hash = hashlib.sha256(encoded).hexdigest()
+        with self._write_lock:
+            if self._last_hash is None:
+                self._last_hash = _file_sha256(self.config_path)
+            if content_hash == self._last_hash:
+                self.logger.log_message(
+                    f"CONFIG: Configuração sem mudanças; '{self.config_path}' não foi regravado.",
+                    level="DEBUG",
+                )
+                return False
+            temp_path = self.config_path + ".tmp"
+            try:
+                with open(temp_path, "wb") as f:
+                    f.write(encoded)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if os.path.exists(self.config_path):
+                    shutil.copyfile(self.config_path, self.backup_path)
+                os.replace(temp_path, self.config_path)
+                _fsync_directory(os.path.dirname(os.path.abspath(self.config_path)))
+            except OSError as e:
+                self.logger.log_message(
+                    f"CONFIG: Erro ao salvar '{self.config_path}': {e}",
+                    level="CRITICAL",
+                )
+                return False
+            self._last_hash = content_hash
+        self.logger.log_message(
+            f"Dados salvos com sucesso em {self.config_path}.", level="INFO"
+        )
+        return True
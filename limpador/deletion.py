@@ -0,0 +1,239 @@
+"""
+Motor de deleção de árvores de pastas.
+
+Substitui o shutil.rmtree (um unlink por vez, em uma thread): a árvore é percorrida com
+os.scandir, cada pasta é esvaziada por uma tarefa em um pool de threads limitado e as
+pastas são removidas de baixo para cima no final. Erros por caminho são coletados sem interromper
+o restante da deleção.
+"""
+
+import errno
+import os
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .priority import (
+    enter_background_thread,
+    is_background_thread,
+    throttle_file_operations,
+)
+
+# Threads que apagam arquivos em paralelo. Compartilhadas por todas as deleções do processo.
+DELETE_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Quantas mensagens de erro são guardadas por deleção (o total fica em "errors_total")
+DELETE_MAX_REPORTED_ERRORS = 100
+
+_delete_executors = {}  # {em segundo plano?: pool}
+_delete_executor_lock = threading.Lock()
+
+
+def _get_delete_executor():
+    """
+    Retorna o pool de threads compartilhado do motor de deleção (criado sob demanda).
+    Chamado de uma thread de segundo plano, retorna o pool de prioridade baixa.
+    """
+    background = is_background_thread()
+    with _delete_executor_lock:
+        executor = _delete_executors.get(background)
+        if executor is None:
+            executor = _delete_executors[background] = ThreadPoolExecutor(
+                max_workers=DELETE_MAX_WORKERS,
+                thread_name_prefix="DeleteTreeBackground" if background else "DeleteTree",
+                initializer=enter_background_thread if background else None,
+            )
+        return executor
+
+
+def _remove_path(remove, path):
+    """Chama remove(path); no Windows tira o atributo somente leitura e tenta de novo."""
+    try:
+        remove(path)
+    except PermissionError:
+        if sys.platform != "win32":
+            raise
+        os.chmod(path, stat.S_IWRITE)
+        remove(path)
+
+
+def _is_junction(entry):
+    is_junction = getattr(entry, "is_junction", None)  # Python 3.12+
+    return bool(is_junction and is_junction())
+
+
+# No Linux/macOS a pasta é aberta uma vez e os arquivos são apagados relativos a ela
+# (unlinkat), sem resolver o caminho completo a cada arquivo.
+_USE_DIR_FD = (
+    os.unlink in os.supports_dir_fd
+    and os.scandir in os.supports_fd
+    and hasattr(os, "O_DIRECTORY")
+)
+
+
+def _remove_entry(entry):
+    """Apaga um arquivo ou link pelo caminho (Windows); links de pasta precisam de rmdir."""
+    try:
+        _remove_path(os.unlink, entry.path)
+    except (IsADirectoryError, PermissionError):
+        if not (entry.is_symlink() or _is_junction(entry)):
+            raise
+        _remove_path(os.rmdir, entry.path)
+
+
+def _delete_directory_files(dir_path):
+    """
+    Apaga os arquivos (e links) de UMA pasta, sem descer nas subpastas.
+    Retorna (arquivos apagados, bytes liberados, erros, subpastas).
+    Links simbólicos e junções são apagados como arquivos, nunca seguidos.
+    """
+    files_deleted = 0
+    bytes_freed = 0
+    errors = []
+    subdirs = []
+    dir_fd = None
+    try:
+        if _USE_DIR_FD:
+            dir_fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+        with os.scandir(dir_path if dir_fd is None else dir_fd) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False) and not _is_junction(entry):
+                        subdirs.append(os.path.join(dir_path, entry.name))
+                        continue
+                    size = entry.stat(follow_symlinks=False).st_size
+                    throttle_file_operations()
+                    if dir_fd is not None:
+                        os.unlink(entry.name, dir_fd=dir_fd)
+                    else:
+                        _remove_entry(entry)
+                    files_deleted += 1
+                    bytes_freed += size
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    errors.append(f"{os.path.join(dir_path, entry.name)}: {e}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        errors.append(f"{dir_path}: {e}")
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return files_deleted, bytes_freed, errors, subdirs
+
+
+def delete_tree(root_path, parallel=True, stop_event=None, progress_callback=None):
+    """
+    Apaga 'root_path' e todo o seu conteúdo.
+
+    'parallel': True usa o pool compartilhado (DELETE_MAX_WORKERS threads); False roda tudo
+        na thread chamadora (ex: purgador de prioridade baixa).
+    'stop_event' (opcional): se sinalizado, nenhuma tarefa nova é iniciada e as pastas
+        não são removidas; o resultado volta com "completed" False.
+    'progress_callback' (opcional): chamado na thread chamadora como
+        progress_callback(arquivos, bytes) a cada pasta esvaziada.
+
+    Retorna um dict:
+        {"completed", "files_deleted", "dirs_deleted", "bytes_freed", "errors",
+         "errors_total", "elapsed_seconds", "files_per_second", "bytes_per_second"}
+    'errors' guarda até DELETE_MAX_REPORTED_ERRORS mensagens "caminho: erro".
+    """
+    started_at = time.perf_counter()
+    result = {
+        "completed": False,
+        "files_deleted": 0,
+        "dirs_deleted": 0,
+        "bytes_freed": 0,
+        "errors": [],
+        "errors_total": 0,
+    }
+
+    def add_errors(errors):
+        result["errors_total"] += len(errors)
+        room = DELETE_MAX_REPORTED_ERRORS - len(result["errors"])
+        if room > 0:
+            result["errors"].extend(errors[:room])
+
+    def add_unlinked(files_deleted, bytes_freed, errors):
+        result["files_deleted"] += files_deleted
+        result["bytes_freed"] += bytes_freed
+        add_errors(errors)
+        if progress_callback is not None and (files_deleted or bytes_freed):
+            progress_callback(files_deleted, bytes_freed)
+
+    def is_stopped():
+        return stop_event is not None and stop_event.is_set()
+
+    # A raiz pode ser um link (ou junção): apaga só o link
+    if os.path.islink(root_path) or not os.path.isdir(root_path):
+        try:
+            size = os.lstat(root_path).st_size
+            _remove_path(os.unlink, root_path)
+            add_unlinked(1, size, [])
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            add_errors([f"{root_path}: {e}"])
+        result["completed"] = True
+        return _finish_result(result, started_at)
+
+    directories = [(0, root_path)]  # (profundidade, pasta) para a remoção de baixo para cima
+
+    def handle_directory(depth, directory_result):
+        files_deleted, bytes_freed, errors, subdirs = directory_result
+        add_unlinked(files_deleted, bytes_freed, errors)
+        new_dirs = [(depth + 1, subdir) for subdir in subdirs]
+        directories.extend(new_dirs)
+        return new_dirs
+
+    if not parallel:
+        pending_dirs = [(0, root_path)]
+        while pending_dirs and not is_stopped():
+            depth, dir_path = pending_dirs.pop()
+            pending_dirs.extend(
+                handle_directory(depth, _delete_directory_files(dir_path))
+            )
+    else:
+        # Uma tarefa por pasta: pastas diferentes são apagadas em paralelo
+        executor = _get_delete_executor()
+        pending = {executor.submit(_delete_directory_files, root_path): 0}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future)
+                new_dirs = handle_directory(depth, future.result())
+                if is_stopped():
+                    continue  # Termina as tarefas em andamento sem iniciar novas
+                for new_depth, subdir in new_dirs:
+                    pending[executor.submit(_delete_directory_files, subdir)] = new_depth
+
+    if is_stopped():
+        return _finish_result(result, started_at)
+
+    # Remove as pastas de baixo para cima (mais profundas primeiro)
+    directories.sort(key=lambda item: item[0], reverse=True)
+    rmdir_errors = []
+    for _, dir_path in directories:
+        try:
+            _remove_path(os.rmdir, dir_path)
+            result["dirs_deleted"] += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Pastas que sobraram só porque algo dentro delas falhou não são um erro novo
+            if e.errno == errno.ENOTEMPTY and result["errors_total"]:
+                continue
+            rmdir_errors.append(f"{dir_path}: {e}")
+    add_errors(rmdir_errors)
+    result["completed"] = True
+    return _finish_result(result, started_at)
+
+
+def _finish_result(result, started_at):
+    elapsed = max(time.perf_counter() - started_at, 1e-9)
+    result["elapsed_seconds"] = elapsed
+    result["files_per_second"] = result["files_deleted"] / elapsed
+    result["bytes_per_second"] = result["bytes_freed"] / elapsed
+    return result
@@ -0,0 +1,339 @@
+"""
+Descoberta de projetos Unreal (pastas com um arquivo .uproject).
+
+A busca parte de uma ou mais pastas raiz e desce até 'max_depth' níveis. Cada pasta é
+listada uma única vez com os.scandir, em um pool de threads; ao achar um .uproject a pasta
+vira um projeto e a busca não desce mais nela. Pastas conhecidas por serem grandes e nunca
+conterem projetos (Content, Binaries, DerivedDataCache...) e pastas ocultas não são visitadas.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .config import UNREAL_PROJECTS_DEFAULT_PATH
+
+# Profundidade máxima padrão abaixo de cada raiz (1 = só as subpastas diretas da raiz)
+DEFAULT_PROJECT_SEARCH_MAX_DEPTH = 3
+# Pastas que a busca nunca visita (comparação sem diferenciar maiúsculas)
+DISCOVERY_PRUNED_DIR_NAMES = frozenset(
+    name.casefold()
+    for name in (
+        "Content",
+        "Binaries",
+        "DerivedDataCache",
+        "Intermediate",
+        "Saved",
+        "node_modules",
+        "$RECYCLE.BIN",
+        "System Volume Information",
+    )
+)
+DISCOVERY_MAX_WORKERS = 8
+# Entradas do cache de descoberta mais antigas que isto são listadas de novo mesmo com o
+# mesmo mtime (sistemas de arquivos com mtime de pasta pouco confiável, como alguns de rede)
+DISCOVERY_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+
+def get_project_search_settings(settings, logger):
+    """
+    (raízes, profundidade) a partir de "project_search_roots" e "project_search_max_depth"
+    das configurações. Valores inválidos geram um aviso e voltam ao padrão
+    ([UNREAL_PROJECTS_DEFAULT_PATH] e DEFAULT_PROJECT_SEARCH_MAX_DEPTH).
+    """
+    search_roots = settings.get("project_search_roots")
+    if search_roots in (None, "", []):
+        search_roots = [UNREAL_PROJECTS_DEFAULT_PATH]
+    elif isinstance(search_roots, str):
+        search_roots = [search_roots]
+    elif not (
+        isinstance(search_roots, list)
+        and all(isinstance(root, str) and root for root in search_roots)
+    ):
+        logger.log_message(
+            f"Valor inválido para 'project_search_roots': '{search_roots}'. Usando padrão: ['{UNREAL_PROJECTS_DEFAULT_PATH}'].",
+            level="WARNING",
+        )
+        search_roots = [UNREAL_PROJECTS_DEFAULT_PATH]
+
+    max_depth = settings.get(
+        "project_search_max_depth", DEFAULT_PROJECT_SEARCH_MAX_DEPTH
+    )
+    try:
+        max_depth = int(max_depth)
+    except (TypeError, ValueError):
+        max_depth = -1
+    if max_depth < 0:
+        logger.log_message(
+            f"Valor inválido para 'project_search_max_depth': '{settings.get('project_search_max_depth')}'. Usando padrão: {DEFAULT_PROJECT_SEARCH_MAX_DEPTH}.",
+            level="WARNING",
+        )
+        max_depth = DEFAULT_PROJECT_SEARCH_MAX_DEPTH
+    return [os.path.normpath(root) for root in search_roots], max_depth
+
+
+def _list_candidate_directory(dir_path):
+    """
+    Lista uma pasta. Retorna (nome do .uproject ou None, subpastas a visitar).
+    Com um .uproject as subpastas não interessam e não são devolvidas.
+    Levanta OSError se a pasta não puder ser listada.
+    """
+    uproject_names = []
+    subdirs = []
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            try:
+                if entry.name.endswith(".uproject"):
+                    if entry.is_file():
+                        uproject_names.append(entry.name)
+                    continue
+                if (
+                    entry.name.startswith(".")
+                    or entry.name.casefold() in DISCOVERY_PRUNED_DIR_NAMES
+                    or not entry.is_dir(follow_symlinks=False)
+                ):
+                    continue
+            except OSError:
+                continue
+            subdirs.append(entry.path)
+    if uproject_names:
+        return min(uproject_names), []
+    return None, subdirs
+
+
+def _scan_candidate_directory(dir_path):
+    """_list_candidate_directory sem cache; pastas sem permissão ou removidas ficam vazias."""
+    try:
+        return _list_candidate_directory(dir_path)
+    except OSError:
+        return None, []
+
+
+class ProjectDiscoveryCache:
+    """
+    Cache persistente da descoberta, salvo em JSON ao lado do arquivo de configuração.
+    Cada pasta visitada guarda [mtime_ns, listed_at, .uproject ou None, [subpastas]]. Criar,
+    apagar ou renomear um .uproject ou uma subpasta muda o mtime da pasta, então uma pasta
+    com o mesmo mtime é reaproveitada sem ser listada: em uma máquina sem mudanças a busca
+    custa um stat por pasta visitada.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self, cache_file_path, max_age_seconds=DISCOVERY_CACHE_MAX_AGE_SECONDS
+    ):
+        self.cache_file_path = cache_file_path
+        self.max_age_seconds = max_age_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def load(self):
+        """Carrega o cache do disco. Um arquivo ausente ou inválido resulta em cache vazio."""
+        try:
+            with open(self.cache_file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.FORMAT_VERSION:
+                return False
+            with self._lock:
+                self._entries = data.get("directories", {})
+                self._dirty = False
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"DISCOVER: Erro ao carregar '{self.cache_file_path}': {e}")
+            return False
+
+    def save(self, force=False):
+        """Salva o cache (se houve mudanças) gravando em um arquivo temporário e substituindo."""
+        with self._lock:
+            if not self._dirty and not force:
+                return False
+            payload = json.dumps(
+                {"version": self.FORMAT_VERSION, "directories": self._entries},
+                separators=(",", ":"),
+            )
+            self._dirty = False
+        temp_path = self.cache_file_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(temp_path, self.cache_file_path)
+            return True
+        except OSError as e:
+            print(f"DISCOVER: Erro ao salvar '{self.cache_file_path}': {e}")
+            with self._lock:
+                self._dirty = True
+            return False
+
+    def clear(self):
+        """Esquece todas as pastas (a próxima busca lista tudo de novo)."""
+        with self._lock:
+            if self._entries:
+                self._entries = {}
+                self._dirty = True
+
+    def retain(self, dir_paths):
+        """Remove as pastas que a última busca não visitou (raízes ou profundidade mudaram)."""
+        dir_paths = set(dir_paths)
+        with self._lock:
+            for dir_path in [path for path in self._entries if path not in dir_paths]:
+                del self._entries[dir_path]
+                self._dirty = True
+
+    def scan_directory(self, dir_path):
+        """Como _scan_candidate_directory, reaproveitando a entrada se o mtime não mudou."""
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            with self._lock:
+                if self._entries.pop(dir_path, None) is not None:
+                    self._dirty = True
+            return None, []
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(dir_path)
+            if (
+                entry is not None
+                and entry[0] == mtime_ns
+                and now - entry[1] < self.max_age_seconds
+            ):
+                return entry[2], [os.path.join(dir_path, name) for name in entry[3]]
+
+        try:
+            uproject_filename, subdirs = _list_candidate_directory(dir_path)
+        except OSError:
+            return None, []  # Sem permissão: não fica no cache, tenta de novo na próxima
+        with self._lock:
+            self._entries[dir_path] = [
+                mtime_ns,
+                now,
+                uproject_filename,
+                [os.path.basename(subdir) for subdir in subdirs],
+            ]
+            self._dirty = True
+        return uproject_filename, subdirs
+
+
+def discover_unreal_projects(
+    base_paths,
+    logger,
+    max_depth=DEFAULT_PROJECT_SEARCH_MAX_DEPTH,
+    on_project_found=None,
+    cache=None,
+):
+    """
+    Procura por pastas de projeto Unreal nas pastas raiz fornecidas.
+    Uma pasta é considerada um projeto se contiver um arquivo .uproject.
+
+    Args:
+        base_paths (str | list[str]): Pasta(s) onde procurar os projetos.
+        logger: Qualquer objeto com log_message(mensagem, level=...).
+        max_depth (int): Quantos níveis abaixo de cada raiz a busca desce (0 = só a raiz).
+        on_project_found: Chamado com cada projeto assim que ele é encontrado (na thread
+            da busca), para a interface mostrar os projetos sem esperar o fim.
+        cache (ProjectDiscoveryCache | None): Reaproveita as pastas que não mudaram desde a
+            última busca. Pastas que esta busca não visitou saem do cache (salvar é com quem chama).
+
+    Returns:
+        (projetos, mensagem_de_erro): lista de dicts {"name", "path", "uproject_file"},
+        ordenada pelo caminho, e uma mensagem para o usuário (None se a busca correu bem).
+    """
+    if isinstance(base_paths, str):
+        base_paths = [base_paths]
+    logger.log_message(
+        f"DISCOVER: Procurando projetos em {', '.join(base_paths)} (profundidade {max_depth})...",
+        level="DEBUG",
+    )
+
+    existing_roots = []
+    for base_path in base_paths:
+        if os.path.isdir(base_path):
+            existing_roots.append(os.path.normpath(base_path))
+        else:
+            logger.log_message(
+                f"DISCOVER: Caminho não encontrado: {base_path}", level="WARNING"
+            )
+    if not existing_roots:
+        return [], f"Caminho de projetos ('{', '.join(base_paths)}') não encontrado."
+
+    found_projects = []
+    visited = {}  # Raízes sobrepostas não listam a mesma pasta duas vezes
+    scan_directory = (
+        _scan_candidate_directory if cache is None else cache.scan_directory
+    )
+    try:
+        with ThreadPoolExecutor(
+            max_workers=DISCOVERY_MAX_WORKERS, thread_name_prefix="Discovery"
+        ) as executor:
+            pending = {}
+
+            def visit(dir_path, depth):
+                key = os.path.normcase(dir_path)
+                if key not in visited:
+                    visited[key] = dir_path
+                    future = executor.submit(scan_directory, dir_path)
+                    pending[future] = (dir_path, depth)
+
+            for root_path in existing_roots:
+                visit(root_path, 0)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    dir_path, depth = pending.pop(future)
+                    uproject_filename, subdirs = future.result()
+                    if uproject_filename:
+                        project_data = {
+                            "name": os.path.basename(dir_path),
+                            "path": dir_path,
+                            "uproject_file": uproject_filename,
+                        }
+                        found_projects.append(project_data)
+                        logger.log_message(
+                            f"DISCOVER: Projeto encontrado: {project_data['name']} em {dir_path} (Arquivo: {uproject_filename})",
+                            level="DEBUG",
+                        )
+                        if on_project_found is not None:
+                            on_project_found(project_data)
+                    elif depth < max_depth:
+                        for subdir_path in subdirs:
+                            visit(subdir_path, depth + 1)
+    except Exception as e:
+        error_message = f"Erro excepcional ao procurar projetos em {', '.join(base_paths)}: {e}"
+        logger.log_message(f"DISCOVER: {error_message}", level="ERROR")
+        return [], error_message
+
+    if cache is not None:
+        cache.retain(visited.values())
+
+    if not found_projects:
+        logger.log_message(
+            f"DISCOVER: Nenhum projeto Unreal encontrado em {', '.join(base_paths)}.",
+            level="INFO",
+        )
+        return [], "Nenhum projeto Unreal encontrado nas pastas de busca."
+
+    found_projects.sort(key=lambda project: os.path.normcase(project["path"]))
+    logger.log_message(
+        f"DISCOVER: {len(found_projects)} projetos encontrados.", level="INFO"
+    )
+    return found_projects, None
+
+
+def find_uproject_file(project_root_path):
+    """Encontra o primeiro arquivo .uproject na raiz de um projeto."""
+    if not os.path.isdir(project_root_path):
+        return None
+    for item_name in os.listdir(project_root_path):
+        if item_name.endswith(".uproject"):
+            return os.path.join(project_root_path, item_name)
+    return None
@@ -0,0 +1,394 @@
+"""
+Despejo (eviction) LRU do DerivedDataCache.
+
+Em vez de apagar as subpastas do DDC inteiras (jogando fora shaders e texturas ainda em uso
+junto com o lixo), apaga só os arquivos usados há mais tempo até o total caber em um
+orçamento de bytes. O "último uso" de um arquivo é o maior entre atime e mtime (o atime
+pode estar desligado no volume). Pastas que ficam vazias são removidas.
+
+O índice guarda, por pasta, um histograma de idade: bytes e arquivos por faixa de uma hora
+de último uso. Somar os histogramas diz em qual faixa está o corte sem ordenar milhões de
+arquivos; só as pastas com arquivos até essa faixa são listadas de novo, e só os arquivos da
+faixa do corte passam por um heap. Como no DirectorySizeIndex, uma pasta cujo mtime não mudou
+é reaproveitada do índice (por até DDC_EVICTION_INDEX_MAX_AGE_SECONDS, já que ler um arquivo
+muda o atime dele mas não o mtime da pasta).
+"""
+
+import errno
+import heapq
+import json
+import os
+import threading
+import time
+
+from .deletion import DELETE_MAX_REPORTED_ERRORS, _get_delete_executor, _remove_path
+from .priority import throttle_file_operations
+from .sizes import _parallel_directory_walk, format_size
+
+# Largura (s) de cada faixa do histograma de idade
+EVICTION_AGE_BUCKET_SECONDS = 3600
+# Tempo máximo que o histograma de uma pasta é reaproveitado sem relistá-la
+DDC_EVICTION_INDEX_MAX_AGE_SECONDS = 24 * 3600
+# Passadas extras quando arquivos do índice foram usados desde a última listagem
+EVICTION_MAX_PASSES = 3
+
+
+def get_project_ddc_eviction_budget(project_data, logger):
+    """
+    Orçamento do DerivedDataCache em bytes a partir de "ddc_eviction_budget_gb" da
+    configuração do projeto, ou None (apaga as subpastas inteiras) se vazio ou inválido.
+    """
+    budget_gb = project_data.get("ddc_eviction_budget_gb")
+    if budget_gb in (None, ""):
+        return None
+    try:
+        budget_bytes = int(float(budget_gb) * (1024**3))
+    except (TypeError, ValueError):
+        budget_bytes = -1
+    if budget_bytes < 0:
+        logger.log_message(
+            f"EVICT: 'ddc_eviction_budget_gb' inválido ('{budget_gb}') em "
+            f"'{project_data.get('path')}'. Usando deleção das subpastas inteiras.",
+            level="WARNING",
+        )
+        return None
+    return budget_bytes
+
+
+def _last_use_timestamp(stat_result):
+    return max(stat_result.st_atime, stat_result.st_mtime)
+
+
+def _age_bucket(timestamp):
+    return int(timestamp // EVICTION_AGE_BUCKET_SECONDS)
+
+
+def _scan_directory_histogram(dir_path):
+    """
+    Lista uma pasta. Retorna ({faixa: [arquivos, bytes]}, subpastas).
+    As chaves das faixas são strings para o histograma ir direto para o JSON.
+    """
+    histogram = {}
+    subdirs = []
+    try:
+        with os.scandir(dir_path) as entries:
+            throttle_file_operations()
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    stat_result = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue  # Arquivo apagado durante a listagem
+                bucket = histogram.setdefault(
+                    str(_age_bucket(_last_use_timestamp(stat_result))), [0, 0]
+                )
+                bucket[0] += 1
+                bucket[1] += stat_result.st_size
+    except OSError as e:
+        print(f"EVICT: Aviso: Não foi possível listar '{dir_path}': {e}")
+    return histogram, subdirs
+
+
+class DdcEvictionIndex:
+    """
+    Índice persistente dos histogramas de idade por pasta, salvo em JSON ao lado do arquivo
+    de configuração. Cada entrada: [mtime_ns, listed_at, {faixa: [arquivos, bytes]}, [subpastas]].
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self, index_file_path, max_age_seconds=DDC_EVICTION_INDEX_MAX_AGE_SECONDS
+    ):
+        self.index_file_path = index_file_path
+        self.max_age_seconds = max_age_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def load(self):
+        """Carrega o índice do disco. Um arquivo ausente ou inválido resulta em índice vazio."""
+        try:
+            with open(self.index_file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.FORMAT_VERSION:
+                return False
+            with self._lock:
+                self._entries = data.get("directories", {})
+                self._dirty = False
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"EVICT: Erro ao carregar '{self.index_file_path}': {e}")
+            return False
+
+    def save(self, force=False):
+        """Salva o índice (se houve mudanças) gravando em um arquivo temporário e substituindo."""
+        with self._lock:
+            if not self._dirty and not force:
+                return False
+            payload = json.dumps(
+                {"version": self.FORMAT_VERSION, "directories": self._entries},
+                separators=(",", ":"),
+            )
+            self._dirty = False
+        temp_path = self.index_file_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(temp_path, self.index_file_path)
+            return True
+        except OSError as e:
+            print(f"EVICT: Erro ao salvar '{self.index_file_path}': {e}")
+            with self._lock:
+                self._dirty = True
+            return False
+
+    def forget(self, folder_path):
+        """Remove do índice uma pasta e todas as suas subpastas conhecidas."""
+        with self._lock:
+            stack = [folder_path]
+            while stack:
+                current = stack.pop()
+                entry = self._entries.pop(current, None)
+                if entry is not None:
+                    self._dirty = True
+                    stack.extend(os.path.join(current, name) for name in entry[3])
+
+    def invalidate(self, folder_path):
+        """Descarta só a entrada de uma pasta (relistada na próxima passada)."""
+        with self._lock:
+            if self._entries.pop(folder_path, None) is not None:
+                self._dirty = True
+
+    def _visit_directory(self, dir_path):
+        """Visita usada por _parallel_directory_walk: reaproveita a entrada se o mtime não mudou."""
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            self.forget(dir_path)
+            return {}, []
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(dir_path)
+            if (
+                entry is not None
+                and entry[0] == mtime_ns
+                and now - entry[1] < self.max_age_seconds
+            ):
+                return entry[2], [os.path.join(dir_path, name) for name in entry[3]]
+
+        histogram, subdirs = _scan_directory_histogram(dir_path)
+        child_names = [os.path.basename(subdir) for subdir in subdirs]
+        if entry is not None:
+            for removed_name in set(entry[3]) - set(child_names):
+                self.forget(os.path.join(dir_path, removed_name))
+        with self._lock:
+            self._entries[dir_path] = [mtime_ns, now, histogram, child_names]
+            self._dirty = True
+        return histogram, subdirs
+
+    def collect_histograms(self, root_path):
+        """Lista (pasta, histograma) de toda a árvore de 'root_path', atualizando o índice."""
+        if not os.path.isdir(root_path):
+            self.forget(root_path)
+            return []
+        return _parallel_directory_walk(root_path, self._visit_directory)
+
+
+def _evict_directory_files(dir_path, cutoff_bucket):
+    """
+    Apaga os arquivos de UMA pasta com último uso anterior à faixa 'cutoff_bucket'.
+    Retorna (arquivos apagados, bytes liberados, erros, arquivos_da_faixa_do_corte) onde
+    os arquivos da faixa do corte são tuplas (último_uso, caminho, bytes) ainda não apagadas.
+    """
+    files_deleted = 0
+    bytes_freed = 0
+    errors = []
+    boundary_files = []
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        continue
+                    stat_result = entry.stat(follow_symlinks=False)
+                    last_use = _last_use_timestamp(stat_result)
+                    bucket = _age_bucket(last_use)
+                    if bucket > cutoff_bucket:
+                        continue  # Usado desde a última listagem: fica
+                    if bucket == cutoff_bucket:
+                        boundary_files.append(
+                            (last_use, entry.path, stat_result.st_size)
+                        )
+                        continue
+                    throttle_file_operations()
+                    _remove_path(os.unlink, entry.path)
+                    files_deleted += 1
+                    bytes_freed += stat_result.st_size
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    errors.append(f"{entry.path}: {e}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        errors.append(f"{dir_path}: {e}")
+    return files_deleted, bytes_freed, errors, boundary_files
+
+
+def _prune_empty_directories(dir_paths, root_paths, index=None):
+    """
+    Remove as pastas vazias (e os pais que ficarem vazios), sem nunca remover as raízes.
+    Com 'index' (DdcEvictionIndex), as pastas removidas saem dele e os pais são invalidados.
+    """
+    protected = {os.path.normcase(os.path.normpath(root)) for root in root_paths}
+    pruned = 0
+    for dir_path in sorted(set(dir_paths), key=lambda p: p.count(os.sep), reverse=True):
+        current = dir_path
+        while os.path.normcase(os.path.normpath(current)) not in protected:
+            try:
+                os.rmdir(current)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                    print(f"Aviso: Não foi possível remover '{current}': {e}")
+                break
+            else:
+                pruned += 1
+                if index is not None:
+                    index.forget(current)
+            parent = os.path.dirname(current)
+            if index is not None:
+                index.invalidate(parent)
+            if parent == current:
+                break
+            current = parent
+    return pruned
+
+
+def evict_to_budget(root_paths, budget_bytes, logger, index=None, stop_event=None):
+    """
+    Apaga os arquivos menos usados recentemente de 'root_paths' (ex: subpastas do
+    DerivedDataCache) até o total delas caber em 'budget_bytes'.
+
+    'index' (DdcEvictionIndex, opcional): reaproveita os histogramas de execuções anteriores;
+        sem ele, toda a árvore é listada.
+    'stop_event' (opcional): verificado entre as passadas e antes da faixa do corte.
+
+    Retorna um dict:
+        {"bytes_before", "bytes_after", "bytes_freed", "files_deleted", "dirs_pruned",
+         "errors", "errors_total", "elapsed_seconds"}
+    """
+    started_at = time.perf_counter()
+    if index is None:
+        index = DdcEvictionIndex(os.devnull)
+    root_paths = [root for root in root_paths if os.path.isdir(root)]
+    result = {
+        "bytes_before": 0,
+        "bytes_after": 0,
+        "bytes_freed": 0,
+        "files_deleted": 0,
+        "dirs_pruned": 0,
+        "errors": [],
+        "errors_total": 0,
+    }
+
+    def add_errors(errors):
+        result["errors_total"] += len(errors)
+        room = DELETE_MAX_REPORTED_ERRORS - len(result["errors"])
+        if room > 0:
+            result["errors"].extend(errors[:room])
+
+    def is_stopped():
+        return stop_event is not None and stop_event.is_set()
+
+    for pass_number in range(EVICTION_MAX_PASSES):
+        # Soma dos histogramas de todas as pastas: bytes por faixa de idade
+        bytes_by_bucket = {}
+        oldest_bucket_by_dir = {}
+        for root_path in root_paths:
+            for dir_path, histogram in index.collect_histograms(root_path):
+                if not histogram:
+                    continue
+                buckets = [int(bucket) for bucket in histogram]
+                oldest_bucket_by_dir[dir_path] = min(buckets)
+                for bucket in buckets:
+                    bytes_by_bucket[bucket] = (
+                        bytes_by_bucket.get(bucket, 0) + histogram[str(bucket)][1]
+                    )
+        total_bytes = sum(bytes_by_bucket.values())
+        if pass_number == 0:
+            result["bytes_before"] = total_bytes
+        result["bytes_after"] = total_bytes
+        excess_bytes = total_bytes - budget_bytes
+        if excess_bytes <= 0 or is_stopped():
+            break
+
+        # Faixa do corte: a primeira (da mais antiga) em que o acumulado cobre o excesso
+        cutoff_bucket = None
+        accumulated = 0
+        for bucket in sorted(bytes_by_bucket):
+            accumulated += bytes_by_bucket[bucket]
+            if accumulated >= excess_bytes:
+                cutoff_bucket = bucket
+                break
+        candidate_dirs = [
+            dir_path
+            for dir_path, oldest_bucket in oldest_bucket_by_dir.items()
+            if oldest_bucket <= cutoff_bucket
+        ]
+
+        # Tudo o que é mais antigo que a faixa do corte sai; a faixa do corte vai para o heap
+        freed_this_pass = 0
+        boundary_heap = []
+        executor = _get_delete_executor()
+        for files_deleted, bytes_freed, errors, boundary_files in executor.map(
+            lambda dir_path: _evict_directory_files(dir_path, cutoff_bucket),
+            candidate_dirs,
+        ):
+            result["files_deleted"] += files_deleted
+            freed_this_pass += bytes_freed
+            add_errors(errors)
+            boundary_heap.extend(boundary_files)
+
+        heapq.heapify(boundary_heap)
+        while boundary_heap and freed_this_pass < excess_bytes and not is_stopped():
+            _, file_path, file_size = heapq.heappop(boundary_heap)
+            try:
+                throttle_file_operations()
+                _remove_path(os.unlink, file_path)
+                result["files_deleted"] += 1
+                freed_this_pass += file_size
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                add_errors([f"{file_path}: {e}"])
+
+        result["bytes_freed"] += freed_this_pass
+        result["bytes_after"] = total_bytes - freed_this_pass
+        for dir_path in candidate_dirs:
+            index.invalidate(dir_path)
+        result["dirs_pruned"] += _prune_empty_directories(
+            candidate_dirs, root_paths, index
+        )
+        logger.log_message(
+            f"EVICT: Passada {pass_number + 1}: {format_size(freed_this_pass)} liberados "
+            f"(excesso era {format_size(excess_bytes)}).",
+            level="DEBUG",
+        )
+        if freed_this_pass >= excess_bytes:
+            break
+        # Liberou menos que o previsto (arquivos usados desde a listagem ou em uso): nova passada
+
+    result["elapsed_seconds"] = time.perf_counter() - started_at
+    return result
@@ -0,0 +1,3711 @@
+"""
+Interface gráfica (CustomTkinter) e ícone da bandeja do sistema.
+
+Este módulo só é importado quando a interface é aberta; a CLI (limpador.cli) não o usa.
+pystray/PIL (bandeja) e winreg (iniciar com o Windows) são importados apenas quando necessários.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from tkinter import filedialog
+
+import customtkinter as ctk
+
+from .cleaning import (
+    DEFAULT_CLEANUP_PRIORITY_ORDER,
+    DEFAULT_MAX_CLEANS_PER_VOLUME,
+    CleaningPipeline,
+    clean_project_cache,
+    plan_cleanup_to_target,
+)
+from .config import (
+    ABSOLUTE_CONFIG_PATH,
+    ABSOLUTE_DDC_EVICTION_INDEX_PATH,
+    ABSOLUTE_DISCOVERY_CACHE_PATH,
+    ABSOLUTE_HISTORY_DB_PATH,
+    ABSOLUTE_PURGE_JOURNAL_PATH,
+    ABSOLUTE_SIZE_INDEX_PATH,
+    APPLICATION_PATH,
+    KNOWN_SUBFOLDER_DESCRIPTIONS,
+    POTENTIAL_CACHE_MAIN_FOLDERS,
+    UNREAL_PROJECTS_DEFAULT_PATH,
+    ConfigStore,
+    load_config_data,
+)
+from .discovery import (
+    DEFAULT_PROJECT_SEARCH_MAX_DEPTH,
+    ProjectDiscoveryCache,
+    discover_unreal_projects,
+    get_project_search_settings,
+)
+from .eviction import DdcEvictionIndex, get_project_ddc_eviction_budget
+from .history import ScanHistoryStore
+from .retention import apply_project_retention, get_project_retention_rules
+from .logger import DEFAULT_LOG_LEVEL, LOG_LEVEL_ORDER
+from .processes import (
+    OpenEditorIndex,
+    get_project_uproject_path,
+    is_unreal_project_open,
+)
+from .pressure import get_disk_pressure_watermarks, relieve_disk_pressure
+from .priority import (
+    DEFAULT_BACKGROUND_MAX_FILE_OPS_PER_SECOND,
+    DEFAULT_BACKGROUND_PRIORITY,
+    configure_file_operation_rate_limit,
+)
+from .purge import (
+    DEFAULT_DELETION_MODE,
+    DELETION_MODE_STAGED,
+    DELETION_MODES,
+    BackgroundPurger,
+)
+from .registry import ProjectRecord, ProjectRegistry, project_key
+from .scheduler import (
+    DEFAULT_MAX_CONCURRENT_SCANS,
+    DEFAULT_MAX_IO_PER_ROTATIONAL_DEVICE,
+    DEFAULT_MAX_IO_PER_SOLID_STATE_DEVICE,
+    IO_KIND_DELETE,
+    IO_KIND_SCAN,
+    IOScheduler,
+)
+from .sizes import (
+    DirectorySizeIndex,
+    calculate_item_stats_from_breakdown,
+    calculate_project_cache_size,
+    calculate_project_total_potential_cache,
+    format_size,
+    scan_project_cache_breakdown,
+)
+from .watcher import (
+    MONITORING_MODE_INTERVAL,
+    MONITORING_MODE_WATCH,
+    CacheChangeWatcher,
+)
+
+# Intervalo com que a thread do Tk recolhe os resultados prontos do IOScheduler.
+SCAN_RESULTS_POLL_INTERVAL_MS = 250
+
+
+# Intervalo com que a thread do Tk recolhe o progresso da limpeza em segundo plano.
+CLEANING_PROGRESS_POLL_INTERVAL_MS = 200
+
+
+DEFAULT_LOG_MAX_LINES = 5000
+# Intervalo com que a thread do Tk descarrega a fila de logs na aba "Logs".
+LOG_DRAIN_INTERVAL_MS = 200
+
+
+def resource_path(relative_path):
+    """Retorna o caminho absoluto para o recurso, funciona para dev e para PyInstaller"""
+    try:
+        # PyInstaller cria uma pasta temp e armazena o caminho em _MEIPASS
+        base_path = sys._MEIPASS
+    except Exception:
+        # base_path será o diretório onde o script está localizado em modo de desenvolvimento
+        base_path = APPLICATION_PATH  # Raiz do repositório (onde ficam app.py e o ícone)
+        # Se preferir o diretório de trabalho atual em dev (CWD):
+        # base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+
+def _import_tray_modules():
+    """Importa pystray e PIL sob demanda. Retorna (None, None) sem bandeja disponível (ex: Linux sem display)."""
+    try:
+        import pystray
+        from PIL import Image
+    except Exception:
+        return None, None
+    return pystray, Image
+
+
+# --- Interface Gráfica (CustomTkinter) ---
+
+
+class App(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+
+        # Pipeline de logs: produtores (qualquer thread) enfileiram; a thread do Tk descarrega em lote
+        self._log_queue = queue.SimpleQueue()
+        self.log_level = DEFAULT_LOG_LEVEL
+        self._log_level_threshold = LOG_LEVEL_ORDER[DEFAULT_LOG_LEVEL]
+        self.log_max_lines = DEFAULT_LOG_MAX_LINES
+
+        self.title("Limpador de Cache Unreal Engine")
+        self.geometry("1070x800")
+        ctk.set_appearance_mode("System")
+        ctk.set_default_color_theme("blue")
+
+        # --- DEFINIR ÍCONE DA JANELA PRINCIPAL ---
+        try:
+            icon_path = resource_path(
+                "CleanUnreal.ico"
+            )  # Usa a função para obter o caminho
+            if os.path.exists(icon_path):
+                self.iconbitmap(icon_path)  # Define o ícone da janela
+                self.log_message(
+                    f"Ícone da janela principal '{icon_path}' carregado.", level="DEBUG"
+                )
+            else:
+                self.log_message(
+                    f"AVISO: Ícone da janela principal '{icon_path}' NÃO ENCONTRADO.",
+                    level="WARNING",
+                )
+        except Exception as e:
+            self.log_message(
+                f"Erro ao definir o ícone da janela principal: {e}", level="ERROR"
+            )
+        # -----------------------------------------
+
+        # --- CRIA O TABVIEW COMO ELEMENTO PRINCIPAL ---
+        self.tab_view = ctk.CTkTabview(self, corner_radius=8)
+        self.tab_view.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.tab_view.add("Gerenciador")  # Nome da primeira aba
+        self.tab_view.add("Logs")  # Nome da segunda aba
+
+        # --- FRAME PRINCIPAL DA ABA "GERENCIADOR" ---
+        # Todo o conteúdo que antes estava em self.main_frame agora vai para self.tab_view.tab("Gerenciador")
+        self.manager_tab_frame = self.tab_view.tab("Gerenciador")
+
+        # --- Frame de Controles Globais (dentro da aba "Gerenciador") ---
+        self.global_actions_frame = ctk.CTkFrame(
+            self.manager_tab_frame
+        )  # Pai agora é manager_tab_frame
+        self.global_actions_frame.pack(fill="x", pady=(0, 10))
+        # ... (seus botões analyze_all_button, clean_allowed_button, global_status_label como antes, mas com pai global_actions_frame) ...
+        self.analyze_all_button = ctk.CTkButton(
+            self.global_actions_frame,
+            text="Analisar Todos os Projetos",
+            command=self.analyze_all_projects_action,
+        )
+        self.analyze_all_button.pack(side="left", padx=5, pady=5)
+
+        self.clean_allowed_button = ctk.CTkButton(
+            self.global_actions_frame,
+            text="Limpar Projetos Permitidos",
+            command=self.clean_allowed_projects_action,
+        )
+        self.clean_allowed_button.pack(side="left", padx=5, pady=5)
+
+        self.cancel_cleaning_button = ctk.CTkButton(
+            self.global_actions_frame,
+            text="Cancelar Limpeza",
+            command=self.cancel_cleaning_action,
+            state="disabled",
+            width=130,
+        )
+        self.cancel_cleaning_button.pack(side="left", padx=5, pady=5)
+
+        self.global_status_label = ctk.CTkLabel(
+            self.global_actions_frame, text="Status Global: Pronto"
+        )
+        self.global_status_label.pack(side="left", padx=10, pady=5)
+
+        # --- Frame de Configurações de Monitoramento (Pai) ---
+        self.monitoring_parent_frame = ctk.CTkFrame(self.manager_tab_frame)
+        self.monitoring_parent_frame.pack(fill="x", pady=(0, 10))
+
+        # --- Linha 1 dos Controles de Monitoramento ---
+        self.monitoring_line1_frame = ctk.CTkFrame(self.monitoring_parent_frame)
+        self.monitoring_line1_frame.pack(fill="x")
+
+        self.auto_start_monitoring_checkbox = ctk.CTkCheckBox(
+            self.monitoring_line1_frame,  # Adiciona à primeira linha
+            text="Ativar monitoramento automático ao iniciar o programa",
+        )
+        self.auto_start_monitoring_checkbox.pack(side="left", padx=5, pady=5)
+
+        self.start_with_windows_checkbox = ctk.CTkCheckBox(
+            self.monitoring_line1_frame,  # Adiciona à primeira linha
+            text="Iniciar com o Windows",
+            command=self.toggle_startup_status,
+        )
+        self.start_with_windows_checkbox.pack(side="left", padx=(10, 5), pady=5)
+
+        self.monitoring_interval_label = ctk.CTkLabel(
+            self.monitoring_line1_frame,  # Adiciona à primeira linha
+            text="Intervalo (minutos):",
+        )
+        self.monitoring_interval_label.pack(side="left", padx=(10, 2), pady=5)
+
+        self.monitoring_interval_var = ctk.StringVar()
+        self.monitoring_interval_var.trace_add(
+            "write", self.on_monitoring_interval_change
+        )
+        self.monitoring_interval_entry = ctk.CTkEntry(
+            self.monitoring_line1_frame,  # Adiciona à primeira linha
+            width=60,
+            textvariable=self.monitoring_interval_var,
+            placeholder_text="Ex: 60",
+        )
+        self.monitoring_interval_entry.pack(side="left", padx=(0, 10), pady=5)
+
+        self.watch_mode_monitoring_checkbox = ctk.CTkCheckBox(
+            self.monitoring_line1_frame,  # Adiciona à primeira linha
+            text="Monitorar por eventos do sistema de arquivos",
+            command=self._on_watch_mode_toggled,
+        )
+        self.watch_mode_monitoring_checkbox.pack(side="left", padx=(10, 5), pady=5)
+
+        # --- Linha 2 dos Controles de Monitoramento ---
+        self.monitoring_line2_frame = ctk.CTkFrame(self.monitoring_parent_frame)
+        self.monitoring_line2_frame.pack(
+            fill="x", pady=(5, 0)
+        )  # Um pouco de pady entre as linhas
+
+        self.start_monitoring_button_ui = ctk.CTkButton(
+            self.monitoring_line2_frame,  # Adiciona à segunda linha
+            text="Iniciar Monitoramento",
+            command=self.start_auto_monitoring,
+            width=150,
+        )
+        self.start_monitoring_button_ui.pack(side="left", padx=5, pady=5)
+
+        self.stop_monitoring_button_ui = ctk.CTkButton(
+            self.monitoring_line2_frame,  # Adiciona à segunda linha
+            text="Parar Monitoramento",
+            command=self.stop_auto_monitoring,
+            state="disabled",
+            width=150,
+        )
+        self.stop_monitoring_button_ui.pack(side="left", padx=5, pady=5)
+
+        self.monitoring_status_label = ctk.CTkLabel(
+            self.monitoring_line2_frame,  # Adiciona à segunda linha
+            text="Monitoramento Automático: Parado",
+        )
+        # Para o label de status, se você quiser que ele use o espaço restante:
+        self.monitoring_status_label.pack(
+            side="left", padx=10, pady=5, fill="x", expand=True
+        )
+
+        # --- Seção da Lista de Projetos (dentro da aba "Gerenciador") ---
+        self.project_list_title_label = ctk.CTkLabel(
+            self.manager_tab_frame,
+            text="Projetos:",
+            font=ctk.CTkFont(size=16, weight="bold"),
+        )  # Pai agora é manager_tab_frame
+        self.project_list_title_label.pack(fill="x", pady=(5, 5))
+
+        self.project_scrollable_frame = ctk.CTkScrollableFrame(
+            self.manager_tab_frame, height=350
+        )  # Pai agora é manager_tab_frame
+        self.project_scrollable_frame.pack(fill="both", expand=True)
+
+        # --- Frame dos Botões de Scan/Add Manual (dentro da aba "Gerenciador") ---
+        self.discovery_controls_frame = ctk.CTkFrame(
+            self.manager_tab_frame
+        )  # Pai agora é manager_tab_frame
+        self.discovery_controls_frame.pack(fill="x", pady=(10, 0))
+        # ... (seus botões scan_default_button e manual_add_button como antes) ...
+        self.scan_default_button = ctk.CTkButton(
+            self.discovery_controls_frame,
+            text="Escanear Pastas de Busca Novamente",
+            command=lambda: self.start_discover_projects_thread(
+                clear_current_list=True
+            ),
+        )
+        self.scan_default_button.pack(side="left", padx=5, pady=5)
+
+        self.manual_add_button = ctk.CTkButton(
+            self.discovery_controls_frame,
+            text="Adicionar Projeto Manualmente",
+            command=self.prompt_add_project_manually,
+        )
+        self.manual_add_button.pack(side="left", padx=5, pady=5)
+
+        # --- Configuração da Aba de Logs ---
+        self.log_tab_frame = self.tab_view.tab("Logs")
+        self.log_textbox = ctk.CTkTextbox(
+            self.log_tab_frame,
+            wrap="word",  # Quebra de linha por palavra
+            state="disabled",  # Começa desabilitado para edição pelo usuário
+            font=("Consolas", 10),  # Fonte monoespaçada para logs
+        )
+        self.log_textbox.pack(fill="both", expand=True, padx=5, pady=5)
+        self.after(LOG_DRAIN_INTERVAL_MS, self._drain_log_queue)
+
+        # Atributos da classe (como antes)
+        # Modelo dos projetos da lista; os widgets de cada um ficam em project_widgets
+        self.project_registry = ProjectRegistry()
+        self.project_widgets = {}  # {project_key: widgets do projeto}
+        # Pastas raiz e profundidade da busca de projetos ("project_search_roots"/"_max_depth")
+        self.project_search_roots = [UNREAL_PROJECTS_DEFAULT_PATH]
+        self.project_search_max_depth = DEFAULT_PROJECT_SEARCH_MAX_DEPTH
+        # Projetos novos já mostrados durante a busca em andamento (antes do resultado final)
+        self._discovery_streamed_paths = set()
+        self.monitoring_thread = None
+        self.monitoring_stop_event = threading.Event()
+        self.AUTO_MONITOR_INTERVAL_SECONDS = 3600
+        self.monitoring_mode = MONITORING_MODE_INTERVAL
+        # Tamanho por item de limpeza mantido pelo modo por eventos: chave do projeto -> {item_id: bytes}
+        self._monitor_item_sizes = {}
+
+        self.tray_icon = None
+        self.icon_image = None
+        self.is_window_visible = True
+
+        self.protocol("WM_DELETE_WINDOW", self.hide_to_tray)
+        self.after(100, self.setup_and_run_tray_icon)
+
+        # Carregar dados e iniciar automaticamente
+        self.log_message("Aplicativo iniciando...")  # Exemplo de uso do novo logger
+        # Gravação atômica do JSON de configuração; mudanças seguidas viram uma gravação só
+        self.config_store = ConfigStore(ABSOLUTE_CONFIG_PATH, self)
+        self.size_index = DirectorySizeIndex(ABSOLUTE_SIZE_INDEX_PATH)
+        # Histogramas de idade do DerivedDataCache (despejo LRU), reaproveitados entre execuções
+        self.ddc_eviction_index = DdcEvictionIndex(ABSOLUTE_DDC_EVICTION_INDEX_PATH)
+        self.ddc_eviction_index.load()
+        # Histórico de análises e limpezas (SQLite); gravado em lote, ao fim de cada ciclo
+        self.history_store = ScanHistoryStore(ABSOLUTE_HISTORY_DB_PATH)
+        # Pastas já visitadas pela descoberta de projetos, revalidadas pelo mtime
+        self.discovery_cache = ProjectDiscoveryCache(ABSOLUTE_DISCOVERY_CACHE_PATH)
+        self.discovery_cache.load()
+        # Análises e limpezas de projeto, com limite de tarefas simultâneas por disco
+        self.io_scheduler = IOScheduler(
+            DEFAULT_MAX_CONCURRENT_SCANS,
+            max_deletes_per_device=DEFAULT_MAX_CLEANS_PER_VOLUME,
+        )
+        self.open_editor_index = OpenEditorIndex()
+        self._scan_results_poll_scheduled = False
+        self.cleaning_pipeline = None
+        self.max_cleans_per_volume = DEFAULT_MAX_CLEANS_PER_VOLUME
+        self.deletion_mode = DEFAULT_DELETION_MODE
+        # Limpeza por espaço livre nos volumes: None = desligada, senão (limite, alvo) em bytes
+        self.disk_pressure_settings = {
+            "disk_pressure_low_free_gb": "",
+            "disk_pressure_target_free_gb": "",
+        }
+        self.disk_pressure_watermarks = None
+        # Monitoramento automático com prioridade baixa de CPU/E/S e limite de operações por segundo
+        self.background_priority = DEFAULT_BACKGROUND_PRIORITY
+        self.background_max_file_ops_per_second = (
+            DEFAULT_BACKGROUND_MAX_FILE_OPS_PER_SECOND
+        )
+        self.cleanup_priority_order = list(DEFAULT_CLEANUP_PRIORITY_ORDER)
+        # Apaga em segundo plano as subpastas movidas no modo "staged" (e retoma purgas pendentes)
+        self.purger = BackgroundPurger(
+            self,
+            ABSOLUTE_PURGE_JOURNAL_PATH,
+            on_bytes_freed=self._on_purge_bytes_freed,
+        )
+        self._purge_bytes_by_project = {}  # chave -> bytes liberados pelo purgador (thread do Tk)
+        self.purger.start()
+        if self.size_index.load():
+            self.log_message(
+                f"Índice de tamanhos carregado de '{ABSOLUTE_SIZE_INDEX_PATH}' ({len(self.size_index)} pastas).",
+                level="DEBUG",
+            )
+        self.load_app_data()
+        self.initial_project_discovery_and_load()
+
+        if self.auto_start_monitoring_checkbox.get() == 1:
+            self.start_auto_monitoring()
+
+        if sys.platform == "win32":  # Só faz sentido no Windows
+            self._check_startup_status()
+        # ...
+
+        self.log_message("Interface principal inicializada.")
+
+        # Inicia o monitoramento se configurado (como antes)
+        if self.auto_start_monitoring_checkbox.get() == 1:
+            self.start_auto_monitoring()
+
+        if self.auto_start_monitoring_checkbox.get() == 1:
+            self.start_auto_monitoring()  # Isso já vai configurar os botões e o label
+        else:
+            # Garante estado inicial correto dos botões se não iniciar automaticamente
+            if hasattr(self, "start_monitoring_button_ui"):
+                self.start_monitoring_button_ui.configure(state="normal")
+            if hasattr(self, "stop_monitoring_button_ui"):
+                self.stop_monitoring_button_ui.configure(state="disabled")
+            if hasattr(self, "monitoring_status_label"):
+                self.monitoring_status_label.configure(
+                    text="Monitoramento Automático: Parado"
+                )
+
+        # Opcional: Iniciar minimizado (pode ser uma configuração no futuro)
+        # if self.settings.get("start_minimized_to_tray", False): # Exemplo
+        #     self.hide_to_tray()
+
+    def remove_project_entry(self, project_info_to_remove):
+        """
+        Remove uma entrada de projeto da interface, da lista interna de widgets
+        e persiste a remoção salvando os dados.
+        """
+        path_to_remove = project_info_to_remove.get("path")
+        name_to_remove = project_info_to_remove.get("name", "NomeDesconhecido")
+
+        if not path_to_remove:
+            self.log_message(
+                "REMOVE_PROJECT: Tentativa de remover projeto sem um 'path' válido nos dados fornecidos.",
+                level="ERROR",
+            )
+            return
+
+        # Garante que estamos comparando caminhos normalizados
+        normalized_path_to_remove = os.path.normpath(path_to_remove)
+
+        self.log_message(
+            f"REMOVE_PROJECT: Solicitação para remover projeto '{name_to_remove}' (Path Normalizado: {normalized_path_to_remove})",
+            level="INFO",
+        )
+
+        widget_info_found = self.project_widgets.pop(
+            project_key(normalized_path_to_remove), None
+        )
+        if widget_info_found is not None:
+            self.project_registry.remove(normalized_path_to_remove)
+            project_frame_to_destroy = widget_info_found.get("frame")
+
+            if (
+                project_frame_to_destroy
+                and hasattr(project_frame_to_destroy, "winfo_exists")
+                and project_frame_to_destroy.winfo_exists()
+            ):
+                project_frame_to_destroy.destroy()
+                self.log_message(
+                    f"REMOVE_PROJECT: Frame da UI para '{name_to_remove}' destruído.",
+                    level="DEBUG",
+                )
+            else:
+                self.log_message(
+                    f"REMOVE_PROJECT: Frame da UI para '{name_to_remove}' não encontrado ou já destruído.",
+                    level="WARNING",
+                )
+
+            # Descarta as entradas do índice de tamanhos referentes a este projeto
+            for main_folder_name in POTENTIAL_CACHE_MAIN_FOLDERS:
+                self.size_index.forget(
+                    os.path.join(normalized_path_to_remove, main_folder_name)
+                )
+            self._monitor_item_sizes.pop(
+                CacheChangeWatcher.project_key(normalized_path_to_remove), None
+            )
+
+            self.log_message(
+                f"REMOVE_PROJECT: Projeto '{name_to_remove}' removido com sucesso das listas internas.",
+                level="INFO",
+            )
+
+            # Atualizar o status global para refletir a mudança
+            if (
+                hasattr(self, "global_status_label")
+                and self.global_status_label.winfo_exists()
+            ):
+                self.global_status_label.configure(
+                    text=f"Status Global: Projeto '{name_to_remove}' removido. {len(self.project_widgets)} projeto(s) restante(s)."
+                )
+
+            # Persistir a mudança imediatamente salvando os dados
+            self.log_message(
+                "REMOVE_PROJECT: Salvando dados após remoção do projeto...",
+                level="DEBUG",
+            )
+            self.save_app_data()
+        else:
+            self.log_message(
+                f"REMOVE_PROJECT: Projeto '{name_to_remove}' (Path: {normalized_path_to_remove}) não encontrado na lista de widgets para remoção.",
+                level="WARNING",
+            )
+
+    def refresh_project_cleanup_items_ui(
+        self, project_path, successfully_deleted_relative_subfolder_paths
+    ):
+        """
+        Remove da UI os widgets (checkboxes e seus frames) correspondentes às subpastas
+        que foram deletadas do disco. Também atualiza o folder_checkboxes_map interno
+        e os itens selecionados do registro. Roda na thread do Tk.
+        """
+        project_widget_info = self.project_widgets.get(project_key(project_path))
+        record = self.project_registry.get(project_path)
+        if project_widget_info is None or record is None:
+            return  # Projeto removido da lista enquanto era limpo
+        project_name_for_log = record.name
+        if not successfully_deleted_relative_subfolder_paths:
+            self.log_message(
+                f"REFRESH_UI: Nenhuma subpasta deletada reportada para o projeto '{project_name_for_log}'. Nada a atualizar na UI.",
+                level="DEBUG",
+            )
+            return
+
+        self.log_message(
+            f"REFRESH_UI: Atualizando lista de subpastas para o projeto '{project_name_for_log}' após deleções: {successfully_deleted_relative_subfolder_paths}",
+            level="INFO",
+        )
+
+        folder_checkboxes_map = project_widget_info.get("folder_checkboxes", {})
+
+        # Precisamos de uma referência ao frame que contém todos os 'item_frame' das subpastas
+        # para verificar se ele ficou vazio e, talvez, atualizar o botão de toggle.
+        # Esta referência deve ser o 'selectable_items_frame_ui' da função add_project_entry_to_ui
+        # para cada categoria (Intermediate, DerivedDataCache, Saved).
+        # A estrutura atual de add_project_entry_to_ui cria um selectable_items_frame_ui GERAL
+        # e dentro dele os cabeçalhos e depois os item_frames das subpastas.
+
+        items_removed_from_map = []
+
+        for rel_path_deleted_raw in successfully_deleted_relative_subfolder_paths:
+            # Garante que estamos usando o mesmo formato de caminho normalizado que foi usado como chave no mapa
+            normalized_rel_path_deleted = os.path.normpath(rel_path_deleted_raw)
+
+            if normalized_rel_path_deleted in folder_checkboxes_map:
+                chk_data = folder_checkboxes_map[normalized_rel_path_deleted]
+                checkbox_widget = chk_data.get("widget")  # Este é o CTkCheckBox
+
+                if (
+                    checkbox_widget
+                    and hasattr(checkbox_widget, "master")
+                    and checkbox_widget.master
+                ):
+                    # O 'master' do CTkCheckBox é o 'item_frame' que contém o checkbox e o label de descrição.
+                    item_frame_to_destroy = checkbox_widget.master
+
+                    if (
+                        hasattr(item_frame_to_destroy, "winfo_exists")
+                        and item_frame_to_destroy.winfo_exists()
+                    ):
+                        item_frame_to_destroy.destroy()
+                        self.log_message(
+                            f"REFRESH_UI: Removido da UI o item de limpeza: {normalized_rel_path_deleted} para o projeto '{project_name_for_log}'.",
+                            level="DEBUG",
+                        )
+                        items_removed_from_map.append(normalized_rel_path_deleted)
+                    else:
+                        self.log_message(
+                            f"REFRESH_UI: Tentativa de destruir frame para '{normalized_rel_path_deleted}', mas o frame já não existe (projeto '{project_name_for_log}').",
+                            level="TRACE",
+                        )
+                else:
+                    self.log_message(
+                        f"REFRESH_UI: Não foi possível encontrar o frame pai para o checkbox de '{normalized_rel_path_deleted}' (projeto '{project_name_for_log}').",
+                        level="WARNING",
+                    )
+
+                # Remove do mapa na memória DEPOIS de tentar destruir o widget
+                # Isso garante que mesmo que a destruição falhe por algum motivo, tentamos limpar o mapa.
+                if (
+                    normalized_rel_path_deleted in items_removed_from_map
+                ):  # Só remove do mapa se a UI foi atualizada
+                    del folder_checkboxes_map[normalized_rel_path_deleted]
+
+            else:
+                self.log_message(
+                    f"REFRESH_UI: Subpasta deletada '{normalized_rel_path_deleted}' não encontrada no folder_checkboxes_map do projeto '{project_name_for_log}' para remoção da UI.",
+                    level="TRACE",
+                )
+
+        # Após remover todos os itens deletados, podemos querer verificar se algum
+        # 'main_folder_header_label' (ex: "Saved:") agora não tem mais nenhuma subpasta listada abaixo dele
+        # e, se for o caso, adicionar uma mensagem "(Nenhuma subpasta encontrada)" e desabilitar o botão de toggle.
+        # Esta parte é mais complexa e envolve re-verificar a estrutura da UI.
+        # Por enquanto, o foco é remover os itens que foram deletados.
+
+        # Força um redesenho da lista de projetos, se necessário (geralmente não é preciso com .destroy())
+        # self.project_scrollable_frame.update_idletasks()
+        self._sync_project_record(project_path)
+
+        self.log_message(
+            f"REFRESH_UI: Concluída atualização da UI para '{project_name_for_log}'. Itens removidos do mapa: {items_removed_from_map}",
+            level="DEBUG",
+        )
+
+    def toggle_visibility(
+        self, frame_to_toggle, button_pressed, button_text_prefix="Subpastas"
+    ):
+        """Mostra ou esconde um frame e atualiza o texto do botão."""
+        if frame_to_toggle.winfo_ismapped():  # Se o frame está visível
+            frame_to_toggle.pack_forget()  # Esconde o frame
+            if button_pressed:
+                button_pressed.configure(
+                    text=f"{button_text_prefix} ▼"
+                )  # Texto para mostrar
+        else:
+            # Simplesmente faz o pack. O botão ficará acima do frame que é mostrado.
+            frame_to_toggle.pack(
+                fill="x", padx=5, pady=(0, 5), after=button_pressed.master
+            )  # Tenta empacotar depois do frame do botão
+            if button_pressed:
+                button_pressed.configure(
+                    text=f"{button_text_prefix} ▲"
+                )  # Texto para recolher
+
+    def on_monitoring_interval_change(
+        self, *args
+    ):  # *args é necessário para o callback do trace da StringVar
+        """
+        Chamado quando o valor do campo de entrada do intervalo de monitoramento (em minutos) muda.
+        Valida a entrada, converte para segundos e atualiza self.AUTO_MONITOR_INTERVAL_SECONDS.
+        """
+        current_value_str_minutes = self.monitoring_interval_var.get()
+        self.log_message(
+            f"ON_INTERVAL_CHANGE: Valor digitado no campo de minutos: '{current_value_str_minutes}'",
+            level="TRACE",
+        )
+
+        MIN_INPUT_INTERVAL_MINUTES = (
+            1  # Define um valor mínimo que o usuário pode configurar na UI (em minutos)
+        )
+
+        # Calcula o valor de fallback EM MINUTOS a partir do AUTO_MONITOR_INTERVAL_SECONDS atual (que está em segundos)
+        # Este valor será usado para reverter a UI em caso de entrada inválida.
+        current_auto_interval_in_minutes = self.AUTO_MONITOR_INTERVAL_SECONDS // 60
+        if current_auto_interval_in_minutes < MIN_INPUT_INTERVAL_MINUTES:
+            # Se o valor interno atual for menor que o mínimo permitido na UI (ex: após carregar um valor inválido),
+            # o fallback para a UI deve ser o mínimo permitido na UI.
+            fallback_minutes_str = str(MIN_INPUT_INTERVAL_MINUTES)
+        else:
+            fallback_minutes_str = str(current_auto_interval_in_minutes)
+
+        try:
+            if not current_value_str_minutes:
+                self.log_message(
+                    f"ON_INTERVAL_CHANGE: Campo de intervalo (minutos) esvaziado. Intervalo interno (segundos) permanece: {self.AUTO_MONITOR_INTERVAL_SECONDS}s",
+                    level="DEBUG",
+                )
+                # Se o campo estiver vazio, não fazemos nada com AUTO_MONITOR_INTERVAL_SECONDS.
+                # Opcionalmente, você poderia reverter para o fallback aqui também se preferir que o campo não fique vazio.
+                # Ex: self.after(500, lambda: self.monitoring_interval_var.set(fallback_minutes_str) if not self.monitoring_interval_var.get() else None)
+                return
+
+            new_interval_minutes_int = int(current_value_str_minutes)
+
+            if new_interval_minutes_int >= MIN_INPUT_INTERVAL_MINUTES:
+                new_interval_seconds_int = new_interval_minutes_int * 60
+                if self.AUTO_MONITOR_INTERVAL_SECONDS != new_interval_seconds_int:
+                    self.AUTO_MONITOR_INTERVAL_SECONDS = new_interval_seconds_int
+                    self.log_message(
+                        f"ON_INTERVAL_CHANGE: Intervalo de monitoramento (interno) atualizado para: {self.AUTO_MONITOR_INTERVAL_SECONDS} segundos ({new_interval_minutes_int} minutos).",
+                        level="INFO",
+                    )
+                else:
+                    self.log_message(
+                        f"ON_INTERVAL_CHANGE: Valor do intervalo (minutos) '{new_interval_minutes_int}' resultou no mesmo intervalo em segundos ({self.AUTO_MONITOR_INTERVAL_SECONDS}s). Nenhuma mudança interna.",
+                        level="TRACE",
+                    )
+            else:
+                self.log_message(
+                    f"ON_INTERVAL_CHANGE: Tentativa de definir intervalo menor que {MIN_INPUT_INTERVAL_MINUTES} min ('{current_value_str_minutes}'). Intervalo interno (segundos) mantido em: {self.AUTO_MONITOR_INTERVAL_SECONDS}s.",
+                    level="WARNING",
+                )
+                # Reverte o campo da UI para o valor de fallback após um pequeno delay
+                # para permitir que o usuário termine de digitar ou corrija.
+                self.after(
+                    1500,
+                    lambda: (
+                        self.monitoring_interval_var.set(fallback_minutes_str)
+                        if self.monitoring_interval_var.get()
+                        == current_value_str_minutes
+                        else None
+                    ),
+                )
+
+        except ValueError:
+            if (
+                current_value_str_minutes
+            ):  # Só loga e tenta reverter se não for string vazia
+                self.log_message(
+                    f"ON_INTERVAL_CHANGE: Valor de intervalo (minutos) não numérico digitado: '{current_value_str_minutes}'. Intervalo interno (segundos) mantido em: {self.AUTO_MONITOR_INTERVAL_SECONDS}s.",
+                    level="WARNING",
+                )
+                # Reverte o campo da UI para o valor de fallback
+                self.after(
+                    1500,
+                    lambda: (
+                        self.monitoring_interval_var.set(fallback_minutes_str)
+                        if self.monitoring_interval_var.get()
+                        == current_value_str_minutes
+                        else None
+                    ),
+                )
+
+    def _get_executable_path(self):
+        """Retorna o caminho do executável atual."""
+        if hasattr(sys, "frozen") and sys.frozen:  # Rodando como .exe (PyInstaller)
+            return sys.executable
+        else:  # Rodando como script .py
+            return os.path.join(APPLICATION_PATH, "app.py")
+
+    def _set_startup_registry(self, app_name, exe_path, enable=True):
+        """Adiciona ou remove a aplicação da inicialização do Windows via Registro."""
+        if sys.platform != "win32":
+            self.log_message(
+                "Configuração de inicializar com o sistema operacional só é suportada no Windows.",
+                level="WARNING",
+            )
+            return False
+
+        import winreg  # Só existe no Windows; importado apenas quando necessário
+
+        registry_key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
+        try:
+            key = winreg.OpenKey(
+                winreg.HKEY_CURRENT_USER, registry_key_path, 0, winreg.KEY_WRITE
+            )
+            if enable:
+                winreg.SetValueEx(
+                    key, app_name, 0, winreg.REG_SZ, f'"{exe_path}"'
+                )  # Adiciona aspas para caminhos com espaços
+                self.log_message(
+                    f"'{app_name}' adicionado à inicialização do Windows.", level="INFO"
+                )
+            else:
+                winreg.DeleteValue(key, app_name)
+                self.log_message(
+                    f"'{app_name}' removido da inicialização do Windows.", level="INFO"
+                )
+            winreg.CloseKey(key)
+            return True
+        except (
+            FileNotFoundError
+        ):  # A chave pode não existir se o programa nunca foi adicionado
+            if not enable:  # Se estamos tentando remover e não existe, está ok
+                self.log_message(
+                    f"'{app_name}' não encontrado na inicialização do Windows para remover.",
+                    level="INFO",
+                )
+                return True
+            self.log_message(
+                f"Erro: Chave do Registro não encontrada para '{app_name}' ao tentar remover.",
+                level="ERROR",
+            )
+            return False
+        except Exception as e:
+            self.log_message(
+                f"Erro ao {'adicionar' if enable else 'remover'} '{app_name}' {'à' if enable else 'da'} inicialização do Windows: {e}",
+                level="ERROR",
+            )
+            import traceback
+
+            traceback.print_exc()  # Para mais detalhes do erro no console
+            return False
+
+    def toggle_startup_status(self):
+        """Chamado quando o checkbox 'Iniciar com o Windows' é alterado."""
+        app_name = (
+            "LimpadorUnrealCache"  # Nome que aparecerá no gerenciador de inicialização
+        )
+        exe_path = self._get_executable_path()
+
+        if self.start_with_windows_checkbox.get() == 1:  # Se está marcado
+            self._set_startup_registry(app_name, exe_path, enable=True)
+        else:  # Se está desmarcado
+            self._set_startup_registry(app_name, exe_path, enable=False)
+
+        self.save_app_data()  # Para persistir a configuração do checkbox
+
+    def _check_startup_status(self):
+        """Verifica se a aplicação está configurada para iniciar com o Windows e atualiza o checkbox."""
+        if sys.platform != "win32":
+            return
+
+        app_name = "LimpadorUnrealCache"
+        import winreg  # Só existe no Windows; importado apenas quando necessário
+
+        registry_key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
+        is_in_startup = False
+        try:
+            key = winreg.OpenKey(
+                winreg.HKEY_CURRENT_USER, registry_key_path, 0, winreg.KEY_READ
+            )
+            winreg.QueryValueEx(
+                key, app_name
+            )  # Tenta ler o valor; se não existir, lança FileNotFoundError
+            is_in_startup = True
+            winreg.CloseKey(key)
+        except FileNotFoundError:
+            is_in_startup = False
+        except Exception as e:
+            self.log_message(
+                f"Erro ao verificar status de inicialização com Windows: {e}",
+                level="WARNING",
+            )
+            is_in_startup = False  # Assume que não está no startup em caso de erro
+
+        if is_in_startup:
+            self.start_with_windows_checkbox.select()
+        else:
+            self.start_with_windows_checkbox.deselect()
+        self.log_message(
+            f"Checkbox 'Iniciar com Windows' atualizado para: {'Selecionado' if is_in_startup else 'Não Selecionado'}",
+            level="DEBUG",
+        )
+
+    def set_log_level(self, level):
+        level = str(level).upper()
+        if level not in LOG_LEVEL_ORDER:
+            raise ValueError(f"Nível de log desconhecido: '{level}'")
+        self.log_level = level
+        self._log_level_threshold = LOG_LEVEL_ORDER[level]
+
+    def is_log_level_enabled(self, level):
+        return LOG_LEVEL_ORDER.get(level, LOG_LEVEL_ORDER["INFO"]) >= self._log_level_threshold
+
+    def _drain_log_queue(self):
+        """
+        Descarrega a fila de logs no console e na aba "Logs" (uma escrita e um único insert) e
+        mantém o textbox limitado a 'log_max_lines' linhas. Reagenda a si mesma enquanto a
+        janela existir.
+        """
+        entries = self._take_log_entries()
+        self._write_console_log(entries)
+
+        if entries and hasattr(self, "log_textbox") and self.log_textbox.winfo_exists():
+            if len(entries) > self.log_max_lines:
+                entries = entries[-self.log_max_lines :]
+            try:
+                self.log_textbox.configure(state="normal")
+                self.log_textbox.insert("end", "".join(entries))
+                line_count = int(self.log_textbox.index("end-1c").split(".")[0])
+                if line_count > self.log_max_lines:
+                    self.log_textbox.delete(
+                        "1.0", f"{line_count - self.log_max_lines + 1}.0"
+                    )
+                self.log_textbox.see("end")
+                self.log_textbox.configure(state="disabled")
+            except Exception as e:
+                print(f"Erro ao adicionar logs à UI: {e}")
+
+        try:
+            self.after(LOG_DRAIN_INTERVAL_MS, self._drain_log_queue)
+        except Exception:
+            pass  # Janela já destruída
+
+    def _take_log_entries(self):
+        """Tira da fila (sem bloquear) todas as entradas de log pendentes."""
+        entries = []
+        try:
+            while True:
+                entries.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return entries
+
+    @staticmethod
+    def _write_console_log(entries):
+        """Escreve um lote de entradas de log no console com uma única escrita."""
+        if not entries:
+            return
+        try:
+            sys.stdout.write("".join(f"CONSOLE LOG: {entry}" for entry in entries))
+            sys.stdout.flush()
+        except (AttributeError, OSError, ValueError):
+            pass  # Sem console (ex: executável sem janela de terminal)
+
+    def log_message(self, message, level="INFO"):
+        # Filtra antes de formatar qualquer coisa
+        if not self.is_log_level_enabled(level):
+            return
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+        log_entry_ui = f"[{timestamp}] [{level}] {message}\n"
+        # O console é escrito em lote por _drain_log_queue, não por mensagem
+        self._log_queue.put(log_entry_ui)
+
+    def setup_and_run_tray_icon(self):
+        print("--- DEBUG: setup_and_run_tray_icon INICIADA ---")
+        pystray, Image = _import_tray_modules()
+        if pystray is None:
+            self.log_message(
+                "Bandeja do sistema indisponível neste ambiente. Ícone da bandeja desativado.",
+                level="WARNING",
+            )
+            return
+
+        self.icon_image = None  # Inicializa
+        try:
+            icon_path = resource_path("CleanUnreal.ico")
+            if os.path.exists(icon_path):
+                self.icon_image = Image.open(icon_path)
+                print(f"UI: Ícone '{icon_path}' carregado com sucesso para a bandeja.")
+            else:
+                print(f"AVISO CRÍTICO: Arquivo de ícone '{icon_path}' NÃO ENCONTRADO.")
+        except Exception as e_icon_load:
+            print(
+                f"Erro CRÍTICO ao carregar imagem do ícone '{icon_path}': {e_icon_load}"
+            )
+            import traceback
+
+            traceback.print_exc()
+
+        try:
+            print("--- DEBUG: setup_and_run_tray_icon - Tentando criar menu_items ---")
+            # Chama create_monitoring_submenu que agora também tem try-except
+            monitoring_submenu_items = self.create_monitoring_submenu()
+
+            menu_items = (
+                pystray.MenuItem("Abrir Limpador", self.show_from_tray, default=True),
+                pystray.MenuItem("Monitoramento", monitoring_submenu_items),
+                pystray.Menu.SEPARATOR,
+                pystray.MenuItem("Fechar Limpador", self.quit_from_tray_menu),
+            )
+            print(
+                "--- DEBUG: setup_and_run_tray_icon - menu_items criados com sucesso ---"
+            )
+
+            self.tray_icon = pystray.Icon(
+                "LimpadorUnreal",
+                icon=self.icon_image,
+                title="Limpador de Cache Unreal",
+                menu=menu_items,
+            )
+            print(
+                "--- DEBUG: setup_and_run_tray_icon - pystray.Icon criado com sucesso ---"
+            )
+
+            self.tray_thread = threading.Thread(target=self.tray_icon.run, daemon=True)
+            self.tray_thread.start()
+            print("--- DEBUG: setup_and_run_tray_icon - Thread da bandeja iniciada ---")
+
+            if self.icon_image:
+                print(
+                    "UI: Ícone da bandeja configurado e thread iniciada (com imagem)."
+                )
+            else:
+                print(
+                    "UI: Configuração da bandeja concluída (sem imagem ou com erro no carregamento da imagem)."
+                )
+
+        except Exception as e_tray_setup:
+            print(
+                f"--- DEBUG: ERRO CRÍTICO em setup_and_run_tray_icon durante a configuração do pystray: {e_tray_setup} ---"
+            )
+            import traceback
+
+            traceback.print_exc()
+            self.tray_icon = None
+
+    def get_tray_monitoring_status_text(
+        self, item=None
+    ):  # <--- ADICIONE item=None AQUI
+        # Use print direto para depuração aqui, pois self.log_message pode ser o problema
+        print("--- DEBUG: get_tray_monitoring_status_text FOI CHAMADA ---")
+        # O argumento 'item' é o objeto pystray.MenuItem, você pode ignorá-lo se não precisar dele.
+        try:
+            is_alive_now = self.monitoring_thread and self.monitoring_thread.is_alive()
+            status_text = f"Status: {'Ativo' if is_alive_now else 'Parado'}"
+            print(
+                f"--- DEBUG: get_tray_monitoring_status_text retornando: '{status_text}' ---"
+            )
+            return status_text
+        except Exception as e:
+            print(f"--- DEBUG: ERRO dentro de get_tray_monitoring_status_text: {e} ---")
+            import traceback
+
+            traceback.print_exc()
+            return "Status: Erro"
+
+    def create_monitoring_submenu(self):
+        print("--- DEBUG: create_monitoring_submenu FOI CHAMADA ---")
+        pystray, _ = _import_tray_modules()
+        try:
+            menu = pystray.Menu(
+                pystray.MenuItem(
+                    "Alternar Monitoramento", self.toggle_monitoring_from_tray
+                ),
+                pystray.MenuItem(
+                    self.get_tray_monitoring_status_text,  # Chama o método
+                    action=None,
+                    enabled=False,
+                ),
+            )
+            print("--- DEBUG: create_monitoring_submenu - Menu criado com sucesso ---")
+            return menu
+        except Exception as e:
+            print(f"--- DEBUG: ERRO CRÍTICO em create_monitoring_submenu: {e} ---")
+            import traceback
+
+            traceback.print_exc()
+            # Retorna um menu mínimo em caso de erro para tentar manter o ícone principal funcionando
+            return pystray.Menu(pystray.MenuItem("Erro no submenu", None))
+
+    def toggle_monitoring_from_tray(self):
+        if self.monitoring_thread and self.monitoring_thread.is_alive():
+            print("Tray: Comandado Parar Monitoramento")
+            # Agendando para a thread principal da UI para segurança
+            self.after(0, self.stop_auto_monitoring)
+        else:
+            print("Tray: Comandado Iniciar Monitoramento")
+            # Agendando para a thread principal da UI para segurança
+            self.after(0, self.start_auto_monitoring)
+        # Atualizar o menu da bandeja para refletir o novo estado é mais complexo com pystray
+        # sem recriar o ícone ou usar truques. O submenu lambda acima ajuda um pouco.
+
+    def hide_to_tray(self):
+        """Esconde a janela principal e mostra o ícone na bandeja (se não já estiver)."""
+        print("UI: Minimizando para a bandeja...")
+        self.withdraw()  # Esconde a janela principal
+        self.is_window_visible = False
+        # O ícone da bandeja já deve estar rodando pela chamada em __init__
+
+    def show_from_tray(self):
+        """Mostra a janela principal a partir da bandeja."""
+        print("UI: Restaurando da bandeja...")
+        self.deiconify()  # Reexibe a janela
+        self.lift()  # Traz para frente
+        self.focus_force()  # Tenta focar
+        self.is_window_visible = True
+
+    def quit_application(self):  # Esta função é chamada pelo menu da bandeja "Fechar"
+        print("--- DEBUG: quit_application() INICIADA ---")
+
+        print("--- DEBUG: quit_application() - Chamando on_closing_logic()... ---")
+        self.on_closing_logic()
+        print("--- DEBUG: quit_application() - on_closing_logic() CONCLUÍDA. ---")
+
+        if self.tray_icon:
+            print(
+                "--- DEBUG: quit_application() - Parando ícone da bandeja (chamando self.tray_icon.stop())... ---"
+            )
+            self.tray_icon.stop()  # Apenas sinaliza para a thread do pystray parar.
+            # NENHUM self.tray_thread.join() AQUI!
+            print(
+                "--- DEBUG: quit_application() - self.tray_icon.stop() chamado. A thread da bandeja deve terminar por conta própria. ---"
+            )
+        else:
+            print("--- DEBUG: quit_application() - Nenhum tray_icon para parar. ---")
+
+        print(
+            "--- DEBUG: quit_application() - Verificando estado da janela principal antes de destruir... ---"
+        )
+        try:
+            if hasattr(self, "winfo_exists") and self.winfo_exists():
+                print(
+                    "--- DEBUG: quit_application() - Janela principal existe. Chamando super().destroy()... ---"
+                )
+                super().destroy()
+                print(
+                    "--- DEBUG: quit_application() - super().destroy() FOI CHAMADO. ---"
+                )
+            else:
+                print(
+                    "--- DEBUG: quit_application() - Janela principal já não existe ou é inválida antes de super().destroy(). ---"
+                )
+        except Exception as e_destroy:
+            print(
+                f"--- DEBUG: quit_application() - ERRO durante super().destroy(): {e_destroy} ---"
+            )
+            import traceback
+
+            traceback.print_exc()
+
+        print(
+            "--- DEBUG: quit_application() - Aplicação deve ser encerrada. Forçando saída com sys.exit(0)... ---"
+        )
+        sys.exit(0)
+
+    # Modifique sua função on_closing:
+    def on_closing(
+        self,
+    ):  # Renomeada de quit_application para o fluxo original de fechamento lógico
+        print("--- DEBUG: Lógica de on_closing() sendo executada ---")
+        print("UI: Fechando aplicação (lógica interna)...")
+        self.save_app_data(immediate=True)
+        self.stop_auto_monitoring()  # Tenta parar a thread de monitoramento
+
+        # Espera pela thread de monitoramento (se estiver rodando)
+        if self.monitoring_thread and self.monitoring_thread.is_alive():
+            print("UI: Aguardando thread de monitoramento finalizar antes de fechar...")
+            # O timeout aqui pode ser ajustado
+            self.monitoring_thread.join(
+                timeout=max(2, self.AUTO_MONITOR_INTERVAL_SECONDS // 1000 + 1)
+            )
+
+        # A destruição da janela e parada do ícone da bandeja são feitas por quit_application
+        # que por sua vez chama self.destroy() e sys.exit()
+        # Aqui, apenas preparamos para o fechamento.
+
+        # Se quit_application foi chamada pelo menu da bandeja, ela fará o self.destroy()
+        # Se hide_to_tray foi chamada, esta função on_closing não deveria ser chamada diretamente pelo "X"
+        # O botão "X" agora chama hide_to_tray.
+        # Esta on_closing() é mais para a lógica de 'preparar para fechar'
+        print("--- DEBUG: Lógica de on_closing() concluída ---")
+
+    # Adicione este método para ser chamado pela opção "Fechar" da bandeja
+    def quit_from_tray_menu(self):
+        print("Tray: Comandado Fechar Limpador.")
+        self.quit_application()  # Chama a função que realmente fecha tudo
+
+    # Modifique sua chamada principal no final do arquivo:
+    # if __name__ == "__main__":
+    #    app = App()
+    #    # app.protocol("WM_DELETE_WINDOW", app.on_closing) # MUDAMOS ISSO PARA hide_to_tray no __init__
+    #    # A lógica de on_closing agora é parte de quit_application
+    #    app.mainloop()
+    # A quit_application fará self.destroy() e sys.exit()
+    # A on_closing original agora é chamada por quit_application para salvar e parar threads.
+
+    # Ajuste o método quit_application para ser o ponto final de saída
+
+    def on_closing_logic(
+        self,
+    ):  # Lógica que estava em on_closing antes, para salvar e parar monitoramento
+        print(
+            "--- DEBUG: on_closing_logic() INICIADA (salvar e parar monitoramento) ---"
+        )
+        self.save_app_data(immediate=True)  # Grava na hora, sem esperar o agendamento
+        self.size_index.save()
+        self.ddc_eviction_index.save()
+        # Purgas em andamento continuam no diário e são retomadas na próxima inicialização
+        self.purger.stop(timeout=2)
+
+        print("--- DEBUG: on_closing_logic() - Chamando stop_auto_monitoring()... ---")
+        self.stop_auto_monitoring()  # Esta função já deve ter seus próprios prints de depuração
+
+        if self.monitoring_thread and self.monitoring_thread.is_alive():
+            print(
+                "--- DEBUG: on_closing_logic() - Aguardando thread de monitoramento finalizar... ---"
+            )
+            # Usar um timeout fixo para o join durante o teste pode ser mais simples de analisar
+            timeout_join_monitor = 5  # segundos
+            print(
+                f"--- DEBUG: on_closing_logic() - Usando timeout de {timeout_join_monitor}s para join do monitoring_thread ---"
+            )
+            self.monitoring_thread.join(timeout=timeout_join_monitor)
+            if self.monitoring_thread.is_alive():
+                print(
+                    "--- DEBUG: on_closing_logic() - AVISO: Thread de monitoramento AINDA ESTÁ ATIVA após join. ---"
+                )
+            else:
+                print(
+                    "--- DEBUG: on_closing_logic() - Thread de monitoramento finalizada. ---"
+                )
+        else:
+            print(
+                "--- DEBUG: on_closing_logic() - Thread de monitoramento não estava ativa ou não existe. ---"
+            )
+        self._stop_cleaning_pipeline()
+        # Por último: o monitoramento e a limpeza global não gravam mais no histórico
+        self.history_store.close()
+        # O ciclo de _drain_log_queue para com a janela: o que sobrou na fila vai para o console
+        self._write_console_log(self._take_log_entries())
+        print("--- DEBUG: on_closing_logic() CONCLUÍDA. ---")
+
+    def _stop_cleaning_pipeline(self, timeout=5):
+        """Cancela a limpeza global em andamento (se houver) e espera o item atual terminar."""
+        pipeline = self.cleaning_pipeline
+        if pipeline is not None and pipeline.is_running():
+            print("UI: Cancelando a limpeza global antes de fechar...")
+            pipeline.cancel()
+            pipeline.join(timeout)
+
+    def analyze_all_projects_action(self):
+        self.log_message(
+            "Botão 'Analisar Todos os Projetos' clicado.", level="ACTION"
+        )  # <--- LOG ADICIONADO
+
+        self.global_status_label.configure(
+            text="Status Global: Analisando todos os projetos..."
+        )
+        self.log_message(
+            "Status Global alterado para: Analisando todos os projetos...",
+            level="DEBUG",
+        )  # <--- LOG ADICIONADO
+
+        if not self.project_widgets:
+            self.log_message(
+                "Nenhum projeto na lista para analisar.", level="WARNING"
+            )  # <--- LOG ADICIONADO
+            self.global_status_label.configure(
+                text="Status Global: Nenhum projeto na lista para analisar."
+            )
+            return
+
+        self.log_message(
+            f"Iniciando análise para {len(self.project_widgets)} projeto(s).",
+            level="INFO",
+        )  # <--- LOG ADICIONADO
+        if self.io_scheduler.is_idle():
+            # Nova rodada: o contador de concluídas do status global recomeça do zero
+            self.io_scheduler.reset_done_count()
+        for project in self.project_registry.snapshots():
+            cache_label = self.project_widgets[project.key]["cache_info_label"]
+
+            self.log_message(
+                f"Disparando verificação de cache para o projeto: {project.name}",
+                level="DEBUG",
+            )  # <--- LOG ADICIONADO
+            # Reutiliza a lógica de verificação de cache individual (enfileira no IOScheduler;
+            # projetos que já estão em análise não são enfileirados de novo)
+            self.start_verify_cache_thread(
+                {"path": project.path}, cache_label
+            )  # Esta função já deve ter seus próprios logs internos se necessário
+
+        queued, running, _ = self.io_scheduler.counts()
+        self.log_message(
+            f"Análise enfileirada: {queued} na fila, {running} em andamento (limite: {self.io_scheduler.max_concurrent_scans} simultânea(s)).",
+            level="DEBUG",
+        )  # O status global passa a ser atualizado por _poll_scan_results
+
+    def clean_allowed_projects_action(self):
+        """
+        Captura (na thread do Tk) os projetos elegíveis e seus itens selecionados e entrega a
+        limpeza a um CleaningPipeline em segundo plano. O progresso volta pela fila do pipeline
+        e é aplicado por _poll_cleaning_progress.
+        """
+        self.log_message("Botão 'Limpar Projetos Permitidos' clicado.", level="ACTION")
+        if self.cleaning_pipeline is not None and self.cleaning_pipeline.is_running():
+            self.log_message(
+                "Limpeza Global: Já existe uma limpeza em andamento.", level="WARNING"
+            )
+            return
+
+        if not self.project_widgets:
+            self.log_message("Nenhum projeto na lista para limpar.", level="INFO")
+            if (
+                hasattr(self, "global_status_label")
+                and self.global_status_label.winfo_exists()
+            ):
+                self.global_status_label.configure(
+                    text="Status Global: Nenhum projeto na lista para limpar."
+                )
+            return
+
+        cleaning_jobs = []
+        for project in self.project_registry.snapshots():
+            cache_label = self.project_widgets[project.key]["cache_info_label"]
+
+            if not project.allow_clean:
+                self.log_message(
+                    f"Limpeza Global: Limpeza não permitida para '{project.name}'.",
+                    level="DEBUG",
+                )
+                continue
+
+            if not project.selected_items:
+                self.log_message(
+                    f"Limpeza Global: Nenhum item específico selecionado para limpeza em '{project.name}'. Limpeza não realizada para este projeto.",
+                    level="INFO",
+                )
+                self._update_cache_info_label(
+                    cache_label, "Cache: (Global: Nada selecionado)"
+                )
+                continue
+
+            self.log_message(
+                f"Limpeza Global: Itens selecionados para '{project.name}': {list(project.selected_items)}",
+                level="DEBUG",
+            )
+            project_data = project.to_project_data()
+            cleaning_jobs.append(
+                {
+                    "key": project.key,
+                    "path": project.path,
+                    "name": project.name,
+                    "selected_items": list(project.selected_items),
+                    "uproject_path": get_project_uproject_path(project_data),
+                    "ddc_eviction_budget_bytes": get_project_ddc_eviction_budget(
+                        project_data, self
+                    ),
+                    "retention_rules": get_project_retention_rules(project_data, self),
+                }
+            )
+            self._update_cache_info_label(cache_label, "Cache: (Global: Na fila...)")
+
+        if not cleaning_jobs:
+            final_status_msg = "Status Global: Nenhum projeto elegível para limpeza (verifique 'Permitir Limpeza' e os itens selecionados)."
+            self.global_status_label.configure(text=final_status_msg)
+            self.log_message(final_status_msg, level="INFO")
+            return
+
+        self.cleaning_pipeline = CleaningPipeline(
+            cleaning_jobs,
+            self,
+            max_cleans_per_volume=self.max_cleans_per_volume,
+            size_index=self.size_index,
+            editor_index=self.open_editor_index,
+            deletion_mode=self.deletion_mode,
+            purger=self.purger,
+            ddc_eviction_index=self.ddc_eviction_index,
+            io_scheduler=self.io_scheduler,
+        )
+        self.cleaning_pipeline.start()
+        self.clean_allowed_button.configure(state="disabled")
+        self.cancel_cleaning_button.configure(state="normal")
+        self.global_status_label.configure(
+            text=f"Status Global: Limpando {len(cleaning_jobs)} projeto(s)..."
+        )
+        self.log_message(
+            f"Limpeza Global: {len(cleaning_jobs)} projeto(s) enviados para limpeza em segundo plano.",
+            level="INFO",
+        )
+        self.after(CLEANING_PROGRESS_POLL_INTERVAL_MS, self._poll_cleaning_progress)
+
+    def cancel_cleaning_action(self):
+        """Pede o cancelamento da limpeza global em andamento."""
+        if self.cleaning_pipeline is not None and self.cleaning_pipeline.is_running():
+            self.log_message(
+                "Limpeza Global: Cancelamento solicitado pelo usuário.", level="ACTION"
+            )
+            self.cleaning_pipeline.cancel()
+            self.cancel_cleaning_button.configure(state="disabled")
+            self.global_status_label.configure(
+                text="Status Global: Cancelando limpeza (aguardando item em andamento)..."
+            )
+
+    def _poll_cleaning_progress(self):
+        """Aplica na thread do Tk os eventos de progresso publicados pelo CleaningPipeline."""
+        pipeline = self.cleaning_pipeline
+        if pipeline is None:
+            return
+
+        stage_labels = {
+            "eligibility": "Cache: (Global: Verificando se está aberto...)",
+            "delete": "Cache: (Global: Limpando itens selecionados...)",
+            "measure": "Cache: (Global: Medindo após limpeza...)",
+        }
+        finished_summary = None
+        while True:
+            try:
+                event, job_key, payload = pipeline.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            widget_info_item = self.project_widgets.get(job_key)
+            cache_label = (
+                widget_info_item.get("cache_info_label") if widget_info_item else None
+            )
+            label_exists = (
+                cache_label is not None
+                and hasattr(cache_label, "winfo_exists")
+                and cache_label.winfo_exists()
+            )
+
+            if event == "stage" and label_exists:
+                self._update_cache_info_label(cache_label, stage_labels[payload])
+            elif event == "item_done":
+                self.global_status_label.configure(
+                    text=f"Status Global: Limpando... Liberado: {format_size(payload['bytes_freed_total'])} | {payload['items_remaining']} item(ns) restante(s)."
+                )
+            elif event == "project_done":
+                self._apply_cleaning_result(job_key, payload)
+            elif event == "finished":
+                finished_summary = payload
+
+        if finished_summary is None:
+            self.after(CLEANING_PROGRESS_POLL_INTERVAL_MS, self._poll_cleaning_progress)
+            return
+
+        # Resumo final da operação global
+        summary = finished_summary
+        if summary["cancelled"]:
+            final_status_msg = "Status Global: Limpeza global cancelada."
+        else:
+            final_status_msg = "Status Global: Limpeza global concluída."
+        eligible_count = summary["projects_total"] - summary["projects_skipped_open"]
+        if eligible_count > 0:
+            final_status_msg += f" {summary['projects_cleaned']} de {eligible_count} projeto(s) processado(s) tiveram itens limpos."
+            if summary["bytes_freed"] > 0:
+                final_status_msg += (
+                    f" Total liberado: {format_size(summary['bytes_freed'])}."
+                )
+        else:
+            final_status_msg = "Status Global: Nenhum projeto elegível para limpeza (verifique 'Permitir Limpeza' e se estão fechados)."
+        if summary["projects_skipped_open"]:
+            final_status_msg += (
+                f" {summary['projects_skipped_open']} pulado(s) por estarem abertos."
+            )
+        if summary["projects_with_errors"]:
+            final_status_msg += (
+                f" {summary['projects_with_errors']} com erro(s) (veja a aba Logs)."
+            )
+
+        self.global_status_label.configure(text=final_status_msg)
+        self.log_message(
+            f"{final_status_msg} Duração: {summary['elapsed_seconds']:.1f}s.",
+            level="INFO",
+        )
+        self.clean_allowed_button.configure(state="normal")
+        self.cancel_cleaning_button.configure(state="disabled")
+        self.cleaning_pipeline = None
+        self.size_index.save()
+        self.ddc_eviction_index.save()
+        self.history_store.flush()
+
+    def _apply_cleaning_result(self, job_key, result):
+        """Atualiza a UI de um projeto com o resultado do CleaningPipeline (thread do Tk)."""
+        widget_info_item = self.project_widgets.get(job_key)
+        record = self.project_registry.get(job_key)
+        if widget_info_item is None or record is None:
+            return  # Projeto removido da lista durante a limpeza
+        project_name = record.name
+        cache_label = widget_info_item.get("cache_info_label")
+        label_exists = (
+            cache_label is not None
+            and hasattr(cache_label, "winfo_exists")
+            and cache_label.winfo_exists()
+        )
+
+        if result["status"] == "open":
+            if label_exists:
+                self._update_cache_info_label(
+                    cache_label, "Cache: (Global: Pulado - Projeto Aberto)"
+                )
+            return
+        if result["duration_seconds"] is not None:
+            self.history_store.record_cleanup(
+                record.path,
+                result["items"],
+                result["bytes_freed"],
+                len(result["errors"]),
+                result["duration_seconds"],
+                trigger="manual",
+            )
+
+        # ATUALIZA A UI DOS ITENS DE LIMPEZA PARA ESTE PROJETO
+        if result["deleted_subfolders"]:
+            self.refresh_project_cleanup_items_ui(
+                record.path, result["deleted_subfolders"]
+            )
+
+        msg_details = []
+        if result["deleted_subfolders"] or (
+            result["bytes_freed"] > 0 and not result["errors"]
+        ):
+            msg_details.append(f"Liberado: {format_size(result['bytes_freed'])}.")
+        if result["deleted_subfolders"] and self.deletion_mode == DELETION_MODE_STAGED:
+            msg_details.append("Purga em segundo plano.")
+        if result["errors"]:
+            msg_details.append(f"{len(result['errors'])} erro(s).")
+        if result["status"] == "cancelled":
+            msg_details.append("(cancelado)")
+
+        final_project_msg = (
+            "Global Limpeza: " + " ".join(msg_details)
+            if msg_details
+            else "Global Limpeza: Nenhum item aplicável encontrado ou já limpo."
+        )
+        self.log_message(
+            f"Limpeza Global: Resultado para '{project_name}': {final_project_msg}",
+            level="INFO",
+        )
+        remaining_size = result["remaining_size"]
+        if remaining_size is not None:
+            self.project_registry.update(
+                record.path, last_selected_bytes=remaining_size
+            )
+        if label_exists:
+            if remaining_size is None:
+                self._update_cache_info_label(cache_label, final_project_msg)
+            else:
+                self._update_cache_info_label(
+                    cache_label,
+                    f"Cache (Pós-Limpeza Global): {format_size(remaining_size)}",
+                )
+
+    def load_app_data(self):
+        self.log_message("UI: Carregando dados do aplicativo...", level="INFO")
+
+        # Valores padrão que serão usados se o arquivo de configuração não existir ou estiver incompleto
+        default_interval_seconds = 3600  # Padrão de 1 hora
+        MIN_INTERVAL_MINUTES_DISPLAY = (
+            1  # Mínimo de 1 minuto para exibição e configuração na UI
+        )
+        MIN_INTERVAL_SECONDS_INTERNAL = (
+            MIN_INTERVAL_MINUTES_DISPLAY * 60
+        )  # Mínimo em segundos para lógica interna
+
+        loaded_interval_seconds_from_json = (
+            default_interval_seconds  # Valor que será usado internamente (em segundos)
+        )
+        auto_start_monitor_pref = (
+            False  # Padrão para "Ativar monitoramento automático ao iniciar"
+        )
+        monitoring_mode_pref = MONITORING_MODE_INTERVAL
+        # auto_start_windows_pref não é carregado do JSON; é verificado diretamente no registro por _check_startup_status()
+
+        # Limpa o estado visual e de controle ANTES de carregar do JSON,
+        # para evitar duplicatas ou estados inconsistentes.
+        self._clear_project_list_ui()
+
+        try:
+            if os.path.exists(
+                ABSOLUTE_CONFIG_PATH
+            ):  # ABSOLUTE_CONFIG_PATH é o caminho completo para o JSON
+                data = load_config_data(ABSOLUTE_CONFIG_PATH, self)
+                self.log_message(
+                    f"Arquivo de configuração '{ABSOLUTE_CONFIG_PATH}' carregado.",
+                    level="DEBUG",
+                )
+
+                settings = data.get(
+                    "settings", {}
+                )  # Pega a seção de configurações; {} se não existir
+
+                # Carrega preferência de "Ativar monitoramento automático ao iniciar"
+                auto_start_monitor_pref = settings.get(
+                    "auto_start_monitoring_on_launch", False
+                )
+
+                # Modo do monitoramento: por intervalo (varredura periódica) ou por eventos
+                monitoring_mode_pref = settings.get(
+                    "monitoring_mode", MONITORING_MODE_INTERVAL
+                )
+                if monitoring_mode_pref not in (
+                    MONITORING_MODE_INTERVAL,
+                    MONITORING_MODE_WATCH,
+                ):
+                    self.log_message(
+                        f"Valor inválido para 'monitoring_mode': '{monitoring_mode_pref}'. Usando padrão: {MONITORING_MODE_INTERVAL}.",
+                        level="WARNING",
+                    )
+                    monitoring_mode_pref = MONITORING_MODE_INTERVAL
+
+                # Carrega o intervalo de monitoramento (armazenado em segundos no JSON)
+                loaded_interval_str = settings.get(
+                    "monitoring_interval_seconds", str(default_interval_seconds)
+                )
+                try:
+                    parsed_seconds = int(loaded_interval_str)
+                    if (
+                        parsed_seconds >= MIN_INTERVAL_SECONDS_INTERNAL
+                    ):  # Usa o mínimo em segundos para validação
+                        loaded_interval_seconds_from_json = parsed_seconds
+                    elif (
+                        parsed_seconds > 0
+                    ):  # Se for positivo mas menor que o mínimo permitido
+                        self.log_message(
+                            f"Intervalo carregado ({parsed_seconds}s) é menor que o mínimo de {MIN_INTERVAL_MINUTES_DISPLAY} min. Ajustando para o mínimo.",
+                            level="WARNING",
+                        )
+                        loaded_interval_seconds_from_json = (
+                            MIN_INTERVAL_SECONDS_INTERNAL
+                        )
+                    else:  # Se for 0 ou negativo
+                        self.log_message(
+                            f"Intervalo (segundos) inválido carregado do JSON (<=0): '{loaded_interval_str}'. Usando padrão: {default_interval_seconds}s.",
+                            level="WARNING",
+                        )
+                        loaded_interval_seconds_from_json = default_interval_seconds
+                except ValueError:
+                    self.log_message(
+                        f"Valor do intervalo (segundos) não numérico carregado do JSON: '{loaded_interval_str}'. Usando padrão: {default_interval_seconds}s.",
+                        level="WARNING",
+                    )
+                    loaded_interval_seconds_from_json = default_interval_seconds
+
+                # Limite de análises simultâneas do IOScheduler
+                try:
+                    self.io_scheduler.set_max_concurrent_scans(
+                        int(
+                            settings.get(
+                                "max_concurrent_scans", DEFAULT_MAX_CONCURRENT_SCANS
+                            )
+                        )
+                    )
+                except (TypeError, ValueError):
+                    self.log_message(
+                        f"Valor inválido para 'max_concurrent_scans': '{settings.get('max_concurrent_scans')}'. Usando padrão: {DEFAULT_MAX_CONCURRENT_SCANS}.",
+                        level="WARNING",
+                    )
+                    self.io_scheduler.set_max_concurrent_scans(
+                        DEFAULT_MAX_CONCURRENT_SCANS
+                    )
+
+                # Limite de limpezas simultâneas por volume do CleaningPipeline
+                try:
+                    self.max_cleans_per_volume = max(
+                        1,
+                        int(
+                            settings.get(
+                                "max_cleans_per_volume", DEFAULT_MAX_CLEANS_PER_VOLUME
+                            )
+                        ),
+                    )
+                except (TypeError, ValueError):
+                    self.log_message(
+                        f"Valor inválido para 'max_cleans_per_volume': '{settings.get('max_cleans_per_volume')}'. Usando padrão: {DEFAULT_MAX_CLEANS_PER_VOLUME}.",
+                        level="WARNING",
+                    )
+                    self.max_cleans_per_volume = DEFAULT_MAX_CLEANS_PER_VOLUME
+
+                # Tarefas simultâneas por disco (HDD / SSD) do IOScheduler
+                device_limits = {}
+                for setting_name, default_value in (
+                    ("max_io_per_rotational_device", DEFAULT_MAX_IO_PER_ROTATIONAL_DEVICE),
+                    (
+                        "max_io_per_solid_state_device",
+                        DEFAULT_MAX_IO_PER_SOLID_STATE_DEVICE,
+                    ),
+                ):
+                    try:
+                        device_limits[setting_name] = max(
+                            1, int(settings.get(setting_name, default_value))
+                        )
+                    except (TypeError, ValueError):
+                        self.log_message(
+                            f"Valor inválido para '{setting_name}': '{settings.get(setting_name)}'. Usando padrão: {default_value}.",
+                            level="WARNING",
+                        )
+                        device_limits[setting_name] = default_value
+                self.io_scheduler.set_device_limits(
+                    max_deletes_per_device=self.max_cleans_per_volume, **device_limits
+                )
+
+                # Modo de deleção: "direct" (apaga na hora) ou "staged" (move e apaga em segundo plano)
+                deletion_mode_pref = settings.get("deletion_mode", DEFAULT_DELETION_MODE)
+                if deletion_mode_pref in DELETION_MODES:
+                    self.deletion_mode = deletion_mode_pref
+                else:
+                    self.log_message(
+                        f"Valor inválido para 'deletion_mode': '{deletion_mode_pref}'. Usando padrão: {DEFAULT_DELETION_MODE}.",
+                        level="WARNING",
+                    )
+                    self.deletion_mode = DEFAULT_DELETION_MODE
+
+                # Prioridade do monitoramento automático (as ações do usuário rodam em prioridade normal)
+                background_priority_pref = settings.get(
+                    "background_priority", DEFAULT_BACKGROUND_PRIORITY
+                )
+                if isinstance(background_priority_pref, bool):
+                    self.background_priority = background_priority_pref
+                else:
+                    self.log_message(
+                        f"Valor inválido para 'background_priority': '{background_priority_pref}'. Usando padrão: {DEFAULT_BACKGROUND_PRIORITY}.",
+                        level="WARNING",
+                    )
+                    self.background_priority = DEFAULT_BACKGROUND_PRIORITY
+                try:
+                    self.background_max_file_ops_per_second = max(
+                        0,
+                        int(
+                            settings.get(
+                                "background_max_file_ops_per_second",
+                                DEFAULT_BACKGROUND_MAX_FILE_OPS_PER_SECOND,
+                            )
+                        ),
+                    )
+                except (TypeError, ValueError):
+                    self.log_message(
+                        f"Valor inválido para 'background_max_file_ops_per_second': '{settings.get('background_max_file_ops_per_second')}'. Usando padrão: {DEFAULT_BACKGROUND_MAX_FILE_OPS_PER_SECOND}.",
+                        level="WARNING",
+                    )
+                    self.background_max_file_ops_per_second = (
+                        DEFAULT_BACKGROUND_MAX_FILE_OPS_PER_SECOND
+                    )
+                configure_file_operation_rate_limit(
+                    self.background_max_file_ops_per_second
+                )
+
+                # Pastas onde a descoberta procura projetos
+                self.project_search_roots, self.project_search_max_depth = (
+                    get_project_search_settings(settings, self)
+                )
+
+                # Limpeza disparada quando o espaço livre de um volume com projetos fica baixo
+                self.disk_pressure_settings = {
+                    key: settings.get(key, "")
+                    for key in self.disk_pressure_settings
+                }
+                self.disk_pressure_watermarks = get_disk_pressure_watermarks(
+                    self.disk_pressure_settings, self
+                )
+
+                # Ordem em que a limpeza automática remove os itens até atingir o "Alvo GB"
+                priority_order_pref = settings.get(
+                    "cleanup_priority_order", DEFAULT_CLEANUP_PRIORITY_ORDER
+                )
+                if isinstance(priority_order_pref, list) and all(
+                    isinstance(item_id, str) for item_id in priority_order_pref
+                ):
+                    self.cleanup_priority_order = [
+                        os.path.normpath(item_id) for item_id in priority_order_pref
+                    ]
+                else:
+                    self.log_message(
+                        f"Valor inválido para 'cleanup_priority_order': '{priority_order_pref}'. Usando padrão.",
+                        level="WARNING",
+                    )
+                    self.cleanup_priority_order = list(DEFAULT_CLEANUP_PRIORITY_ORDER)
+
+                # Nível mínimo e limite de linhas da aba "Logs"
+                try:
+                    self.set_log_level(settings.get("log_level", DEFAULT_LOG_LEVEL))
+                except ValueError:
+                    self.set_log_level(DEFAULT_LOG_LEVEL)
+                    self.log_message(
+                        f"Valor inválido para 'log_level': '{settings.get('log_level')}'. Usando padrão: {DEFAULT_LOG_LEVEL}.",
+                        level="WARNING",
+                    )
+                try:
+                    self.log_max_lines = max(
+                        100, int(settings.get("log_max_lines", DEFAULT_LOG_MAX_LINES))
+                    )
+                except (TypeError, ValueError):
+                    self.log_message(
+                        f"Valor inválido para 'log_max_lines': '{settings.get('log_max_lines')}'. Usando padrão: {DEFAULT_LOG_MAX_LINES}.",
+                        level="WARNING",
+                    )
+                    self.log_max_lines = DEFAULT_LOG_MAX_LINES
+
+                # Carrega a lista de projetos salvos
+                saved_projects = data.get("projects", [])
+                self.log_message(
+                    f"Encontrados {len(saved_projects)} projetos no arquivo JSON para carregar.",
+                    level="DEBUG",
+                )
+
+                for i, project_data_from_json in enumerate(saved_projects):
+                    project_name_json = project_data_from_json.get(
+                        "name", f"ProjetoJSON_{i}"
+                    )
+                    project_path_from_json = project_data_from_json.get("path")
+
+                    self.log_message(
+                        f"LOAD: Processando projeto salvo {i+1}/{len(saved_projects)}: '{project_name_json}' com path '{project_path_from_json}'",
+                        level="DEBUG",
+                    )
+
+                    if not project_path_from_json:
+                        self.log_message(
+                            f"LOAD: Projeto salvo '{project_name_json}' não tem caminho. Pulando.",
+                            level="WARNING",
+                        )
+                        continue
+
+                    normalized_path_from_json = os.path.normpath(project_path_from_json)
+                    self.log_message(
+                        f"LOAD: Path normalizado do JSON para '{project_name_json}': {normalized_path_from_json}",
+                        level="TRACE",
+                    )
+
+                    project_data_to_add = project_data_from_json.copy()
+                    project_data_to_add["path"] = normalized_path_from_json
+
+                    # Adiciona ao registro e à UI. O registro foi limpo acima, então só
+                    # caminhos repetidos no próprio JSON são ignorados.
+                    self.add_project_entry_to_ui(
+                        project_data_to_add, from_saved_data=True
+                    )
+                    self.log_message(
+                        f"LOAD: Projeto '{project_name_json}' adicionado ao registro e à UI.",
+                        level="TRACE",
+                    )
+
+                self.log_message(
+                    f"{len(self.project_widgets)} projetos na UI após carregar do JSON.",
+                    level="DEBUG",
+                )
+            else:
+                self.log_message(
+                    f"Arquivo de configuração não encontrado em '{ABSOLUTE_CONFIG_PATH}'. Nenhum projeto carregado. Usando padrões para configurações.",
+                    level="INFO",
+                )
+                # auto_start_monitor_pref e loaded_interval_seconds_from_json já têm seus defaults definidos no início da função.
+
+        except Exception as e:
+            self.log_message(
+                f"Erro CRÍTICO ao carregar dados de '{ABSOLUTE_CONFIG_PATH}': {e}",
+                level="ERROR",
+            )
+            import traceback
+
+            traceback.print_exc()
+            # Em caso de erro grave ao carregar, reseta para padrões e limpa a lista de projetos
+            self._clear_project_list_ui()
+            auto_start_monitor_pref = False
+            monitoring_mode_pref = MONITORING_MODE_INTERVAL
+            loaded_interval_seconds_from_json = default_interval_seconds
+
+        # --- Configura os Widgets da UI com os Valores Carregados ou Padrões ---
+
+        # Checkbox "Ativar monitoramento automático ao iniciar o programa"
+        if (
+            hasattr(self, "auto_start_monitoring_checkbox")
+            and self.auto_start_monitoring_checkbox.winfo_exists()
+        ):
+            if auto_start_monitor_pref:
+                self.auto_start_monitoring_checkbox.select()
+            else:
+                self.auto_start_monitoring_checkbox.deselect()
+
+        # Checkbox "Monitorar por eventos do sistema de arquivos"
+        self.monitoring_mode = monitoring_mode_pref
+        if (
+            hasattr(self, "watch_mode_monitoring_checkbox")
+            and self.watch_mode_monitoring_checkbox.winfo_exists()
+        ):
+            if monitoring_mode_pref == MONITORING_MODE_WATCH:
+                self.watch_mode_monitoring_checkbox.select()
+            else:
+                self.watch_mode_monitoring_checkbox.deselect()
+
+        # Variável interna para o intervalo (em segundos)
+        self.AUTO_MONITOR_INTERVAL_SECONDS = loaded_interval_seconds_from_json
+
+        # Converte o intervalo (que está em segundos) para minutos para exibir na UI
+        interval_to_display_in_minutes = loaded_interval_seconds_from_json // 60
+        # Se o valor em segundos era > 0 mas < MIN_INTERVAL_SECONDS_INTERNAL, ele já foi ajustado para MIN_INTERVAL_SECONDS_INTERNAL.
+        # Então, interval_to_display_in_minutes refletirá isso.
+
+        # Campo de entrada para o intervalo (exibido em minutos)
+        if hasattr(
+            self, "monitoring_interval_var"
+        ):  # Verifica se a StringVar foi criada
+            self.monitoring_interval_var.set(str(interval_to_display_in_minutes))
+            self.log_message(
+                f"LOAD: monitoring_interval_var (UI, minutos) definido para: '{str(interval_to_display_in_minutes)}'",
+                level="DEBUG",
+            )
+        elif (
+            hasattr(self, "monitoring_interval_entry")
+            and self.monitoring_interval_entry.winfo_exists()
+        ):  # Fallback se StringVar não foi usada
+            self.monitoring_interval_entry.delete(0, "end")
+            self.monitoring_interval_entry.insert(
+                0, str(interval_to_display_in_minutes)
+            )
+            self.log_message(
+                f"LOAD: monitoring_interval_entry (UI, minutos) definido para: '{str(interval_to_display_in_minutes)}' (via fallback).",
+                level="DEBUG",
+            )
+
+        self.log_message(
+            f"Intervalo de monitoramento (interno) definido para: {self.AUTO_MONITOR_INTERVAL_SECONDS} segundos.",
+            level="INFO",
+        )
+
+        # O checkbox "Iniciar com o Windows" é atualizado por self._check_startup_status() no final do __init__
+
+    def save_app_data(self, immediate=False):
+        """
+        Monta a configuração a partir da janela e do registro de projetos (thread do Tk).
+        Por padrão a gravação é agendada pelo ConfigStore, que junta mudanças seguidas;
+        'immediate=True' grava na hora (ao fechar o programa).
+        """
+        self.log_message("--- DEBUG: save_app_data() FOI CHAMADO ---", level="DEBUG")
+
+        current_working_dir = ""
+        try:
+            current_working_dir = os.getcwd()
+            self.log_message(
+                f"--- DEBUG: Salvando em {ABSOLUTE_CONFIG_PATH} (CWD atual: {current_working_dir}) ---",
+                level="DEBUG",
+            )
+        except Exception as e_getcwd:
+            self.log_message(
+                f"--- DEBUG: Erro ao obter diretório de trabalho: {e_getcwd} ---",
+                level="ERROR",
+            )
+
+        self.log_message("UI: Preparando dados para salvar...", level="INFO")
+        data_to_save = {"projects": [], "settings": {}}
+
+        # --- SALVAR CONFIGURAÇÕES GLOBAIS ---
+        # Iniciar com o Windows
+        start_with_windows_val = False
+        if (
+            hasattr(self, "start_with_windows_checkbox")
+            and self.start_with_windows_checkbox.winfo_exists()
+        ):
+            start_with_windows_val = self.start_with_windows_checkbox.get() == 1
+        data_to_save["settings"]["start_with_windows"] = start_with_windows_val
+
+        # Ativar monitoramento automático ao iniciar
+        auto_start_launch_val = False
+        if (
+            hasattr(self, "auto_start_monitoring_checkbox")
+            and self.auto_start_monitoring_checkbox.winfo_exists()
+        ):
+            auto_start_launch_val = self.auto_start_monitoring_checkbox.get() == 1
+        data_to_save["settings"][
+            "auto_start_monitoring_on_launch"
+        ] = auto_start_launch_val
+
+        # Modo do monitoramento
+        if (
+            hasattr(self, "watch_mode_monitoring_checkbox")
+            and self.watch_mode_monitoring_checkbox.winfo_exists()
+        ):
+            self.monitoring_mode = (
+                MONITORING_MODE_WATCH
+                if self.watch_mode_monitoring_checkbox.get() == 1
+                else MONITORING_MODE_INTERVAL
+            )
+        data_to_save["settings"]["monitoring_mode"] = self.monitoring_mode
+
+        # Intervalo de Monitoramento
+        interval_to_save_str = str(self.AUTO_MONITOR_INTERVAL_SECONDS)
+        if (
+            hasattr(self, "monitoring_interval_entry")
+            and self.monitoring_interval_entry.winfo_exists()
+        ):
+            entry_val_str = self.monitoring_interval_entry.get()
+            if entry_val_str:
+                try:
+                    parsed_interval = int(entry_val_str)
+                    if parsed_interval > 0:
+                        interval_to_save_str = str(parsed_interval)
+                        self.AUTO_MONITOR_INTERVAL_SECONDS = parsed_interval
+                    else:
+                        self.log_message(
+                            f"Valor do intervalo no campo inválido (<=0): '{entry_val_str}'. Usando valor em memória: {self.AUTO_MONITOR_INTERVAL_SECONDS}s.",
+                            level="WARNING",
+                        )
+                except ValueError:
+                    self.log_message(
+                        f"Valor do intervalo no campo não numérico: '{entry_val_str}'. Usando valor em memória: {self.AUTO_MONITOR_INTERVAL_SECONDS}s.",
+                        level="WARNING",
+                    )
+            else:
+                self.log_message(
+                    f"Campo de intervalo de monitoramento está vazio. Usando valor em memória: {self.AUTO_MONITOR_INTERVAL_SECONDS}s.",
+                    level="DEBUG",
+                )
+
+        data_to_save["settings"]["monitoring_interval_seconds"] = str(
+            self.AUTO_MONITOR_INTERVAL_SECONDS
+        )
+        data_to_save["settings"][
+            "max_concurrent_scans"
+        ] = self.io_scheduler.max_concurrent_scans
+        data_to_save["settings"]["max_cleans_per_volume"] = self.max_cleans_per_volume
+        data_to_save["settings"][
+            "max_io_per_rotational_device"
+        ] = self.io_scheduler.max_io_per_rotational_device
+        data_to_save["settings"][
+            "max_io_per_solid_state_device"
+        ] = self.io_scheduler.max_io_per_solid_state_device
+        data_to_save["settings"]["deletion_mode"] = self.deletion_mode
+        data_to_save["settings"]["background_priority"] = self.background_priority
+        data_to_save["settings"][
+            "background_max_file_ops_per_second"
+        ] = self.background_max_file_ops_per_second
+        data_to_save["settings"]["project_search_roots"] = self.project_search_roots
+        data_to_save["settings"][
+            "project_search_max_depth"
+        ] = self.project_search_max_depth
+        data_to_save["settings"].update(self.disk_pressure_settings)
+        data_to_save["settings"]["cleanup_priority_order"] = [
+            item_id.replace(os.sep, "/") for item_id in self.cleanup_priority_order
+        ]
+        data_to_save["settings"]["log_level"] = self.log_level
+        data_to_save["settings"]["log_max_lines"] = self.log_max_lines
+        interval_in_minutes_for_log = self.AUTO_MONITOR_INTERVAL_SECONDS // 60
+        self.log_message(
+            f"Salvando intervalo de monitoramento: {self.AUTO_MONITOR_INTERVAL_SECONDS}s ({interval_in_minutes_for_log} min).",
+            level="DEBUG",
+        )
+        self.log_message(
+            f"Configurações a serem salvas: {data_to_save['settings']}", level="DEBUG"
+        )
+        # --- FIM SALVAR CONFIGURAÇÕES GLOBAIS ---
+
+        # --- SALVAR DADOS DOS PROJETOS ---
+        # As entradas de texto não avisam cada mudança; o registro é atualizado antes de salvar
+        for key in self.project_widgets:
+            self._sync_project_record(key)
+        data_to_save["projects"] = [
+            project.to_project_data() for project in self.project_registry.snapshots()
+        ]
+
+        self.log_message(
+            f"Salvando {len(data_to_save['projects'])} projetos.", level="DEBUG"
+        )
+        # --- FIM SALVAR DADOS DOS PROJETOS ---
+
+        try:
+            self.log_message(
+                f"Tentando salvar dados em: {ABSOLUTE_CONFIG_PATH}", level="DEBUG"
+            )
+            if immediate:
+                self.config_store.save(data_to_save)
+            else:
+                self.config_store.request_save(data_to_save)
+        except Exception as e:
+            self.log_message(
+                f"--- ERRO FATAL AO SALVAR DADOS em '{ABSOLUTE_CONFIG_PATH}': {e} ---",
+                level="CRITICAL",
+            )
+            import traceback
+
+            traceback.print_exc()
+
+    def initial_project_discovery_and_load(self):
+        """Escaneia as pastas de busca e adiciona projetos que ainda não foram carregados."""
+        # A UI não deve ser limpa aqui, pois já carregamos os projetos salvos.
+        # A função discover_unreal_projects será chamada por start_discover_projects_thread.
+        # Esta última precisa de um argumento para não limpar a UI.
+        self.global_status_label.configure(
+            text="Status Global: Escaneando pastas de busca..."
+        )
+        self.start_discover_projects_thread(clear_current_list=False)
+
+    def _on_purge_bytes_freed(self, entry, bytes_freed):
+        """
+        Chamado da thread do purgador (modo "staged") conforme o espaço é recuperado: grava
+        os bytes no histórico e agenda a atualização do status na thread do Tk.
+        """
+        self.history_store.record_cleanup(
+            entry["project_path"], [entry["item_id"]], bytes_freed, 0, trigger="purge"
+        )
+        try:
+            self.after(
+                0,
+                self._show_purge_progress,
+                entry["project_path"],
+                bytes_freed,
+                self.purger.bytes_freed_total,
+            )
+        except Exception:
+            pass  # Janela já destruída
+
+    def _show_purge_progress(self, project_path, bytes_freed, bytes_freed_total):
+        """Mostra o espaço liberado pelo purgador no projeto e no status global (thread do Tk)."""
+        key = project_key(project_path)
+        project_bytes = self._purge_bytes_by_project.get(key, 0) + bytes_freed
+        self._purge_bytes_by_project[key] = project_bytes
+        self._set_project_cache_info(
+            project_path,
+            f"Cache: (Purga em segundo plano: {format_size(project_bytes)} liberados)",
+        )
+        # Não sobrescreve o progresso de uma limpeza ou análise em andamento
+        if self.cleaning_pipeline is None and self.io_scheduler.is_idle(IO_KIND_SCAN):
+            self.global_status_label.configure(
+                text=f"Status Global: Purga em segundo plano: {format_size(bytes_freed_total)} liberados ({self.purger.pending_count()} pasta(s) pendente(s))."
+            )
+
+    def _update_cache_info_label(self, cache_info_label_widget, message):
+        """Função auxiliar para atualizar o label de info do cache na thread principal."""
+        cache_info_label_widget.configure(text=message)
+
+    def _post_project_cache_info(self, project_path, message):
+        """Agenda, de qualquer thread, a atualização do label de cache de um projeto."""
+        self.after(0, self._set_project_cache_info, project_path, message)
+
+    def _set_project_cache_info(self, project_path, message):
+        """Atualiza o label de cache de um projeto, se ele ainda estiver na lista (thread do Tk)."""
+        widget_info = self.project_widgets.get(project_key(project_path))
+        if widget_info is not None and widget_info["cache_info_label"].winfo_exists():
+            self._update_cache_info_label(widget_info["cache_info_label"], message)
+
+    # --- Ações para Verificar Tamanho do Cache ---
+    def _thread_target_verify_cache(self, project_path, selected_items_for_calc):
+        """
+        Função que roda em um worker do IOScheduler para calcular o tamanho total do cache
+        potencial E o tamanho do cache dos itens SELECIONADOS.
+        'selected_items_for_calc' é capturado na thread do Tk ao enfileirar (ou None se o
+        projeto não foi encontrado na lista). Retorna a mensagem de status para o label.
+        """
+        self.log_message(
+            f"VERIFY_SIZE_THREAD: Iniciando para projeto '{project_path}'.",
+            level="DEBUG",
+        )
+
+        # Inicializa os tamanhos para o caso de erros ou nenhuma seleção
+        size_selected_bytes = 0
+        size_total_potential_bytes = 0
+
+        # Formato da mensagem de status
+        status_message = "Cache: Erro ao verificar"  # Mensagem padrão em caso de erro
+
+        try:
+            # 1. Uma única varredura do projeto; potencial e selecionado são somas sobre ela
+            scan_started_at = time.perf_counter()
+            breakdown = scan_project_cache_breakdown(
+                project_path, self, self.size_index
+            )
+            scan_duration_seconds = time.perf_counter() - scan_started_at
+            size_total_potential_bytes = calculate_project_total_potential_cache(
+                project_path, self, breakdown=breakdown
+            )  # Passa self como app_instance
+
+            # 2. Calcular o tamanho dos itens selecionados pelo usuário
+            if selected_items_for_calc:
+                self.log_message(
+                    f"VERIFY_SIZE_THREAD: Itens selecionados para cálculo em '{project_path}': {selected_items_for_calc}",
+                    level="TRACE",
+                )
+                size_selected_bytes = calculate_project_cache_size(
+                    project_path, selected_items_for_calc, self, breakdown=breakdown
+                )  # Passa self
+            elif selected_items_for_calc is None:
+                self.log_message(
+                    f"VERIFY_SIZE_THREAD: Calculando tamanho selecionado como 0 para '{project_path}' pois o widget não foi encontrado.",
+                    level="DEBUG",
+                )
+            else:  # Widget encontrado, mas nada selecionado
+                self.log_message(
+                    f"VERIFY_SIZE_THREAD: Nenhum item selecionado para cálculo de cache em '{project_path}'. Tamanho selecionado será 0.",
+                    level="DEBUG",
+                )
+
+            self.project_registry.update(
+                project_path,
+                last_total_bytes=size_total_potential_bytes,
+                last_selected_bytes=size_selected_bytes,
+            )
+            if selected_items_for_calc:
+                item_sizes, item_file_counts = calculate_item_stats_from_breakdown(
+                    breakdown, selected_items_for_calc
+                )
+                self.history_store.record_scan(
+                    project_path, item_sizes, scan_duration_seconds, item_file_counts
+                )
+            # Monta a string de status final
+            status_message = f"Cache Total: {format_size(size_total_potential_bytes)} | Selecionado: {format_size(size_selected_bytes)}"
+
+        except Exception as e:
+            self.log_message(
+                f"Erro CRÍTICO na thread de verificação de cache para '{project_path}': {e}",
+                level="ERROR",
+            )
+            import traceback
+
+            traceback.print_exc()
+            # status_message já é "Cache: Erro ao verificar"
+
+        return status_message
+
+    def start_verify_cache_thread(self, project_info, cache_info_label_widget):
+        """
+        Enfileira a verificação do tamanho do cache do projeto no IOScheduler.
+        Deve ser chamada na thread do Tk. Pedidos para um projeto já em análise são ignorados.
+        """
+        project_path = os.path.normpath(project_info["path"])
+
+        # Captura os itens selecionados aqui, do registro, em vez de ler os widgets no worker
+        project = self.project_registry.snapshot(project_path)
+        selected_items_for_calc = (
+            None if project is None else list(project.selected_items)
+        )
+        if selected_items_for_calc is None:
+            self.log_message(
+                f"VERIFY_SIZE: Não foi possível encontrar widget_info para '{project_path}'. Não é possível obter itens selecionados.",
+                level="WARNING",
+            )
+
+        scan_key = os.path.normcase(project_path)
+        submitted = self.io_scheduler.submit(
+            scan_key,
+            self._thread_target_verify_cache,
+            args=(project_path, selected_items_for_calc),
+            context=cache_info_label_widget,
+            path=project_path,
+        )
+        if submitted is not None:
+            self._update_cache_info_label(cache_info_label_widget, "Cache: Na fila...")
+        else:
+            self.log_message(
+                f"VERIFY_SIZE: '{project_path}' já está na fila ou em análise. Pedido ignorado.",
+                level="DEBUG",
+            )
+        self._schedule_scan_results_poll()
+
+    def _schedule_scan_results_poll(self):
+        """Garante que exista um (e só um) ciclo de _poll_scan_results agendado no Tk."""
+        if not self._scan_results_poll_scheduled:
+            self._scan_results_poll_scheduled = True
+            self.after(SCAN_RESULTS_POLL_INTERVAL_MS, self._poll_scan_results)
+
+    def _poll_scan_results(self):
+        """Aplica em lote, na thread do Tk, os resultados de análise prontos e atualiza o status global."""
+        self._scan_results_poll_scheduled = False
+
+        # Os contadores são lidos antes de esvaziar a fila: se o agendador já estava ocioso aqui,
+        # todos os resultados já foram publicados e serão aplicados neste mesmo lote.
+        queued, running, done = self.io_scheduler.counts()
+        for scan_key, cache_info_label_widget, status_message, error in (
+            self.io_scheduler.drain_results()
+        ):
+            if error is not None:
+                self.log_message(
+                    f"VERIFY_SIZE: Erro inesperado na análise de '{scan_key}': {error}",
+                    level="ERROR",
+                )
+                status_message = "Cache: Erro ao verificar"
+            if (
+                hasattr(cache_info_label_widget, "winfo_exists")
+                and cache_info_label_widget.winfo_exists()
+            ):
+                self._update_cache_info_label(cache_info_label_widget, status_message)
+            else:
+                self.log_message(
+                    "VERIFY_SIZE: cache_info_label_widget não existe mais ao tentar atualizar.",
+                    level="WARNING",
+                )
+
+        if queued or running:
+            status_text = f"Status Global: Analisando... {queued} na fila, {running} em andamento, {done} concluída(s)."
+            self._schedule_scan_results_poll()
+        else:
+            status_text = f"Status Global: Análise concluída ({done} projeto(s))."
+            self.size_index.save()
+            self.history_store.flush()
+        if (
+            hasattr(self, "global_status_label")
+            and self.global_status_label.winfo_exists()
+        ):
+            self.global_status_label.configure(text=status_text)
+
+    # --- Ações para Limpar Cache ---
+    def _thread_target_clean_cache(
+        self, project_path, cache_info_label_widget, allow_clean_checkbox_widget
+    ):
+        """Função que roda na thread para limpar o cache."""
+        # PRIMEIRO: Verificar se o projeto está aberto (LÓGICA PENDENTE AQUI)
+        # if is_unreal_project_open(project_path): # Função a ser criada com psutil
+        #     self.after(0, self._update_cache_info_label, cache_info_label_widget, "ERRO: Projeto está aberto!")
+        #     return
+
+        try:
+            space_freed, cleaned, errors = clean_project_cache(project_path, self)
+            if errors:
+                msg = f"Limpeza Parcial. Liberado: {format_size(space_freed)}. Erros: {'; '.join(errors)}"
+            elif cleaned:
+                msg = f"Limpo! Liberado: {format_size(space_freed)}."
+            else:
+                msg = "Nada para limpar ou pastas não encontradas."
+
+            self.after(0, self._update_cache_info_label, cache_info_label_widget, msg)
+            # Opcional: Re-verificar o tamanho automaticamente após a limpeza
+            if cleaned:
+                self.after(
+                    500,
+                    self.start_verify_cache_thread,
+                    {"path": project_path},
+                    cache_info_label_widget,
+                )
+
+        except Exception as e:
+            print(f"Erro na thread de limpeza de cache: {e}")
+            self.after(
+                0,
+                self._update_cache_info_label,
+                cache_info_label_widget,
+                "Cache: Erro ao limpar",
+            )
+
+    def start_clean_cache_thread(
+        self, project_info, allow_clean_checkbox_widget, cache_info_label_widget
+    ):
+        """Inicia uma thread para limpar o cache do projeto."""
+        project_path = project_info["path"]
+
+        if (
+            not allow_clean_checkbox_widget.get()
+        ):  # .get() retorna 1 se marcado, 0 se desmarcado
+            self._update_cache_info_label(
+                cache_info_label_widget, "Limpeza não permitida (marque a caixa)."
+            )
+            return
+
+        self._update_cache_info_label(cache_info_label_widget, "Cache: Limpando...")
+
+        thread = threading.Thread(
+            target=self._thread_target_clean_cache,
+            args=(
+                project_path,
+                cache_info_label_widget,
+                allow_clean_checkbox_widget,
+            ),  # Passa o checkbox para futuras checagens dentro da thread se necessário
+        )
+        thread.daemon = True
+        thread.start()
+
+    def prompt_add_project_manually(self):
+        """Abre uma caixa de diálogo para o usuário selecionar uma pasta de projeto."""
+        # CORRIGIDO AQUI:
+        self.global_status_label.configure(
+            text="Status Global: Selecionando pasta para adição manual..."
+        )
+
+        folder_selected = filedialog.askdirectory(
+            title="Selecione a Pasta do Projeto Unreal"
+        )
+
+        if folder_selected:
+            print(f"UI: Pasta selecionada manualmente: {folder_selected}")
+            project_info = self.validate_unreal_project_folder(
+                folder_selected
+            )  # Esta função já retorna o nome do .uproject
+            if project_info:
+                if project_info["path"] not in self.project_registry:
+                    self.add_project_entry_to_ui(
+                        project_info, from_saved_data=False
+                    )  # from_saved_data é False para adição manual
+                    # CORRIGIDO AQUI:
+                    self.global_status_label.configure(
+                        text=f"Status Global: Projeto '{project_info['name']}' adicionado manualmente."
+                    )
+                else:
+                    # CORRIGIDO AQUI:
+                    self.global_status_label.configure(
+                        text=f"Status Global: Projeto '{project_info['name']}' já está na lista."
+                    )
+            else:
+                # CORRIGIDO AQUI:
+                self.global_status_label.configure(
+                    text="Status Global: Pasta selecionada não é um projeto Unreal válido."
+                )
+        else:
+            # CORRIGIDO AQUI:
+            self.global_status_label.configure(
+                text="Status Global: Adição manual cancelada."
+            )
+
+    def validate_unreal_project_folder(self, folder_path):
+        """
+        Verifica se a pasta fornecida contém um arquivo .uproject.
+        Retorna um dicionário com informações do projeto se válido, senão None.
+        """
+        if not os.path.isdir(folder_path):
+            return None
+
+        project_file_found = None
+        for item_name in os.listdir(folder_path):
+            if item_name.endswith(".uproject"):
+                project_file_found = item_name
+                break
+
+        if project_file_found:
+            project_name = os.path.basename(folder_path)
+            return {
+                "name": project_name,
+                "path": folder_path,
+                "uproject_file": project_file_found,
+            }
+        return None
+
+    def start_discover_projects_thread(
+        self, clear_current_list=True
+    ):  # <--- CORREÇÃO AQUI
+        """
+        Inicia uma thread para descobrir projetos Unreal nas pastas de busca.
+        Se clear_current_list for True, limpa a lista de projetos exibida antes de escanear.
+        """
+        if clear_current_list:
+            self.global_status_label.configure(
+                text="Status Global: Limpando lista e procurando projetos..."
+            )
+            self._clear_project_list_ui()  # Limpa a lista e o registro
+            self.discovery_cache.clear()  # Reescaneamento pedido pelo usuário lista tudo
+        else:
+            self.global_status_label.configure(
+                text="Status Global: Procurando novos projetos nas pastas de busca (sem limpar existentes)..."
+            )
+
+        self._discovery_streamed_paths.clear()
+        thread = threading.Thread(
+            target=self._thread_target_discover_projects,
+            args=(list(self.project_search_roots), self.project_search_max_depth),
+        )
+        thread.daemon = True
+        thread.start()
+
+    def _thread_target_discover_projects(self, base_paths, max_depth):
+        """
+        Roda discover_unreal_projects fora da thread do Tk. Cada projeto aparece na lista
+        assim que é encontrado; o resultado completo chega à UI no fim.
+        """
+        found_projects, error_message = discover_unreal_projects(
+            base_paths,
+            self,
+            max_depth,
+            on_project_found=lambda project: self.after(
+                0, self._add_streamed_discovered_project, project
+            ),
+            cache=self.discovery_cache,
+        )
+        self.discovery_cache.save()
+        self.after(
+            0, self.update_project_list_ui_from_discovery, found_projects, error_message
+        )
+
+    def _add_streamed_discovered_project(self, project_info):
+        """Mostra um projeto da busca em andamento (thread do Tk)."""
+        normalized_path = os.path.normpath(project_info["path"])
+        if normalized_path in self.project_registry:
+            return
+        self.add_project_entry_to_ui(project_info.copy(), from_saved_data=False)
+        if normalized_path in self.project_registry:
+            self._discovery_streamed_paths.add(normalized_path)
+            self.global_status_label.configure(
+                text=f"Status Global: Procurando projetos... "
+                f"({len(self._discovery_streamed_paths)} novo(s) até agora)"
+            )
+
+    def _clear_project_list_ui(self):
+        """Limpa todos os widgets da lista de projetos na UI e o registro de projetos."""
+        for widget_info in self.project_widgets.values():
+            widget_info["frame"].destroy()
+        self.project_widgets = {}
+        self.project_registry.clear()
+
+    def update_project_list_ui_from_discovery(self, projects_data, error_message):
+        self.log_message(
+            f"--- DEBUG: update_project_list_ui_from_discovery INÍCIO ---",
+            level="DEBUG",
+        )
+        # Não limpa a UI aqui. A limpeza é feita por start_discover_projects_thread se clear_current_list=True.
+        # Se clear_current_list=False (como na inicialização), queremos ADICIONAR aos já carregados.
+
+        if error_message:
+            self.log_message(
+                f"Erro na descoberta automática de projetos: {error_message}",
+                level="ERROR",
+            )
+            if (
+                hasattr(self, "global_status_label")
+                and self.global_status_label.winfo_exists()
+            ):
+                self.global_status_label.configure(
+                    text=f"Status Global: Erro na descoberta - {error_message}"
+                )
+            return
+
+        # Os projetos novos mostrados durante a busca já entram na contagem
+        added_now_count = len(self._discovery_streamed_paths)
+        updated_count = 0  # Para projetos já existentes que podem ter dados atualizados
+
+        if projects_data:
+            self.log_message(
+                f"DISCOVERY: Recebidos {len(projects_data)} projetos da varredura.",
+                level="DEBUG",
+            )
+            for project_info_from_discovery in projects_data:
+                path_from_discovery = project_info_from_discovery.get("path")
+                name_from_discovery = project_info_from_discovery.get(
+                    "name", "Desconhecido_Discovery"
+                )
+
+                if not path_from_discovery:
+                    self.log_message(
+                        f"DISCOVERY: Projeto '{name_from_discovery}' sem caminho. Pulando.",
+                        level="WARNING",
+                    )
+                    continue
+
+                normalized_path_from_discovery = os.path.normpath(path_from_discovery)
+                if normalized_path_from_discovery in self._discovery_streamed_paths:
+                    continue
+                project_data_to_process = project_info_from_discovery.copy()
+                project_data_to_process["path"] = normalized_path_from_discovery
+
+                # add_project_entry_to_ui vai verificar se já existe no registro
+                # e não vai adicionar visualmente de novo se from_saved_data=False.
+                # Ele também adiciona ao registro se for realmente novo.
+
+                # Precisamos saber se era novo ANTES de chamar add_project_entry_to_ui
+                is_new_to_display = (
+                    normalized_path_from_discovery not in self.project_registry
+                )
+
+                self.add_project_entry_to_ui(
+                    project_data_to_process, from_saved_data=False
+                )
+
+                if (
+                    is_new_to_display
+                    and normalized_path_from_discovery in self.project_registry
+                ):
+                    added_now_count += 1
+                elif (
+                    not is_new_to_display
+                ):  # Se não era novo, consideramos como 'verificado/atualizado'
+                    updated_count += 1
+        else:
+            self.log_message(
+                "DISCOVERY: Nenhum projeto retornado pela varredura.", level="DEBUG"
+            )
+
+        # Atualiza o status global
+        current_total_projects = len(self.project_widgets)
+        status_msg = f"Status Global: {current_total_projects} projeto(s) listado(s)."
+        if added_now_count > 0:
+            status_msg += f" ({added_now_count} novo(s) da varredura)"
+        elif (
+            projects_data and updated_count == len(projects_data) and updated_count > 0
+        ):  # Se todos da varredura já existiam
+            status_msg += " (Nenhum novo da varredura)"
+        elif (
+            not projects_data and current_total_projects > 0
+        ):  # Nenhum dado da varredura, mas temos projetos carregados
+            pass  # Mantém o status de "X projetos listados"
+        elif not current_total_projects:  # Nenhnum projeto de lugar nenhum
+            status_msg = "Status Global: Nenhum projeto encontrado."
+
+        if (
+            hasattr(self, "global_status_label")
+            and self.global_status_label.winfo_exists()
+        ):
+            self.global_status_label.configure(text=status_msg)
+        self.log_message(
+            f"DISCOVERY: Status final da operação: {status_msg}", level="INFO"
+        )
+
+        self.log_message(
+            f"--- DEBUG: update_project_list_ui_from_discovery FIM ---", level="DEBUG"
+        )
+
+    def add_project_entry_to_ui(self, project_info, from_saved_data=False):
+        project_name = project_info.get("name", "Nome Desconhecido")
+        project_path = project_info.get("path")
+
+        if not project_path:
+            self.log_message(
+                f"ADD_UI: Projeto '{project_name}' (dados: {project_info}) sem caminho. Pulando.",
+                level="WARNING",
+            )
+            return
+
+        normalized_project_path = os.path.normpath(project_path)
+        project_info["path"] = normalized_project_path
+
+        self.log_message(
+            f"ADD_UI: Processando para '{project_name}' (Path: {normalized_project_path}), from_saved_data={from_saved_data}",
+            level="DEBUG",
+        )
+
+        key = project_key(normalized_project_path)
+        existing_record = self.project_registry.get(normalized_project_path)
+        if existing_record is not None:
+            self.log_message(
+                f"ADD_UI: Projeto {project_name} ({normalized_project_path}) já existe na lista. Verificando dados internos.",
+                level="DEBUG",
+            )
+            uproject_file = project_info.get(
+                "uproject_file", existing_record.uproject_file
+            )
+            if (
+                existing_record.name != project_name
+                or existing_record.uproject_file != uproject_file
+            ):  # Apenas atualiza se os dados realmente mudaram
+                self.log_message(
+                    f"ADD_UI: Atualizando dados internos para o projeto existente '{project_name}'.",
+                    level="TRACE",
+                )
+                self.project_registry.update(
+                    normalized_project_path,
+                    name=project_name,
+                    uproject_file=uproject_file,
+                )
+                self.project_widgets[key]["name_label"].configure(text=project_name)
+            return
+
+        self.log_message(
+            f"ADD_UI: Criando nova entrada na UI para '{project_name}'.", level="INFO"
+        )
+
+        project_frame = ctk.CTkFrame(self.project_scrollable_frame)
+        project_frame.pack(fill="x", pady=5, padx=5)
+
+        top_info_frame = ctk.CTkFrame(project_frame)
+        top_info_frame.pack(fill="x", padx=5, pady=(5, 2))
+        name_label_ui = ctk.CTkLabel(
+            top_info_frame, text=f"{project_name}", font=ctk.CTkFont(weight="bold")
+        )
+        name_label_ui.pack(side="left", padx=(0, 5))
+        path_label_ui = ctk.CTkLabel(
+            top_info_frame,
+            text=f"({normalized_project_path})",
+            font=ctk.CTkFont(size=9),
+            anchor="w",
+        )
+        path_label_ui.pack(side="left", padx=0, expand=True, fill="x")
+        cache_info_label_ui = ctk.CTkLabel(
+            top_info_frame, text="Cache: -", width=150, anchor="e"
+        )
+        cache_info_label_ui.pack(side="right", padx=5)
+
+        main_controls_frame = ctk.CTkFrame(project_frame)
+        main_controls_frame.pack(fill="x", padx=5, pady=(2, 5))
+        verify_auto_checkbox_ui = ctk.CTkCheckBox(
+            main_controls_frame, text="Monitorar Auto"
+        )
+        verify_auto_checkbox_ui.pack(side="left", padx=5)
+        allow_clean_checkbox_ui = ctk.CTkCheckBox(
+            main_controls_frame, text="Permitir Limpeza (Geral)"
+        )
+        allow_clean_checkbox_ui.pack(side="left", padx=5)
+        gb_limit_label_ui = ctk.CTkLabel(main_controls_frame, text="Limite GB (Auto):")
+        gb_limit_label_ui.pack(side="left", padx=(10, 0))
+        gb_limit_entry_ui = ctk.CTkEntry(
+            main_controls_frame, width=50, placeholder_text="Ex: 5"
+        )
+        gb_limit_entry_ui.pack(side="left", padx=5)
+        # Alvo da limpeza automática: ao passar do limite, limpa só até ficar abaixo dele
+        gb_low_watermark_label_ui = ctk.CTkLabel(
+            main_controls_frame, text="Alvo GB (Auto):"
+        )
+        gb_low_watermark_label_ui.pack(side="left", padx=(10, 0))
+        gb_low_watermark_entry_ui = ctk.CTkEntry(
+            main_controls_frame, width=50, placeholder_text="Ex: 3"
+        )
+        gb_low_watermark_entry_ui.pack(side="left", padx=5)
+        remove_button_ui = ctk.CTkButton(
+            main_controls_frame,
+            text="Remover Projeto",
+            command=lambda p_info=project_info.copy(): self.remove_project_entry(
+                p_info
+            ),
+            width=100,
+        )
+        remove_button_ui.pack(side="right", padx=5)
+
+        cleanup_items_main_frame = ctk.CTkFrame(project_frame, fg_color="transparent")
+        cleanup_items_main_frame.pack(fill="x", padx=5, pady=(5, 5))
+
+        folder_checkboxes_map = {}
+        main_folders_to_scan = ["Intermediate", "DerivedDataCache", "Saved"]
+
+        for main_folder_name in main_folders_to_scan:
+            main_folder_abs_path = os.path.join(
+                normalized_project_path, main_folder_name
+            )
+            self.log_message(
+                f"ADD_UI: Verificando pasta principal '{main_folder_name}' em '{main_folder_abs_path}' (para '{project_name}')",
+                level="TRACE",
+            )
+
+            main_folder_header_frame = ctk.CTkFrame(
+                cleanup_items_main_frame, fg_color="transparent"
+            )
+            main_folder_header_frame.pack(fill="x", pady=(3, 0))
+
+            main_folder_id = (
+                main_folder_name  # ID para o checkbox da pasta principal (ex: "Saved")
+            )
+            main_chk_var = ctk.StringVar(value="off")
+            main_chk = ctk.CTkCheckBox(
+                main_folder_header_frame,
+                text=f" {main_folder_name} (arquivos soltos na raiz desta pasta)",
+                variable=main_chk_var,
+                onvalue="on",
+                offvalue="off",
+            )
+            main_chk.pack(side="left", padx=5)
+            folder_checkboxes_map[main_folder_id] = {
+                "widget": main_chk,
+                "var": main_chk_var,
+                "path": main_folder_name,
+                "is_main_folder": True,
+            }
+
+            subfolders_frame_ui = ctk.CTkFrame(
+                cleanup_items_main_frame, fg_color="transparent"
+            )
+            # pack deste frame é feito por toggle_visibility
+
+            toggle_button_text_prefix = f"Subpastas de {main_folder_name}"
+            toggle_button = ctk.CTkButton(
+                main_folder_header_frame,
+                text=f"{toggle_button_text_prefix} ▼",
+                font=ctk.CTkFont(size=10),
+                height=20,
+                width=180,
+                anchor="w",
+            )
+            toggle_button.configure(
+                command=lambda sf=subfolders_frame_ui, btn=toggle_button, t_prefix=toggle_button_text_prefix: self.toggle_visibility(
+                    sf, btn, t_prefix
+                )
+            )
+            toggle_button.pack(side="left", padx=10)
+
+            if os.path.exists(main_folder_abs_path) and os.path.isdir(
+                main_folder_abs_path
+            ):
+                subfolders_found_count = 0
+                try:
+                    for sub_item_name in sorted(os.listdir(main_folder_abs_path)):
+                        sub_item_abs_path = os.path.join(
+                            main_folder_abs_path, sub_item_name
+                        )
+                        if os.path.isdir(sub_item_abs_path):
+                            subfolders_found_count += 1
+                            relative_subfolder_path = os.path.join(
+                                main_folder_name, sub_item_name
+                            )
+                            normalized_relative_subfolder_path = os.path.normpath(
+                                relative_subfolder_path
+                            )
+                            subfolder_desc = KNOWN_SUBFOLDER_DESCRIPTIONS.get(
+                                normalized_relative_subfolder_path, "Subpasta."
+                            )
+
+                            item_frame = ctk.CTkFrame(subfolders_frame_ui)
+                            item_frame.pack(fill="x")
+                            chk_var_sub = ctk.StringVar(value="off")
+                            chk_sub = ctk.CTkCheckBox(
+                                item_frame,
+                                text=f" {normalized_relative_subfolder_path}",
+                                variable=chk_var_sub,
+                                onvalue="on",
+                                offvalue="off",
+                            )
+                            chk_sub.pack(side="left", padx=25, pady=1)
+                            folder_checkboxes_map[
+                                normalized_relative_subfolder_path
+                            ] = {
+                                "widget": chk_sub,
+                                "var": chk_var_sub,
+                                "path": normalized_relative_subfolder_path,
+                                "is_main_folder": False,
+                            }
+                            desc_label_sub = ctk.CTkLabel(
+                                item_frame,
+                                text=f"({subfolder_desc})",
+                                font=ctk.CTkFont(size=9),
+                                anchor="w",
+                            )
+                            desc_label_sub.pack(
+                                side="left", padx=5, pady=1, expand=True, fill="x"
+                            )
+                    if subfolders_found_count == 0:
+                        ctk.CTkLabel(
+                            subfolders_frame_ui,
+                            text=" (Nenhuma subpasta encontrada)",
+                            font=ctk.CTkFont(size=9, slant="italic"),
+                        ).pack(fill="x", anchor="w", padx=25, pady=1)
+                        toggle_button.configure(
+                            state="disabled",
+                            text=f"{toggle_button_text_prefix} (vazio)",
+                        )
+                except Exception as e_list_sub:
+                    self.log_message(
+                        f"ADD_UI: Erro ao listar subitens de {main_folder_abs_path}: {e_list_sub}",
+                        level="ERROR",
+                    )
+                    ctk.CTkLabel(
+                        subfolders_frame_ui,
+                        text=" (Erro ao listar subpastas)",
+                        font=ctk.CTkFont(size=9, slant="italic"),
+                    ).pack(fill="x", anchor="w", padx=25, pady=1)
+                    toggle_button.configure(
+                        state="disabled", text=f"{toggle_button_text_prefix} (erro)"
+                    )
+            else:
+                toggle_button.configure(
+                    state="disabled",
+                    text=f"{toggle_button_text_prefix} (pasta não encontrada)",
+                )
+                ctk.CTkLabel(
+                    main_folder_header_frame,
+                    text="(Pasta principal não encontrada)",
+                    font=ctk.CTkFont(size=9, slant="italic"),
+                ).pack(side="left", padx=5)
+
+        widget_references = {
+            "frame": project_frame,
+            "name_label": name_label_ui,
+            "path_label": path_label_ui,
+            "cache_info_label": cache_info_label_ui,
+            "verify_auto_checkbox": verify_auto_checkbox_ui,
+            "allow_clean_checkbox": allow_clean_checkbox_ui,
+            "gb_limit_entry": gb_limit_entry_ui,
+            "gb_low_watermark_entry": gb_low_watermark_entry_ui,
+            "folder_checkboxes": folder_checkboxes_map,
+            "remove_button": remove_button_ui,
+            # Não armazenamos mais o toggle_button único, pois são múltiplos
+        }
+        record = ProjectRecord.from_project_data(project_info)
+        if from_saved_data:
+            self.log_message(
+                f"ADD_UI: Configurando valores para '{project_name}' a partir de dados salvos.",
+                level="TRACE",
+            )
+        else:
+            # Configurações padrão para novos projetos: "Permitir Limpeza (Geral)" marcado
+            record.allow_clean = True
+        self.project_registry.add(record)
+        self.project_widgets[key] = widget_references
+        if not from_saved_data:
+            self.log_message(
+                f"ADD_UI: Projeto NOVO '{project_name}' ({normalized_project_path}) adicionado ao registro.",
+                level="DEBUG",
+            )
+
+        if record.monitor_auto:
+            verify_auto_checkbox_ui.select()
+        else:
+            verify_auto_checkbox_ui.deselect()
+        if record.allow_clean:
+            allow_clean_checkbox_ui.select()
+        else:
+            allow_clean_checkbox_ui.deselect()
+        gb_limit_entry_ui.delete(0, "end")
+        if record.gb_limit != "":
+            gb_limit_entry_ui.insert(0, str(record.gb_limit))
+        gb_low_watermark_entry_ui.delete(0, "end")
+        if record.gb_low_watermark != "":
+            gb_low_watermark_entry_ui.insert(0, str(record.gb_low_watermark))
+
+        # --- CARREGAR ESTADO DOS CHECKBOXES DE LIMPEZA (PRINCIPAIS E SUBPASTAS) ---
+        self.log_message(
+            f"ADD_UI: Itens de limpeza salvos para '{project_name}': {list(record.selected_items)}",
+            level="TRACE",
+        )
+        for item_id, chk_info_dict in folder_checkboxes_map.items():
+            # item_id é o nome da pasta principal (ex: "Saved") ou o caminho relativo da subpasta (ex: os.path.normpath("Saved/Logs"))
+            if item_id in record.selected_items:
+                chk_info_dict["var"].set("on")
+            else:
+                chk_info_dict["var"].set("off")
+        # --------------------------------------------------------------------------
+
+        # A partir daqui toda mudança nos controles é copiada para o registro, que é o que
+        # as threads de segundo plano leem (nunca as variáveis do Tk)
+        def sync_record(*_args, project_path=normalized_project_path):
+            self._sync_project_record(project_path)
+            self.save_app_data()  # Agendada: cliques seguidos viram uma gravação só
+
+        verify_auto_checkbox_ui.configure(command=sync_record)
+        allow_clean_checkbox_ui.configure(command=sync_record)
+        for entry_widget in (gb_limit_entry_ui, gb_low_watermark_entry_ui):
+            entry_widget.bind("<KeyRelease>", sync_record, add="+")
+            entry_widget.bind("<FocusOut>", sync_record, add="+")
+        for chk_info_dict in folder_checkboxes_map.values():
+            chk_info_dict["var"].trace_add("write", sync_record)
+        # Itens salvos cujas pastas não existem mais saem da seleção
+        self._sync_project_record(normalized_project_path)
+
+    def _sync_project_record(self, project_path):
+        """Copia o estado dos controles de um projeto para o registro (thread do Tk)."""
+        widget_info = self.project_widgets.get(project_key(project_path))
+        if widget_info is None:
+            return
+        self.project_registry.update(
+            project_path,
+            monitor_auto=widget_info["verify_auto_checkbox"].get() == 1,
+            allow_clean=widget_info["allow_clean_checkbox"].get() == 1,
+            gb_limit=widget_info["gb_limit_entry"].get(),
+            gb_low_watermark=widget_info["gb_low_watermark_entry"].get(),
+            selected_items=[
+                item_id
+                for item_id, chk_data in widget_info["folder_checkboxes"].items()
+                if chk_data["var"].get() == "on"
+            ],
+        )
+
+    def _measure_monitored_item_sizes(
+        self, project_path, selected_items, use_item_cache=False
+    ):
+        """
+        Tamanho de cada item selecionado de um projeto para o monitoramento:
+        ({item_id: bytes}, {item_id: arquivos}).
+        No modo por eventos reaproveita os tamanhos por item já conhecidos e mede só os que
+        faltam (ou ficaram "sujos"); a quantidade de arquivos não é acompanhada por eventos,
+        então volta vazia. No modo por intervalo faz uma única varredura do projeto.
+        As varreduras passam pelo IOScheduler (limite de tarefas simultâneas por disco).
+        """
+        if not use_item_cache:
+            breakdown = self.io_scheduler.call(
+                project_path,
+                IO_KIND_SCAN,
+                scan_project_cache_breakdown,
+                project_path,
+                self,
+                self.size_index,
+                background=self.background_priority,
+            )
+            return calculate_item_stats_from_breakdown(breakdown, selected_items)
+
+        item_sizes = self._monitor_item_sizes.setdefault(
+            CacheChangeWatcher.project_key(project_path), {}
+        )
+        for item_id in selected_items:
+            if item_id not in item_sizes:
+                item_sizes[item_id] = self.io_scheduler.call(
+                    project_path,
+                    IO_KIND_SCAN,
+                    calculate_project_cache_size,
+                    project_path,
+                    [item_id],
+                    self,
+                    size_index=self.size_index,
+                    background=self.background_priority,
+                )
+        return {item_id: item_sizes[item_id] for item_id in selected_items}, {}
+
+    def _measure_monitored_cache_size(
+        self, project_path, selected_items, use_item_cache=False
+    ):
+        """Tamanho total dos itens selecionados de um projeto para o monitoramento."""
+        return sum(
+            self._measure_monitored_item_sizes(
+                project_path, selected_items, use_item_cache
+            )[0].values()
+        )
+
+    def _apply_monitor_item_changes(self, project_key, item_changes):
+        """Aplica as variações relatadas pelo CacheChangeWatcher aos tamanhos por item conhecidos."""
+        item_sizes = self._monitor_item_sizes.get(project_key)
+        if item_sizes is None:
+            return
+        if CacheChangeWatcher.ALL_ITEMS in item_changes:
+            item_sizes.clear()
+            return
+        for item_id, change in item_changes.items():
+            if item_id not in item_sizes:
+                continue
+            if change["dirty"]:
+                del item_sizes[item_id]  # Será medido de novo na próxima verificação
+            else:
+                item_sizes[item_id] = max(0, item_sizes[item_id] + change["delta"])
+
+    @staticmethod
+    def _has_retention_items(project):
+        """Se algum item selecionado de uma cópia do registro tem regra de retenção."""
+        rules = project.extra.get("retention_rules")
+        if not isinstance(rules, dict) or not rules:
+            return False
+        rule_item_ids = {os.path.normpath(item_id) for item_id in rules}
+        return any(
+            os.path.normpath(item_id) in rule_item_ids
+            for item_id in project.selected_items
+        )
+
+    def _monitor_apply_retention(self, project, retention_rules, retention_item_ids):
+        """
+        Uma passada das regras de retenção de um projeto no monitoramento (thread do
+        monitoramento): apaga só os arquivos vencidos e informa quanto ficou retido e quanto
+        foi liberado. Roda como tarefa de limpeza no IOScheduler.
+        """
+        started_at = time.perf_counter()
+        totals = self.io_scheduler.call(
+            project.path,
+            IO_KIND_DELETE,
+            apply_project_retention,
+            project.path,
+            retention_rules,
+            retention_item_ids,
+            self,
+            stop_event=self.monitoring_stop_event,
+            background=self.background_priority,
+        )
+        if not totals["items"]:
+            return
+        summary_level = "INFO" if totals["files_deleted"] else "DEBUG"
+        if self.is_log_level_enabled(summary_level):
+            self.log_message(
+                f"Monitoramento: Retenção em '{project.name}' ({', '.join(totals['items'])}): "
+                f"{format_size(totals['bytes_retained'])} retidos ({totals['files_retained']} arquivos), "
+                f"{format_size(totals['bytes_reclaimed'])} liberados ({totals['files_deleted']} arquivos).",
+                level=summary_level,
+            )
+        if totals["errors_total"]:
+            self.log_message(
+                f"Monitoramento: {totals['errors_total']} erro(s) ao aplicar a retenção em '{project.name}'. Primeiro: {totals['errors'][0]}",
+                level="ERROR",
+            )
+        if totals["files_deleted"] or totals["errors_total"]:
+            self.history_store.record_cleanup(
+                project.path,
+                totals["items"],
+                totals["bytes_reclaimed"],
+                totals["errors_total"],
+                time.perf_counter() - started_at,
+                trigger="retention",
+            )
+        if totals["files_deleted"]:
+            # Os tamanhos por item do modo por eventos são medidos de novo
+            self._monitor_item_sizes.pop(
+                CacheChangeWatcher.project_key(project.path), None
+            )
+
+    def _monitor_check_project(self, project, use_item_cache=False):
+        """
+        Verifica um projeto no monitoramento automático: tamanho dos itens selecionados contra o
+        Limite GB e, se excedido, limpeza dos itens (em cleanup_priority_order) só até ficar
+        abaixo do Alvo GB. Roda na thread do monitoramento.
+
+        Com 'use_item_cache' (modo por eventos), os tamanhos vêm de self._monitor_item_sizes, já
+        atualizado com as variações do CacheChangeWatcher; só itens sem tamanho conhecido são medidos.
+        'project' é uma cópia do registro (ProjectRegistry.snapshots): nada aqui lê widgets do Tk.
+        """
+        project_path = project.path
+        project_name = project.name
+        project_data = project.to_project_data()
+        # Roda a cada ciclo para cada projeto: mensagens DEBUG só são montadas se ativas
+        debug_enabled = self.is_log_level_enabled("DEBUG")
+
+        if project.monitor_auto and project.allow_clean:
+            if debug_enabled:
+                self.log_message(
+                    f"Monitoramento: Verificando '{project_name}' (Monitorar Auto e Permitir Limpeza Geral ON)",
+                    level="DEBUG",
+                )
+
+            if is_unreal_project_open(
+                project_path,
+                self.open_editor_index,
+                get_project_uproject_path(project_data),
+            ):
+                self.log_message(
+                    f"Monitoramento: Projeto '{project_name}' está aberto, pulando limpeza automática.",
+                    level="INFO",
+                )
+                self._post_project_cache_info(
+                    project_path, "Cache: (Auto: Pulado - Aberto)"
+                )
+                return
+
+            # Regras de retenção valem em toda passada, independente do Limite GB
+            retention_rules = get_project_retention_rules(project_data, self)
+            retention_item_ids = [
+                item_id
+                for item_id in project.selected_items
+                if os.path.normpath(item_id) in retention_rules
+            ]
+            if retention_item_ids:
+                self._monitor_apply_retention(
+                    project, retention_rules, retention_item_ids
+                )
+
+            gb_limit_str = str(project.gb_limit).strip()
+            if not gb_limit_str:
+                if debug_enabled:
+                    self.log_message(
+                        f"Monitoramento: Limite GB não definido para '{project_name}'. Pulando limpeza automática.",
+                        level="DEBUG",
+                    )
+                self._post_project_cache_info(
+                    project_path, "Cache: (Auto: Sem Limite GB)"
+                )
+                return
+
+            try:
+                gb_limit_float = float(gb_limit_str)
+                limit_bytes = gb_limit_float * (1024**3)
+                if limit_bytes < 0:
+                    raise ValueError("Limite de GB não pode ser negativo")
+            except ValueError:
+                self.log_message(
+                    f"Monitoramento: Limite GB inválido ('{gb_limit_str}') para '{project_name}'. Pulando limpeza automática.",
+                    level="WARNING",
+                )
+                self._post_project_cache_info(
+                    project_path, "Cache: (Auto: Limite GB Inválido)"
+                )
+                return
+
+            # Alvo (low watermark): ao passar do limite, limpa só até ficar abaixo dele.
+            # Vazio = 0, ou seja, limpa todos os itens selecionados.
+            gb_low_watermark_str = str(project.gb_low_watermark).strip()
+            target_bytes = 0
+            if gb_low_watermark_str:
+                try:
+                    target_bytes = float(gb_low_watermark_str) * (1024**3)
+                    if target_bytes < 0:
+                        raise ValueError("Alvo de GB não pode ser negativo")
+                except ValueError:
+                    self.log_message(
+                        f"Monitoramento: Alvo GB inválido ('{gb_low_watermark_str}') para '{project_name}'. Pulando limpeza automática.",
+                        level="WARNING",
+                    )
+                    self._post_project_cache_info(
+                        project_path, "Cache: (Auto: Alvo GB Inválido)"
+                    )
+                    return
+                if target_bytes >= limit_bytes:
+                    self.log_message(
+                        f"Monitoramento: Alvo GB ({gb_low_watermark_str}) de '{project_name}' não é menor que o Limite GB ({gb_limit_str}); a limpeza automática não terá folga entre os dois.",
+                        level="WARNING",
+                    )
+
+            selected_items_for_project = list(project.selected_items)
+
+            if not selected_items_for_project:
+                if debug_enabled:
+                    self.log_message(
+                        f"Monitoramento: Projeto '{project_name}' não tem itens selecionados para limpeza/cálculo de cache. Pulando.",
+                        level="DEBUG",
+                    )
+                self._post_project_cache_info(
+                    project_path, "Cache: (Auto: Nada selecionado)"
+                )
+                return
+
+            if self.is_log_level_enabled("TRACE"):
+                self.log_message(
+                    f"Monitoramento: Itens selecionados para '{project_name}' para cálculo/limpeza: {selected_items_for_project}",
+                    level="TRACE",
+                )
+            scan_started_at = time.perf_counter()
+            item_sizes, item_file_counts = self._measure_monitored_item_sizes(
+                project_path, selected_items_for_project, use_item_cache
+            )
+            self.history_store.record_scan(
+                project_path,
+                item_sizes,
+                time.perf_counter() - scan_started_at,
+                item_file_counts,
+            )
+            current_cache_size_bytes = sum(item_sizes.values())
+            self.project_registry.update(
+                project_path, last_selected_bytes=current_cache_size_bytes
+            )
+
+            self.log_message(
+                f"Monitoramento: '{project_name}' - Cache Selecionado Atual: {format_size(current_cache_size_bytes)}, Limite: {format_size(limit_bytes)}, Alvo: {format_size(target_bytes)}",
+                level="INFO",
+            )
+            self._post_project_cache_info(
+                project_path, f"Cache: {format_size(current_cache_size_bytes)}"
+            )
+
+            if current_cache_size_bytes > limit_bytes:
+                self.log_message(
+                    f"Monitoramento: Cache de '{project_name}' ({format_size(current_cache_size_bytes)}) excedeu o limite de {format_size(limit_bytes)}. Iniciando limpeza automática...",
+                    level="INFO",
+                )
+                self._post_project_cache_info(project_path, "Cache: (Auto Limpeza...)")
+
+                # Só os itens necessários para chegar ao alvo, na ordem de prioridade
+                ddc_eviction_budget_bytes = get_project_ddc_eviction_budget(
+                    project_data, self
+                )
+                # Itens com regra de retenção já passaram pela regra no início desta
+                # verificação e nunca são apagados inteiros; o planejador escolhe os demais
+                items_to_clean, projected_size = plan_cleanup_to_target(
+                    item_sizes,
+                    target_bytes,
+                    self.cleanup_priority_order,
+                    ddc_eviction_budget_bytes,
+                    retention_item_ids,
+                )
+                self.log_message(
+                    f"Monitoramento: Limpando {len(items_to_clean)} de {len(item_sizes)} item(ns) de '{project_name}' para chegar ao alvo de {format_size(target_bytes)} (previsto: {format_size(projected_size)}): {items_to_clean}",
+                    level="INFO",
+                )
+
+                # Passa self como logger e os itens escolhidos
+                clean_started_at = time.perf_counter()
+                space_freed, deleted_subfolder_paths, errors = (
+                    self.io_scheduler.call(
+                        project_path,
+                        IO_KIND_DELETE,
+                        clean_project_cache,
+                        project_path,
+                        self,
+                        items_to_clean,
+                        size_index=self.size_index,
+                        deletion_mode=self.deletion_mode,
+                        purger=self.purger,
+                        ddc_eviction_budget_bytes=ddc_eviction_budget_bytes,
+                        ddc_eviction_index=self.ddc_eviction_index,
+                        retention_rules=retention_rules,
+                        background=self.background_priority,
+                    )
+                )
+                self.history_store.record_cleanup(
+                    project_path,
+                    items_to_clean,
+                    space_freed,
+                    len(errors),
+                    time.perf_counter() - clean_started_at,
+                    trigger="auto",
+                )
+                self._monitor_item_sizes.pop(
+                    CacheChangeWatcher.project_key(project_path), None
+                )
+
+                # Atualiza a UI dos itens de limpeza se subpastas foram deletadas
+                if deleted_subfolder_paths:
+                    self.after(
+                        0,
+                        self.refresh_project_cleanup_items_ui,
+                        project_path,
+                        deleted_subfolder_paths,
+                    )
+
+                msg_details = []
+                if deleted_subfolder_paths or (
+                    space_freed > 0 and not errors
+                ):  # Se subpastas foram deletadas ou espaço foi liberado sem erros (arquivos soltos)
+                    msg_details.append(f"Liberado: {format_size(space_freed)}.")
+                if deleted_subfolder_paths and self.deletion_mode == DELETION_MODE_STAGED:
+                    msg_details.append("Purga em segundo plano.")
+                if errors:
+                    msg_details.append(f"{len(errors)} erro(s) na limpeza.")
+
+                final_msg = (
+                    "Auto Limpeza: " + " ".join(msg_details)
+                    if msg_details
+                    else "Auto Limpeza: Nada efetivamente limpo ou erro."
+                )
+                if (
+                    not msg_details and not errors
+                ):  # Caso especial: nada a limpar ou nada foi selecionado que existisse
+                    if not selected_items_for_project:
+                        final_msg = "Auto: Nada selecionado para limpar."
+                    else:
+                        final_msg = "Auto: Itens selecionados não encontrados ou já limpos."
+
+                self.log_message(
+                    f"Monitoramento: Resultado da limpeza para '{project_name}': {final_msg}",
+                    level="INFO",
+                )
+
+                self._post_project_cache_info(project_path, final_msg)
+                # Re-verificar e atualizar o tamanho do cache no label após a limpeza
+                # Usa a mesma lista selected_items_for_project, pois é o que nos interessa para o limite
+                new_size_bytes = self._measure_monitored_cache_size(
+                    project_path, selected_items_for_project, use_item_cache
+                )
+                self.project_registry.update(
+                    project_path, last_selected_bytes=new_size_bytes
+                )
+                self._post_project_cache_info(
+                    project_path,
+                    f"Cache (Pós-Limpeza Auto): {format_size(new_size_bytes)}",
+                )
+            elif debug_enabled:
+                self.log_message(
+                    f"Monitoramento: Cache de '{project_name}' ({format_size(current_cache_size_bytes)}) está dentro do limite.",
+                    level="DEBUG",
+                )
+        else:
+            if project.monitor_auto:
+                if debug_enabled:
+                    self.log_message(
+                        f"Monitoramento: '{project_name}' - Monitorar Auto ON, mas Permitir Limpeza Geral OFF. Apenas verificando tamanho (se itens selecionados).",
+                        level="DEBUG",
+                    )
+                # A lógica de apenas verificar tamanho, mesmo que não vá limpar, pode ser útil
+                selected_items_for_calc_only = list(project.selected_items)
+                if selected_items_for_calc_only:
+                    current_cache_size_bytes_calc_only = (
+                        self._measure_monitored_cache_size(
+                            project_path, selected_items_for_calc_only, use_item_cache
+                        )
+                    )
+                    self.project_registry.update(
+                        project_path,
+                        last_selected_bytes=current_cache_size_bytes_calc_only,
+                    )
+                    self._post_project_cache_info(
+                        project_path,
+                        f"Cache: {format_size(current_cache_size_bytes_calc_only)} (Monitorado/Não Limpar)",
+                    )
+                else:
+                    self._post_project_cache_info(
+                        project_path, "Cache: (Nada selecionado para monitorar)"
+                    )
+
+    def _monitor_relieve_disk_pressure(self):
+        """
+        Modo por espaço livre: consulta o livre dos volumes que têm projetos com "Permitir
+        Limpeza" e, nos que estão abaixo do limite, limpa os projetos com mais bytes
+        recuperáveis até voltar ao alvo. Roda na thread do monitoramento.
+        """
+        low_free_bytes, target_free_bytes = self.disk_pressure_watermarks
+        projects = [
+            {
+                "path": project.path,
+                "name": project.name,
+                "data": project.to_project_data(),
+                "selected_items": list(project.selected_items),
+            }
+            for project in self.project_registry.snapshots()
+            if project.allow_clean and project.selected_items
+        ]
+        if not projects:
+            return
+
+        def measure_reclaimable(project):
+            return self.io_scheduler.call(
+                project["path"],
+                IO_KIND_SCAN,
+                calculate_project_cache_size,
+                project["path"],
+                project["selected_items"],
+                self,
+                size_index=self.size_index,
+                background=self.background_priority,
+            )
+
+        def clean_project(project, reclaimable_bytes):
+            if is_unreal_project_open(
+                project["path"],
+                self.open_editor_index,
+                get_project_uproject_path(project["data"]),
+            ):
+                self.log_message(
+                    f"PRESSURE: Projeto '{project['name']}' está aberto, pulando.",
+                    level="INFO",
+                )
+                return None
+            clean_started_at = time.perf_counter()
+            space_freed, deleted_subfolder_paths, errors = self.io_scheduler.call(
+                project["path"],
+                IO_KIND_DELETE,
+                clean_project_cache,
+                project["path"],
+                self,
+                project["selected_items"],
+                size_index=self.size_index,
+                deletion_mode=self.deletion_mode,
+                purger=self.purger,
+                ddc_eviction_budget_bytes=get_project_ddc_eviction_budget(
+                    project["data"], self
+                ),
+                ddc_eviction_index=self.ddc_eviction_index,
+                retention_rules=get_project_retention_rules(project["data"], self),
+                background=self.background_priority,
+            )
+            self.history_store.record_cleanup(
+                project["path"],
+                project["selected_items"],
+                space_freed,
+                len(errors),
+                time.perf_counter() - clean_started_at,
+                trigger="pressure",
+            )
+            self._monitor_item_sizes.pop(
+                CacheChangeWatcher.project_key(project["path"]), None
+            )
+            if deleted_subfolder_paths:
+                self.after(
+                    0,
+                    self.refresh_project_cleanup_items_ui,
+                    project["path"],
+                    deleted_subfolder_paths,
+                )
+            if self.deletion_mode == DELETION_MODE_STAGED and not errors:
+                # As subpastas movidas só liberam espaço quando o purgador as apaga
+                return max(space_freed, reclaimable_bytes)
+            return space_freed
+
+        relieve_disk_pressure(
+            projects,
+            low_free_bytes,
+            target_free_bytes,
+            self,
+            measure_reclaimable,
+            clean_project,
+            stop_event=self.monitoring_stop_event,
+        )
+
+    def _post_monitoring_status(self, text):
+        """Agenda, da thread do monitoramento, a atualização do label de status."""
+        self.after(0, self._set_monitoring_status, text)
+
+    def _set_monitoring_status(self, text):
+        if (
+            hasattr(self, "monitoring_status_label")
+            and self.monitoring_status_label.winfo_exists()
+        ):
+            self.monitoring_status_label.configure(text=text)
+
+    def _on_watch_mode_toggled(self):
+        """Copia o checkbox do modo por eventos para self.monitoring_mode (thread do Tk)."""
+        self.monitoring_mode = (
+            MONITORING_MODE_WATCH
+            if self.watch_mode_monitoring_checkbox.get() == 1
+            else MONITORING_MODE_INTERVAL
+        )
+        self.save_app_data()
+
+    def _is_watch_mode_monitoring_selected(self):
+        """Lido pela thread do monitoramento: usa só o atributo, nunca o checkbox do Tk."""
+        return self.monitoring_mode == MONITORING_MODE_WATCH
+
+    def _auto_monitoring_loop(self):
+        self.log_message(
+            f"Thread de monitoramento automático iniciada. Intervalo configurado: {self.AUTO_MONITOR_INTERVAL_SECONDS}s",
+            level="INFO",
+        )
+        self._post_monitoring_status("Monitoramento Automático: Ativo")
+
+        change_watcher = None
+        changes_by_project = {}
+        while not self.monitoring_stop_event.is_set():
+            # O modo pode ser trocado na UI com o monitoramento ativo; vale a partir do próximo ciclo
+            watch_mode = self._is_watch_mode_monitoring_selected()
+            if watch_mode and change_watcher is None:
+                change_watcher = CacheChangeWatcher(self, self.size_index)
+                self._monitor_item_sizes.clear()
+                changes_by_project = {}
+                self.log_message(
+                    f"Monitoramento: Modo por eventos ativo ({'inotify' if change_watcher.uses_inotify else 'polling'}).",
+                    level="INFO",
+                )
+            elif not watch_mode and change_watcher is not None:
+                change_watcher.close()
+                change_watcher = None
+                self.log_message(
+                    "Monitoramento: Modo por intervalo ativo.", level="INFO"
+                )
+
+            self.log_message(
+                "Monitoramento: Iniciando novo ciclo de verificação...", level="DEBUG"
+            )
+            self._post_monitoring_status("Monitoramento Automático: Verificando...")
+
+            # Cópias do registro: a thread do monitoramento não lê variáveis do Tk
+            project_snapshots = self.project_registry.snapshots()
+            if change_watcher is None:
+                projects_to_check = project_snapshots
+            else:
+                monitored_projects = [
+                    project for project in project_snapshots if project.monitor_auto
+                ]
+                change_watcher.set_watched_projects(
+                    [project.path for project in monitored_projects]
+                )
+                for changed_key, item_changes in changes_by_project.items():
+                    self._apply_monitor_item_changes(changed_key, item_changes)
+                # Só projetos com mudanças (ou ainda sem tamanhos conhecidos) são verificados,
+                # além dos que têm regras de retenção: arquivos vencem sem gerar eventos
+                projects_to_check = [
+                    project
+                    for project in monitored_projects
+                    if project.key in changes_by_project
+                    or project.key not in self._monitor_item_sizes
+                    or self._has_retention_items(project)
+                ]
+
+            if self.disk_pressure_watermarks is not None:
+                self._monitor_relieve_disk_pressure()
+
+            for project in projects_to_check:
+                if self.monitoring_stop_event.is_set():
+                    self.log_message(
+                        "Monitoramento: Evento de parada detectado durante a varredura de projetos.",
+                        level="DEBUG",
+                    )
+                    break
+                self._monitor_check_project(
+                    project, use_item_cache=change_watcher is not None
+                )
+
+            self.size_index.save()
+            self.ddc_eviction_index.save()
+            self.history_store.flush()  # As amostras do ciclo em uma transação
+            if self.monitoring_stop_event.is_set():
+                break
+
+            intervalo_atual = self.AUTO_MONITOR_INTERVAL_SECONDS
+            if change_watcher is not None:
+                self.log_message(
+                    "Monitoramento: Ciclo concluído. Aguardando mudanças nas pastas de cache.",
+                    level="DEBUG",
+                )
+                self._post_monitoring_status(
+                    "Monitoramento Automático: Aguardando mudanças..."
+                )
+                changes_by_project = change_watcher.wait_for_changes(
+                    float(intervalo_atual), self.monitoring_stop_event
+                )
+                if self.monitoring_stop_event.is_set():
+                    self.log_message(
+                        "Monitoramento: Evento de parada detectado durante a espera. Saindo do loop.",
+                        level="DEBUG",
+                    )
+                    break
+                continue
+
+            if self.is_log_level_enabled("DEBUG"):
+                self.log_message(
+                    f"Monitoramento: Ciclo concluído. Aguardando {intervalo_atual}s para o próximo.",
+                    level="DEBUG",
+                )
+            self._post_monitoring_status("Monitoramento Automático: Aguardando...")
+
+            stopped_early = self.monitoring_stop_event.wait(
+                timeout=float(intervalo_atual)
+            )
+            if stopped_early:
+                self.log_message(
+                    "Monitoramento: Evento de parada detectado durante a espera. Saindo do loop.",
+                    level="DEBUG",
+                )
+                break
+
+        if change_watcher is not None:
+            change_watcher.close()
+
+        self.log_message("Thread de monitoramento automático finalizada.", level="INFO")
+
+        def update_label_to_stopped_final_from_thread():
+            self.log_message(
+                "Atualizando status da UI para 'Monitoramento Parado' (da thread do monitor).",
+                level="DEBUG",
+            )
+            if (
+                hasattr(self, "monitoring_status_label")
+                and self.monitoring_status_label.winfo_exists()
+            ):
+                self.monitoring_status_label.configure(
+                    text="Monitoramento Automático: Parado"
+                )
+            else:
+                self.log_message(
+                    "Não foi possível atualizar o label de status do monitor para 'Parado' (widget não existe?).",
+                    level="WARNING",
+                )
+            if hasattr(self, "tray_icon") and self.tray_icon and self.tray_icon.visible:
+                try:
+                    self.tray_icon.update_menu()
+                except Exception as e_update_menu:
+                    self.log_message(
+                        f"Erro ao tentar atualizar menu da bandeja após parada: {e_update_menu}",
+                        level="WARNING",
+                    )
+
+        if hasattr(self, "after"):
+            self.after(0, update_label_to_stopped_final_from_thread)
+
+        # Função interna para garantir que a atualização do label ocorra na thread principal
+        def update_label_to_stopped_final_from_thread():
+            self.log_message(
+                "Atualizando status da UI para 'Monitoramento Parado' (da thread do monitor).",
+                level="DEBUG",
+            )
+            if (
+                hasattr(self, "monitoring_status_label")
+                and self.monitoring_status_label.winfo_exists()
+            ):
+                self.monitoring_status_label.configure(
+                    text="Monitoramento Automático: Parado"
+                )
+
+            # --- ATUALIZA OS BOTÕES DA UI PRINCIPAL ---
+            if (
+                hasattr(self, "start_monitoring_button_ui")
+                and self.start_monitoring_button_ui.winfo_exists()
+            ):
+                self.start_monitoring_button_ui.configure(state="normal")
+            if (
+                hasattr(self, "stop_monitoring_button_ui")
+                and self.stop_monitoring_button_ui.winfo_exists()
+            ):
+                self.stop_monitoring_button_ui.configure(state="disabled")
+            # -----------------------------------------
+
+            if hasattr(self, "tray_icon") and self.tray_icon and self.tray_icon.visible:
+                try:
+                    self.tray_icon.update_menu()
+                except Exception as e_update_menu:
+                    self.log_message(
+                        f"Erro ao tentar atualizar menu da bandeja após parada: {e_update_menu}",
+                        level="WARNING",
+                    )
+
+        if hasattr(self, "after"):  # Garante que o método 'after' exista
+            self.after(0, update_label_to_stopped_final_from_thread)
+
+    def start_auto_monitoring(self):
+        if self.monitoring_thread and self.monitoring_thread.is_alive():
+            self.log_message("Monitoramento automático já está ativo.", level="INFO")
+            return
+
+        self.log_message("Iniciando monitoramento automático...", level="INFO")
+        self.monitoring_stop_event.clear()
+        self.monitoring_thread = threading.Thread(target=self._auto_monitoring_loop)
+        self.monitoring_thread.daemon = True
+        self.monitoring_thread.start()
+
+        # Atualiza status e botões na UI principal
+        if (
+            hasattr(self, "monitoring_status_label")
+            and self.monitoring_status_label.winfo_exists()
+        ):
+            self.monitoring_status_label.configure(
+                text="Monitoramento Automático: Ativo"
+            )
+        if (
+            hasattr(self, "start_monitoring_button_ui")
+            and self.start_monitoring_button_ui.winfo_exists()
+        ):
+            self.start_monitoring_button_ui.configure(state="disabled")
+        if (
+            hasattr(self, "stop_monitoring_button_ui")
+            and self.stop_monitoring_button_ui.winfo_exists()
+        ):
+            self.stop_monitoring_button_ui.configure(state="normal")
+
+        self.log_message(
+            "Controles da UI de monitoramento atualizados para 'Ativo'.", level="DEBUG"
+        )
+
+        # Atualiza menu da bandeja (se existir)
+        if (
+            hasattr(self, "tray_icon")
+            and self.tray_icon
+            and hasattr(self.tray_icon, "update_menu")
+            and self.tray_icon.visible
+        ):
+            try:
+                self.tray_icon.update_menu()
+            except Exception as e_update_menu:
+                self.log_message(
+                    f"Erro ao tentar atualizar menu da bandeja em start_auto_monitoring: {e_update_menu}",
+                    level="WARNING",
+                )
+
+    def stop_auto_monitoring(self):
+        if self.monitoring_thread and self.monitoring_thread.is_alive():
+            self.log_message(
+                "UI: Solicitando parada do monitoramento automático...", level="INFO"
+            )
+            if (
+                hasattr(self, "monitoring_status_label")
+                and self.monitoring_status_label.winfo_exists()
+            ):
+                self.monitoring_status_label.configure(
+                    text="Monitoramento Automático: Parando..."
+                )
+            # Não mexemos nos botões start/stop aqui, pois a thread _auto_monitoring_loop o fará ao terminar.
+            self.monitoring_stop_event.set()
+        else:
+            self.log_message(
+                "UI: Monitoramento não estava ativo ou já foi explicitamente parado.",
+                level="DEBUG",
+            )
+            if (
+                hasattr(self, "monitoring_status_label")
+                and self.monitoring_status_label.winfo_exists()
+            ):
+                self.monitoring_status_label.configure(
+                    text="Monitoramento Automático: Parado"
+                )
+            if (
+                hasattr(self, "start_monitoring_button_ui")
+                and self.start_monitoring_button_ui.winfo_exists()
+            ):
+                self.start_monitoring_button_ui.configure(state="normal")
+            if (
+                hasattr(self, "stop_monitoring_button_ui")
+                and self.stop_monitoring_button_ui.winfo_exists()
+            ):
+                self.stop_monitoring_button_ui.configure(state="disabled")
+
+            # Atualiza menu da bandeja (se existir)
+            if (
+                hasattr(self, "tray_icon")
+                and self.tray_icon
+                and hasattr(self.tray_icon, "update_menu")
+                and self.tray_icon.visible
+            ):
+                try:
+                    self.tray_icon.update_menu()
+                except Exception as e_update_menu:
+                    self.log_message(
+                        f"Erro ao tentar atualizar menu da bandeja em stop_auto_monitoring (else): {e_update_menu}",
+                        level="WARNING",
+                    )
+
+    def on_closing(self):
+        print("UI: Fechando aplicação...")
+        self.save_app_data(immediate=True)  # Salva os dados antes de fechar
+        self.stop_auto_monitoring()
+        if self.monitoring_thread and self.monitoring_thread.is_alive():
+            print("UI: Aguardando thread de monitoramento finalizar antes de fechar...")
+            self.monitoring_thread.join(timeout=5)
+        self._stop_cleaning_pipeline()
+        self.history_store.close()
+        self._write_console_log(self._take_log_entries())
+        self.destroy()
+
+
+def run_gui():
+    app = App()
+    app.mainloop()
+    return 0
@@ -0,0 +1,375 @@
+"""
+Histórico de análises e limpezas em SQLite, ao lado do arquivo de configuração.
+
+Cada análise grava uma amostra por item selecionado e uma do projeto inteiro (item_id ""),
+com bytes, quantidade de arquivos e duração (arquivos fica NULL quando o tamanho do item veio
+do acompanhamento por eventos do monitoramento, sem varredura).
+Cada limpeza grava os bytes liberados, os erros e a duração. As gravações ficam em memória
+e vão para o banco em lote (uma transação) a cada HISTORY_BATCH_SIZE registros ou em
+flush(), chamado pelo monitoramento ao fim de cada ciclo. O banco usa write-ahead logging
+(WAL): leituras não esperam as gravações da thread do monitoramento.
+
+Para o banco não crescer sem limite com o monitoramento a cada minuto, as amostras antigas
+são reduzidas (HISTORY_DOWNSAMPLE_POLICY): depois de 2 dias fica só a última amostra de
+cada hora e, depois de 30 dias, a última de cada dia; amostras e limpezas com mais de
+HISTORY_MAX_AGE_SECONDS são apagadas.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from .registry import project_key
+
+HISTORY_BATCH_SIZE = 200
+HISTORY_MAX_AGE_SECONDS = 365 * 86400
+# (idade mínima da amostra, tamanho do balde em segundos), da mais recente para a mais antiga
+HISTORY_DOWNSAMPLE_POLICY = ((2 * 86400, 3600), (30 * 86400, 86400))
+HISTORY_DOWNSAMPLE_INTERVAL_SECONDS = 3600  # Frequência com que flush() aplica a política
+PROJECT_TOTAL_ITEM_ID = ""  # item_id das amostras do projeto inteiro
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scan_samples (
+    project_key TEXT NOT NULL,
+    project_path TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    sampled_at REAL NOT NULL,
+    bytes INTEGER NOT NULL,
+    file_count INTEGER,
+    duration_seconds REAL,
+    bucket_seconds INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS scan_samples_by_item
+    ON scan_samples (project_key, item_id, sampled_at);
+CREATE INDEX IF NOT EXISTS scan_samples_by_time ON scan_samples (sampled_at);
+CREATE TABLE IF NOT EXISTS cleanups (
+    project_key TEXT NOT NULL,
+    project_path TEXT NOT NULL,
+    cleaned_at REAL NOT NULL,
+    items TEXT NOT NULL,
+    bytes_freed INTEGER NOT NULL,
+    error_count INTEGER NOT NULL,
+    duration_seconds REAL,
+    trigger TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cleanups_by_project ON cleanups (project_key, cleaned_at);
+"""
+
+
+def _growth_from_samples(samples):
+    """
+    Crescimento em bytes/dia de uma série [(sampled_at, bytes), ...] em ordem de tempo.
+    Só as altas entre amostras seguidas contam: a queda de uma limpeza não vira
+    "crescimento negativo". None com menos de duas amostras.
+    """
+    if len(samples) < 2:
+        return None
+    elapsed_days = (samples[-1][0] - samples[0][0]) / 86400
+    if elapsed_days <= 0:
+        return None
+    bytes_grown = sum(
+        max(0, current[1] - previous[1])
+        for previous, current in zip(samples, samples[1:])
+    )
+    return bytes_grown / elapsed_days
+
+
+class ScanHistoryStore:
+    """
+    Histórico persistente de análises e limpezas (ver o topo do módulo). Seguro entre
+    threads: record_* só enfileiram; flush() grava o lote em uma transação.
+    """
+
+    def __init__(self, db_path, batch_size=HISTORY_BATCH_SIZE):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._connection = None
+        self._pending_samples = []
+        self._pending_cleanups = []
+        self._last_downsample_at = 0.0
+        self._closed = False
+        self._lock = threading.Lock()  # Protege as listas pendentes
+        self._db_lock = threading.Lock()  # Uma conexão, usada por uma thread de cada vez
+
+    def _connect(self):
+        """
+        Abre o banco (chamado com _db_lock). Retorna None se não for possível ou se o
+        histórico já foi fechado: nada reabre uma conexão depois de close().
+        """
+        if self._closed:
+            return None
+        if self._connection is None:
+            try:
+                connection = sqlite3.connect(
+                    self.db_path, timeout=10, check_same_thread=False
+                )
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.executescript(_SCHEMA)
+                self._connection = connection
+            except sqlite3.Error as e:
+                print(f"HISTORY: Erro ao abrir '{self.db_path}': {e}")
+                return None
+        return self._connection
+
+    def close(self):
+        """Grava o pendente e fecha o banco; gravações posteriores são descartadas."""
+        self.flush()
+        with self._db_lock:
+            self._closed = True
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def record_scan(
+        self, project_path, item_sizes, duration_seconds=None, item_file_counts=None
+    ):
+        """
+        Enfileira uma análise: uma amostra por item de 'item_sizes' ({item_id: bytes}) e uma
+        do projeto inteiro, com a soma. 'item_file_counts' ({item_id: arquivos}) é opcional.
+        """
+        sampled_at = time.time()
+        key = project_key(project_path)
+        item_file_counts = item_file_counts or {}
+        rows = [
+            (
+                key,
+                project_path,
+                item_id,
+                sampled_at,
+                item_bytes,
+                item_file_counts.get(item_id),
+                duration_seconds,
+            )
+            for item_id, item_bytes in item_sizes.items()
+        ]
+        total_file_count = (
+            sum(item_file_counts.values())
+            if item_file_counts and len(item_file_counts) == len(item_sizes)
+            else None
+        )
+        rows.append(
+            (
+                key,
+                project_path,
+                PROJECT_TOTAL_ITEM_ID,
+                sampled_at,
+                sum(item_sizes.values()),
+                total_file_count,
+                duration_seconds,
+            )
+        )
+        self._enqueue(samples=rows)
+
+    def record_cleanup(
+        self,
+        project_path,
+        items,
+        bytes_freed,
+        error_count,
+        duration_seconds=None,
+        trigger="manual",
+    ):
+        """
+        Enfileira uma limpeza. 'trigger': "manual", "auto" (Limite GB), "pressure",
+        "retention" (passada das regras de retenção do monitoramento) ou "purge" (bytes
+        recuperados pelo purgador do modo "staged", depois da limpeza que moveu as pastas).
+        """
+        row = (
+            project_key(project_path),
+            project_path,
+            time.time(),
+            json.dumps(list(items)),
+            bytes_freed,
+            error_count,
+            duration_seconds,
+            trigger,
+        )
+        self._enqueue(cleanups=[row])
+
+    def _enqueue(self, samples=(), cleanups=()):
+        if self._closed:
+            return
+        with self._lock:
+            self._pending_samples.extend(samples)
+            self._pending_cleanups.extend(cleanups)
+            batch_full = (
+                len(self._pending_samples) + len(self._pending_cleanups)
+                >= self.batch_size
+            )
+        if batch_full:
+            self.flush()
+
+    def flush(self):
+        """
+        Grava os pendentes em uma transação; de hora em hora, reduz as amostras antigas em
+        outra. Se a gravação falhar (ex: banco bloqueado), os registros voltam para o início
+        da fila e vão na próxima vez.
+        """
+        with self._lock:
+            samples, self._pending_samples = self._pending_samples, []
+            cleanups, self._pending_cleanups = self._pending_cleanups, []
+        now = time.time()
+        with self._db_lock:
+            connection = self._connect()
+            if connection is None:
+                return False
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO scan_samples (project_key, project_path, item_id,"
+                        " sampled_at, bytes, file_count, duration_seconds)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        samples,
+                    )
+                    connection.executemany(
+                        "INSERT INTO cleanups (project_key, project_path, cleaned_at,"
+                        " items, bytes_freed, error_count, duration_seconds, trigger)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        cleanups,
+                    )
+            except sqlite3.Error as e:
+                print(f"HISTORY: Erro ao gravar em '{self.db_path}': {e}")
+                with self._lock:
+                    self._pending_samples[:0] = samples
+                    self._pending_cleanups[:0] = cleanups
+                return False
+            if now - self._last_downsample_at >= HISTORY_DOWNSAMPLE_INTERVAL_SECONDS:
+                # Transação separada: uma falha aqui não desfaz as inserções acima
+                self._last_downsample_at = now
+                try:
+                    with connection:
+                        self._downsample_locked(connection, now)
+                except sqlite3.Error as e:
+                    print(f"HISTORY: Erro ao reduzir '{self.db_path}': {e}")
+        return True
+
+    def downsample(self, now=None):
+        """Aplica agora a política de redução e de idade máxima (ver o topo do módulo)."""
+        self.flush()
+        if now is None:
+            now = time.time()
+        with self._db_lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                with connection:
+                    self._downsample_locked(connection, now)
+            except sqlite3.Error as e:
+                print(f"HISTORY: Erro ao reduzir '{self.db_path}': {e}")
+
+    @staticmethod
+    def _downsample_locked(connection, now):
+        connection.execute(
+            "DELETE FROM scan_samples WHERE sampled_at < ?",
+            (now - HISTORY_MAX_AGE_SECONDS,),
+        )
+        connection.execute(
+            "DELETE FROM cleanups WHERE cleaned_at < ?",
+            (now - HISTORY_MAX_AGE_SECONDS,),
+        )
+        for min_age_seconds, bucket_seconds in HISTORY_DOWNSAMPLE_POLICY:
+            cutoff = now - min_age_seconds
+            # No SQLite, as colunas soltas de um SELECT com MAX() vêm da linha do máximo:
+            # cada balde vira a sua última amostra
+            connection.execute(
+                "CREATE TEMP TABLE downsampled AS"
+                " SELECT project_key, project_path, item_id, MAX(sampled_at) AS sampled_at,"
+                " bytes, file_count, AVG(duration_seconds) AS duration_seconds"
+                " FROM scan_samples WHERE sampled_at < ? AND bucket_seconds < ?"
+                " GROUP BY project_key, item_id, CAST(sampled_at / ? AS INTEGER)",
+                (cutoff, bucket_seconds, bucket_seconds),
+            )
+            connection.execute(
+                "DELETE FROM scan_samples WHERE sampled_at < ? AND bucket_seconds < ?",
+                (cutoff, bucket_seconds),
+            )
+            connection.execute(
+                "INSERT INTO scan_samples (project_key, project_path, item_id, sampled_at,"
+                " bytes, file_count, duration_seconds, bucket_seconds)"
+                " SELECT project_key, project_path, item_id, sampled_at, bytes,"
+                " file_count, duration_seconds, ? FROM downsampled",
+                (bucket_seconds,),
+            )
+            connection.execute("DROP TABLE downsampled")
+
+    def _query(self, sql, parameters=()):
+        self.flush()
+        with self._db_lock:
+            connection = self._connect()
+            if connection is None:
+                return []
+            try:
+                return connection.execute(sql, parameters).fetchall()
+            except sqlite3.Error as e:
+                print(f"HISTORY: Erro ao consultar '{self.db_path}': {e}")
+                return []
+
+    def growth_per_day(self, project_path, item_id=PROJECT_TOTAL_ITEM_ID, days=30):
+        """
+        Crescimento médio em bytes/dia de um item (ou do projeto inteiro) nos últimos 'days'
+        dias, somando só as altas entre amostras seguidas. None sem amostras suficientes.
+        """
+        samples = self._query(
+            "SELECT sampled_at, bytes FROM scan_samples"
+            " WHERE project_key = ? AND item_id = ? AND sampled_at >= ?"
+            " ORDER BY sampled_at",
+            (project_key(project_path), item_id, time.time() - days * 86400),
+        )
+        return _growth_from_samples(samples)
+
+    def top_offenders(self, days=7, limit=10):
+        """
+        Os itens que mais cresceram nos últimos 'days' dias, do maior para o menor:
+        [{"project_path", "item_id", "growth_per_day", "latest_bytes"}, ...].
+        """
+        rows = self._query(
+            "SELECT project_key, project_path, item_id, sampled_at, bytes"
+            " FROM scan_samples WHERE item_id != ? AND sampled_at >= ?"
+            " ORDER BY project_key, item_id, sampled_at",
+            (PROJECT_TOTAL_ITEM_ID, time.time() - days * 86400),
+        )
+        series = {}
+        for key, path, item_id, sampled_at, item_bytes in rows:
+            entry = series.setdefault((key, item_id), {"path": path, "samples": []})
+            entry["path"] = path  # O caminho mais recente do projeto
+            entry["samples"].append((sampled_at, item_bytes))
+        offenders = []
+        for (_, item_id), entry in series.items():
+            growth = _growth_from_samples(entry["samples"])
+            if growth:
+                offenders.append(
+                    {
+                        "project_path": entry["path"],
+                        "item_id": item_id,
+                        "growth_per_day": growth,
+                        "latest_bytes": entry["samples"][-1][1],
+                    }
+                )
+        offenders.sort(key=lambda offender: offender["growth_per_day"], reverse=True)
+        return offenders[:limit]
+
+    def cleanup_totals(self, days=30):
+        """
+        Limpezas dos últimos 'days' dias por projeto, da que mais liberou para a que menos:
+        [{"project_path", "cleanups", "bytes_freed", "error_count"}, ...].
+        Os registros "purge" somam bytes à limpeza que moveu as pastas, sem contar como outra.
+        """
+        rows = self._query(
+            "SELECT MAX(project_path), SUM(trigger != 'purge'), SUM(bytes_freed),"
+            " SUM(error_count)"
+            " FROM cleanups WHERE cleaned_at >= ?"
+            " GROUP BY project_key ORDER BY SUM(bytes_freed) DESC",
+            (time.time() - days * 86400,),
+        )
+        return [
+            {
+                "project_path": path,
+                "cleanups": count,
+                "bytes_freed": bytes_freed,
+                "error_count": error_count,
+            }
+            for path, count, bytes_freed, error_count in rows
+        ]
@@ -0,0 +1,69 @@
+"""
+Protocolo de log do backend.
+
+As funções de backend recebem um 'logger': qualquer objeto com
+log_message(mensagem, level="INFO"). A App (interface gráfica) é um logger; na CLI
+e nos benchmarks são usados ConsoleLogger e NullLogger. Opcionalmente o logger pode
+ter is_log_level_enabled(level), usado para pular mensagens caras já filtradas.
+"""
+
+import sys
+import threading
+import time
+
+# Ordem dos níveis de log; mensagens abaixo de 'log_level' (configuração) são descartadas
+# antes de qualquer formatação. Níveis desconhecidos contam como INFO.
+LOG_LEVEL_ORDER = {
+    "TRACE": 5,
+    "DEBUG": 10,
+    "INFO": 20,
+    "ACTION": 25,
+    "SUCCESS": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+DEFAULT_LOG_LEVEL = "INFO"
+
+
+def log_level_enabled(logger, level):
+    """
+    Indica se 'logger' registraria mensagens de 'level'. Permite pular a montagem de
+    mensagens caras (TRACE/DEBUG em laços) quando o nível está filtrado.
+    """
+    is_enabled = getattr(logger, "is_log_level_enabled", None)
+    return is_enabled is None or is_enabled(level)
+
+
+class ConsoleLogger:
+    """Escreve as mensagens a partir de 'level' em um stream (stderr por padrão)."""
+
+    def __init__(self, level=DEFAULT_LOG_LEVEL, stream=None):
+        level = str(level).upper()
+        if level not in LOG_LEVEL_ORDER:
+            raise ValueError(f"Nível de log desconhecido: '{level}'")
+        self.level = level
+        self._threshold = LOG_LEVEL_ORDER[level]
+        self.stream = stream if stream is not None else sys.stderr
+        self._lock = threading.Lock()
+
+    def is_log_level_enabled(self, level):
+        return LOG_LEVEL_ORDER.get(level, LOG_LEVEL_ORDER["INFO"]) >= self._threshold
+
+    def log_message(self, message, level="INFO"):
+        if not self.is_log_level_enabled(level):
+            return
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+        with self._lock:
+            self.stream.write(f"[{timestamp}] [{level}] {message}\n")
+            self.stream.flush()
+
+
+class NullLogger:
+    """Descarta todas as mensagens."""
+
+    def is_log_level_enabled(self, level):
+        return False
+
+    def log_message(self, message, level="INFO"):
+        pass
@@ -0,0 +1,159 @@
+"""
+Limpeza disparada por falta de espaço em disco.
+
+Em vez de medir as árvores de todos os projetos, consulta o espaço livre de cada volume que
+tem projetos (psutil.disk_usage: uma chamada por volume, barata perto de uma varredura). Só
+quando o livre de um volume cai abaixo do limite os projetos dele são medidos, ordenados
+pelos bytes recuperáveis dos itens selecionados e limpos, do maior para o menor, até o livre
+voltar ao alvo. Volumes com espaço de sobra nunca disparam varreduras.
+"""
+
+import psutil
+
+from .cleaning import get_volume_key
+from .sizes import format_size
+
+
+def get_disk_pressure_watermarks(settings, logger):
+    """
+    (limite_bytes, alvo_bytes) a partir de "disk_pressure_low_free_gb" e
+    "disk_pressure_target_free_gb" das configurações, ou None se o modo estiver desligado.
+    Sem alvo (ou alvo menor que o limite), o alvo é o próprio limite.
+    """
+    low_free_gb = settings.get("disk_pressure_low_free_gb")
+    if low_free_gb in (None, ""):
+        return None
+    try:
+        low_free_bytes = int(float(low_free_gb) * (1024**3))
+    except (TypeError, ValueError):
+        low_free_bytes = -1
+    if low_free_bytes <= 0:
+        logger.log_message(
+            f"PRESSURE: Valor inválido para 'disk_pressure_low_free_gb': '{low_free_gb}'. Modo por espaço livre desligado.",
+            level="WARNING",
+        )
+        return None
+
+    target_free_gb = settings.get("disk_pressure_target_free_gb")
+    target_free_bytes = low_free_bytes
+    if target_free_gb not in (None, ""):
+        try:
+            target_free_bytes = int(float(target_free_gb) * (1024**3))
+        except (TypeError, ValueError):
+            target_free_bytes = -1
+        if target_free_bytes < low_free_bytes:
+            logger.log_message(
+                f"PRESSURE: 'disk_pressure_target_free_gb' ('{target_free_gb}') inválido ou menor que o limite. Usando o limite como alvo.",
+                level="WARNING",
+            )
+            target_free_bytes = low_free_bytes
+    return low_free_bytes, target_free_bytes
+
+
+def get_pressured_volumes(project_paths, low_free_bytes):
+    """
+    Agrupa os caminhos por volume e consulta o espaço livre de cada volume uma única vez.
+    Retorna {volume: {"paths", "free", "total"}} só dos volumes com menos de 'low_free_bytes' livres.
+    """
+    paths_by_volume = {}
+    for path in project_paths:
+        paths_by_volume.setdefault(get_volume_key(path), []).append(path)
+    pressured = {}
+    for volume_key, paths in paths_by_volume.items():
+        try:
+            usage = psutil.disk_usage(paths[0])
+        except OSError:
+            continue  # Projeto em um volume desmontado ou removido
+        if usage.free < low_free_bytes:
+            pressured[volume_key] = {
+                "paths": paths,
+                "free": usage.free,
+                "total": usage.total,
+            }
+    return pressured
+
+
+def relieve_disk_pressure(
+    projects,
+    low_free_bytes,
+    target_free_bytes,
+    logger,
+    measure_reclaimable,
+    clean_project,
+    stop_event=None,
+):
+    """
+    Limpa projetos dos volumes abaixo de 'low_free_bytes' até o livre chegar a 'target_free_bytes'.
+
+    'projects': lista de dicts com pelo menos "path" e "name".
+    'measure_reclaimable(projeto)': bytes recuperáveis dos itens selecionados (varredura).
+    'clean_project(projeto, bytes_recuperaveis)': limpa e retorna os bytes liberados, ou None
+        se o projeto foi pulado (ex: aberto no editor).
+
+    O alívio de cada limpeza é o maior entre os bytes retornados e o aumento do livre medido
+    no volume. Retorna uma lista de resumos por volume:
+        {"volume", "free_before", "free_after", "bytes_needed", "bytes_freed", "projects_cleaned"}
+    """
+    projects_by_path = {project["path"]: project for project in projects}
+    pressured_volumes = get_pressured_volumes(projects_by_path, low_free_bytes)
+    summaries = []
+    for volume_key, volume in pressured_volumes.items():
+        bytes_needed = target_free_bytes - volume["free"]
+        logger.log_message(
+            f"PRESSURE: Volume '{volume_key}' com {format_size(volume['free'])} livres "
+            f"(limite {format_size(low_free_bytes)}). Liberando {format_size(bytes_needed)} "
+            f"entre {len(volume['paths'])} projeto(s)...",
+            level="WARNING",
+        )
+        reclaimable_by_path = {}
+        for path in volume["paths"]:
+            if stop_event is not None and stop_event.is_set():
+                return summaries
+            reclaimable_by_path[path] = measure_reclaimable(projects_by_path[path])
+        ranked_paths = sorted(
+            (path for path, size in reclaimable_by_path.items() if size > 0),
+            key=lambda path: reclaimable_by_path[path],
+            reverse=True,
+        )
+
+        bytes_freed = 0
+        free_after = volume["free"]
+        projects_cleaned = []
+        for path in ranked_paths:
+            if bytes_freed >= bytes_needed or (
+                stop_event is not None and stop_event.is_set()
+            ):
+                break
+            project = projects_by_path[path]
+            freed = clean_project(project, reclaimable_by_path[path])
+            if freed is None:
+                continue
+            try:
+                free_after = psutil.disk_usage(path).free
+            except OSError:
+                pass
+            bytes_freed = max(bytes_freed + freed, free_after - volume["free"])
+            projects_cleaned.append(project["name"])
+            logger.log_message(
+                f"PRESSURE: '{project['name']}' limpo ({format_size(freed)}). "
+                f"Livre em '{volume_key}': {format_size(free_after)}.",
+                level="INFO",
+            )
+
+        level = "SUCCESS" if bytes_freed >= bytes_needed else "WARNING"
+        logger.log_message(
+            f"PRESSURE: Volume '{volume_key}': {format_size(bytes_freed)} liberados de "
+            f"{format_size(bytes_needed)} necessários ({len(projects_cleaned)} projeto(s) limpo(s)).",
+            level=level,
+        )
+        summaries.append(
+            {
+                "volume": volume_key,
+                "free_before": volume["free"],
+                "free_after": free_after,
+                "bytes_needed": bytes_needed,
+                "bytes_freed": bytes_freed,
+                "projects_cleaned": projects_cleaned,
+            }
+        )
+    return summaries
@@ -0,0 +1,138 @@
+"""
+Modo de prioridade baixa para o trabalho em segundo plano (monitoramento, purgador).
+
+Uma thread marcada como "de segundo plano" tem a prioridade de CPU e de E/S reduzida onde o
+sistema permite (Windows: THREAD_MODE_BACKGROUND_BEGIN; Linux: nice 19 e classe de E/S
+"idle" via psutil) e passa pelo limitador de operações de arquivo por segundo, se houver
+um configurado. As tarefas disparadas pelo usuário rodam em threads normais, que nunca são
+marcadas, e os pools de varredura e de deleção têm uma versão separada para o segundo plano.
+"""
+
+import ctypes
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import psutil
+
+# Padrões das configurações "background_priority" e "background_max_file_ops_per_second"
+# (0 = sem limite de operações de arquivo por segundo)
+DEFAULT_BACKGROUND_PRIORITY = True
+DEFAULT_BACKGROUND_MAX_FILE_OPS_PER_SECOND = 0
+
+_THREAD_MODE_BACKGROUND_BEGIN = 0x00010000  # SetThreadPriority (Windows): CPU e E/S em segundo plano
+_THREAD_MODE_BACKGROUND_END = 0x00020000
+_LINUX_BACKGROUND_NICE = 19
+
+_thread_state = threading.local()
+_file_operation_limiter = None
+
+
+class FileOperationRateLimiter:
+    """
+    Balde de fichas (token bucket) compartilhado entre threads: no máximo
+    'operations_per_second' operações de arquivo por segundo, com rajadas de até um segundo.
+    Quem passa do limite dorme o tempo que falta para as fichas que pegou.
+    """
+
+    def __init__(self, operations_per_second):
+        self.operations_per_second = float(operations_per_second)
+        self.capacity = max(1.0, self.operations_per_second)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, count=1):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated_at) * self.operations_per_second,
+            )
+            self._updated_at = now
+            self._tokens -= count
+            deficit = -self._tokens
+        if deficit > 0:
+            time.sleep(deficit / self.operations_per_second)
+
+
+def configure_file_operation_rate_limit(operations_per_second):
+    """Define o limite de operações de arquivo por segundo do segundo plano (0/None = sem limite)."""
+    global _file_operation_limiter
+    if operations_per_second:
+        _file_operation_limiter = FileOperationRateLimiter(operations_per_second)
+    else:
+        _file_operation_limiter = None
+
+
+def is_background_thread():
+    return getattr(_thread_state, "background", False)
+
+
+def throttle_file_operations(count=1):
+    """Chamado antes de 'count' operações de arquivo; só espera em threads de segundo plano."""
+    limiter = _file_operation_limiter
+    if limiter is not None and count > 0 and getattr(_thread_state, "background", False):
+        limiter.acquire(count)
+
+
+def lower_current_thread_priority():
+    """Baixa a prioridade de CPU e de E/S da thread atual. Falhas são ignoradas."""
+    try:
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(
+                kernel32.GetCurrentThread(), _THREAD_MODE_BACKGROUND_BEGIN
+            )
+        elif sys.platform.startswith("linux"):
+            # No Linux nice e ioprio valem por thread quando se passa o id nativo
+            thread_id = threading.get_native_id()
+            os.setpriority(os.PRIO_PROCESS, thread_id, _LINUX_BACKGROUND_NICE)
+            psutil.Process(thread_id).ionice(psutil.IOPRIO_CLASS_IDLE)
+    except (AttributeError, OSError, psutil.Error):
+        pass
+
+
+def _restore_current_thread_priority(previous_nice):
+    """Volta a prioridade da thread ao normal (no Linux, sem privilégio, só a de E/S volta)."""
+    try:
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(
+                kernel32.GetCurrentThread(), _THREAD_MODE_BACKGROUND_END
+            )
+        elif sys.platform.startswith("linux"):
+            thread_id = threading.get_native_id()
+            psutil.Process(thread_id).ionice(psutil.IOPRIO_CLASS_NONE)
+            os.setpriority(os.PRIO_PROCESS, thread_id, previous_nice)
+    except (AttributeError, OSError, psutil.Error):
+        pass
+
+
+def enter_background_thread():
+    """Marca a thread atual como de segundo plano para sempre (inicializador de pools e do purgador)."""
+    _thread_state.background = True
+    lower_current_thread_priority()
+
+
+@contextmanager
+def background_priority(enabled=True):
+    """Roda o bloco como segundo plano na thread atual e depois volta ao normal."""
+    if not enabled or is_background_thread():
+        yield
+        return
+    previous_nice = 0
+    if sys.platform.startswith("linux"):
+        try:
+            previous_nice = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+        except OSError:
+            pass
+    _thread_state.background = True
+    lower_current_thread_priority()
+    try:
+        yield
+    finally:
+        _thread_state.background = False
+        _restore_current_thread_priority(previous_nice)
@@ -0,0 +1,162 @@
+"""Detecção de projetos abertos em editores Unreal a partir da tabela de processos."""
+
+import os
+import threading
+import time
+
+import psutil
+
+from .discovery import find_uproject_file
+
+
+UNREAL_EDITOR_EXECUTABLES = ("UE4Editor.exe", "UE5Editor.exe", "UnrealEditor.exe")
+# Por quanto tempo uma foto da tabela de processos é reaproveitada por chamadas seguidas.
+OPEN_EDITOR_SNAPSHOT_TTL_SECONDS = 2.0
+
+
+def get_project_uproject_path(project_data):
+    """Caminho completo do .uproject a partir dos dados salvos do projeto (ou None se desconhecido)."""
+    project_path = project_data.get("path")
+    uproject_file = project_data.get("uproject_file")
+    if project_path and uproject_file:
+        return os.path.join(project_path, uproject_file)
+    return None
+
+
+# Intervalo entre revalidações completas do rastreador (create_time de todos os PIDs conhecidos),
+# que detectam PIDs reaproveitados por processos novos.
+PROCESS_TRACKER_FULL_REVALIDATION_SECONDS = 300
+
+
+class EditorProcessTracker:
+    """
+    Rastreia incrementalmente quais processos são editores Unreal e quais .uproject eles abriram.
+
+    Cada PID já classificado fica guardado com seu create_time; uma atualização só lê nome e
+    linha de comando dos PIDs novos e descarta os que terminaram. O custo em regime é
+    proporcional à rotatividade de processos, não ao total de processos.
+    Os PIDs de editores têm o create_time conferido a cada atualização; os demais, apenas nas
+    revalidações completas periódicas.
+    """
+
+    def __init__(
+        self, full_revalidation_seconds=PROCESS_TRACKER_FULL_REVALIDATION_SECONDS
+    ):
+        self.full_revalidation_seconds = full_revalidation_seconds
+        # pid -> (create_time, frozenset de .uproject normalizados ou None se não for editor)
+        self._classified = {}
+        self._last_full_revalidation = None
+
+    @staticmethod
+    def _classify(pid):
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            create_time = proc.create_time()
+            if proc.name() not in UNREAL_EDITOR_EXECUTABLES:
+                return create_time, None
+            cmdline = proc.cmdline()
+        return create_time, frozenset(
+            OpenEditorIndex.normalize_path(arg)
+            for arg in cmdline or []
+            if arg.strip('"').lower().endswith(".uproject")
+        )
+
+    def _is_same_process(self, pid, create_time):
+        try:
+            return psutil.Process(pid).create_time() == create_time
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+    def refresh(self):
+        """Atualiza o rastreador e retorna o conjunto de .uproject abertos em editores."""
+        current_pids = set(psutil.pids())
+        for pid in set(self._classified) - current_pids:
+            del self._classified[pid]  # Processo terminou
+
+        now = time.monotonic()
+        full_revalidation = (
+            self._last_full_revalidation is None
+            or now - self._last_full_revalidation >= self.full_revalidation_seconds
+        )
+        if full_revalidation:
+            self._last_full_revalidation = now
+        for pid, (create_time, uproject_paths) in list(self._classified.items()):
+            if (full_revalidation or uproject_paths is not None) and not (
+                self._is_same_process(pid, create_time)
+            ):
+                del self._classified[pid]  # PID reaproveitado: será classificado de novo
+
+        for pid in current_pids - set(self._classified):
+            try:
+                self._classified[pid] = self._classify(pid)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                continue  # Terminou entre a listagem e a leitura
+            except psutil.AccessDenied:
+                # Sem acesso (processo de sistema): tratado como não-editor até a próxima revalidação completa
+                self._classified[pid] = (None, None)
+
+        open_uproject_paths = set()
+        for _, uproject_paths in self._classified.values():
+            if uproject_paths:
+                open_uproject_paths.update(uproject_paths)
+        return frozenset(open_uproject_paths)
+
+
+class OpenEditorIndex:
+    """
+    Conjunto dos arquivos .uproject abertos em editores Unreal, obtido de UMA atualização do
+    EditorProcessTracker. A foto é reaproveitada por 'ttl_seconds', então verificar vários
+    projetos em sequência (monitoramento, limpeza global) custa uma atualização, e cada projeto
+    é uma consulta O(1) ao conjunto.
+    """
+
+    def __init__(self, ttl_seconds=OPEN_EDITOR_SNAPSHOT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._open_uproject_paths = frozenset()
+        self._taken_at = None
+        self._process_tracker = EditorProcessTracker()
+
+    @staticmethod
+    def normalize_path(path):
+        return os.path.normcase(os.path.normpath(path.strip('"')))
+
+    def snapshot(self):
+        """Conjunto normalizado dos .uproject abertos, relendo a tabela de processos se a foto expirou."""
+        with self._lock:
+            now = time.monotonic()
+            if self._taken_at is None or now - self._taken_at >= self.ttl_seconds:
+                self._open_uproject_paths = self._process_tracker.refresh()
+                self._taken_at = time.monotonic()
+            return self._open_uproject_paths
+
+    def invalidate(self):
+        with self._lock:
+            self._taken_at = None
+
+    def is_project_open(self, uproject_file_path):
+        return self.normalize_path(uproject_file_path) in self.snapshot()
+
+
+_default_open_editor_index = OpenEditorIndex()
+
+
+def is_unreal_project_open(project_root_path, editor_index=None, uproject_file_path=None):
+    """
+    Verifica se um projeto Unreal específico está aberto em algum editor.
+    project_root_path: O caminho para a pasta raiz do projeto.
+    editor_index: OpenEditorIndex compartilhado (usa um índice do módulo se omitido).
+    uproject_file_path: caminho do .uproject já conhecido (evita listar a pasta do projeto).
+    """
+    if not uproject_file_path or not os.path.isfile(uproject_file_path):
+        uproject_file_path = find_uproject_file(project_root_path)
+    if not uproject_file_path:
+        print(f"Backend (is_open): .uproject não encontrado em {project_root_path}")
+        return False  # Não pode determinar se não achar o .uproject
+
+    if editor_index is None:
+        editor_index = _default_open_editor_index
+    if editor_index.is_project_open(uproject_file_path):
+        print(f"Backend (is_open): Projeto {uproject_file_path} está ABERTO.")
+        return True
+    return False
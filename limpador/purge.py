@@ -0,0 +1,319 @@
+"""
+Modo de deleção "renomear e purgar".
+
+Cada subpasta selecionada é renomeada (operação atômica, no mesmo volume) para uma pasta de
+preparo (staging) e o projeto fica limpo do ponto de vista da Unreal na hora. Um purgador em
+segundo plano, com prioridade baixa, apaga depois as árvores movidas. Um diário (journal) em
+JSON registra cada árvore antes do rename, então purgas interrompidas (fechar o programa,
+queda de energia) são retomadas na próxima inicialização.
+"""
+
+import ctypes
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from .deletion import delete_tree
+from .priority import enter_background_thread
+from .sizes import format_size
+
+DELETION_MODE_DIRECT = "direct"
+DELETION_MODE_STAGED = "staged"
+DELETION_MODES = (DELETION_MODE_DIRECT, DELETION_MODE_STAGED)
+DEFAULT_DELETION_MODE = DELETION_MODE_DIRECT
+
+# Pasta de preparo criada na raiz do volume (ou, sem permissão, na raiz do projeto)
+PURGE_STAGING_DIR_NAME = ".limpador_purge"
+# O purgador reporta os bytes liberados a cada PURGE_PROGRESS_REPORT_BYTES (e ao fim de cada árvore)
+PURGE_PROGRESS_REPORT_BYTES = 64 * 1024 * 1024
+
+_FILE_ATTRIBUTE_HIDDEN = 0x2
+
+
+def find_mount_root(path):
+    """Raiz do volume que contém 'path' (ex: "C:\\" no Windows, ponto de montagem nos demais)."""
+    path = os.path.abspath(path)
+    drive, _ = os.path.splitdrive(path)
+    if drive:
+        return drive + os.sep
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def _ensure_staging_directory(parent_path):
+    """Cria (se preciso) a pasta de preparo em 'parent_path'. Retorna o caminho ou None sem permissão."""
+    staging_path = os.path.join(parent_path, PURGE_STAGING_DIR_NAME)
+    try:
+        os.makedirs(staging_path, exist_ok=True)
+        if not os.access(staging_path, os.W_OK):
+            return None
+    except OSError:
+        return None
+    if sys.platform == "win32":
+        try:
+            ctypes.windll.kernel32.SetFileAttributesW(
+                staging_path, _FILE_ATTRIBUTE_HIDDEN
+            )
+        except (AttributeError, OSError):
+            pass
+    return staging_path
+
+
+class PurgeJournal:
+    """
+    Diário das árvores movidas para preparo e ainda não apagadas, salvo em JSON.
+
+    Cada entrada é gravada ANTES do rename: se o programa cair entre as duas operações, a
+    entrada aponta para um caminho que não existe e é descartada ao retomar.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, journal_file_path):
+        self.journal_file_path = journal_file_path
+        self._entries = {}  # staged_path -> entrada
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.journal_file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.FORMAT_VERSION:
+                return []
+            entries = data.get("entries", [])
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"PURGE: Erro ao carregar '{self.journal_file_path}': {e}")
+            return []
+        with self._lock:
+            self._entries = {
+                entry["staged_path"]: entry
+                for entry in entries
+                if isinstance(entry, dict) and entry.get("staged_path")
+            }
+            return list(self._entries.values())
+
+    def add(self, entry):
+        """Registra uma entrada e grava o diário. Levanta OSError (sem registrar) se a gravação falhar."""
+        with self._lock:
+            self._entries[entry["staged_path"]] = entry
+            try:
+                self._save_locked()
+            except OSError:
+                self._entries.pop(entry["staged_path"], None)
+                raise
+
+    def remove(self, staged_path):
+        with self._lock:
+            if self._entries.pop(staged_path, None) is not None:
+                try:
+                    self._save_locked()
+                except OSError as e:
+                    print(f"PURGE: Erro ao salvar '{self.journal_file_path}': {e}")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _save_locked(self):
+        payload = json.dumps(
+            {"version": self.FORMAT_VERSION, "entries": list(self._entries.values())},
+            indent=2,
+        )
+        temp_path = self.journal_file_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_file_path)
+
+
+class BackgroundPurger:
+    """
+    Move subpastas de cache para a pasta de preparo do volume (stage) e as apaga em uma
+    thread de prioridade baixa.
+
+    'on_bytes_freed' (opcional) é chamado da thread do purgador como
+    on_bytes_freed(entrada, bytes) conforme o espaço é recuperado; a entrada tem
+    "project_path", "item_id", "original_path" e "staged_path".
+    """
+
+    def __init__(self, logger, journal_file_path, on_bytes_freed=None):
+        self.logger = logger
+        self.journal = PurgeJournal(journal_file_path)
+        self.on_bytes_freed = on_bytes_freed
+        self.bytes_freed_total = 0
+        self._staging_dirs_by_volume = {}  # raiz do volume -> pasta de preparo
+        # Serializa a escolha da pasta de preparo + rename com a remoção de pastas de preparo vazias
+        self._staging_lock = threading.Lock()
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._busy = False
+
+    def start(self):
+        """Carrega o diário, enfileira as purgas pendentes e inicia a thread do purgador."""
+        resumed = 0
+        for entry in self.journal.load():
+            if os.path.lexists(entry["staged_path"]):
+                self._queue.append(entry)
+                resumed += 1
+            else:
+                self.journal.remove(entry["staged_path"])
+        if resumed:
+            self.logger.log_message(
+                f"PURGE: Retomando {resumed} purga(s) pendente(s) da execução anterior.",
+                level="INFO",
+            )
+        self._thread = threading.Thread(
+            target=self._run, name="BackgroundPurger", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Interrompe o purgador; a árvore em andamento continua no diário e é retomada depois."""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._queue) + (1 if self._busy else 0)
+
+    def wait_until_idle(self, timeout=None):
+        """Bloqueia até não haver purgas na fila nem em andamento. Retorna False no timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _staging_directory_for(self, source_path, project_path):
+        mount_root = find_mount_root(source_path)
+        staging_path = self._staging_dirs_by_volume.get(mount_root)
+        if staging_path is None or not os.path.isdir(staging_path):
+            staging_path = _ensure_staging_directory(mount_root)
+            if staging_path is not None:
+                self._staging_dirs_by_volume[mount_root] = staging_path
+        if staging_path is None:
+            # Sem permissão na raiz do volume: usa a raiz do projeto (mesmo volume)
+            staging_path = _ensure_staging_directory(project_path)
+        return staging_path
+
+    def stage(self, project_path, item_id, source_path):
+        """
+        Move 'source_path' para a pasta de preparo e agenda a purga. Retorna o caminho movido.
+        Levanta OSError se não for possível (sem pasta de preparo, outro volume, arquivos em uso);
+        nesse caso nada foi movido e o chamador deve apagar diretamente.
+        """
+        with self._staging_lock:
+            staging_path = self._staging_directory_for(source_path, project_path)
+            if staging_path is None:
+                raise OSError(
+                    f"Nenhuma pasta de preparo disponível para '{source_path}'"
+                )
+            staged_name = "{}-{}-{}".format(
+                os.path.basename(os.path.normpath(project_path)),
+                item_id.replace(os.sep, "_").replace("/", "_"),
+                time.time_ns(),
+            )
+            entry = {
+                "staged_path": os.path.join(staging_path, staged_name),
+                "original_path": source_path,
+                "project_path": project_path,
+                "item_id": item_id,
+                "staged_at": time.time(),
+            }
+            self.journal.add(entry)
+            try:
+                os.rename(source_path, entry["staged_path"])
+            except OSError:
+                self.journal.remove(entry["staged_path"])
+                raise
+        with self._cond:
+            self._queue.append(entry)
+            self._cond.notify_all()
+        return entry["staged_path"]
+
+    def _report_bytes(self, entry, bytes_freed):
+        if bytes_freed <= 0:
+            return
+        self.bytes_freed_total += bytes_freed
+        self.logger.log_message(
+            f"PURGE: +{format_size(bytes_freed)} liberados de '{entry['item_id']}' "
+            f"(total do purgador: {format_size(self.bytes_freed_total)}).",
+            level="DEBUG",
+        )
+        if self.on_bytes_freed is not None:
+            self.on_bytes_freed(entry, bytes_freed)
+
+    def _run(self):
+        enter_background_thread()
+        while True:
+            with self._cond:
+                while not self._queue and not self._stop_event.is_set():
+                    self._cond.wait()
+                if self._stop_event.is_set():
+                    return
+                entry = self._queue.popleft()
+                self._busy = True
+            try:
+                self._purge_entry(entry)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _purge_entry(self, entry):
+        unreported_bytes = [0]
+
+        def report(files_deleted, bytes_freed):
+            unreported_bytes[0] += bytes_freed
+            if unreported_bytes[0] >= PURGE_PROGRESS_REPORT_BYTES:
+                self._report_bytes(entry, unreported_bytes[0])
+                unreported_bytes[0] = 0
+
+        deletion = delete_tree(
+            entry["staged_path"],
+            parallel=False,
+            stop_event=self._stop_event,
+            progress_callback=report,
+        )
+        self._report_bytes(entry, unreported_bytes[0])
+        if not deletion["completed"]:
+            return  # Interrompido: continua no diário
+        errors = deletion["errors"]
+        if errors and os.path.lexists(entry["staged_path"]):
+            # Arquivos em uso ou sem permissão: a entrada fica no diário para a próxima inicialização
+            self.logger.log_message(
+                f"PURGE: {deletion['errors_total']} erro(s) ao apagar '{entry['staged_path']}' "
+                f"(nova tentativa na próxima inicialização). Primeiro: {errors[0]}",
+                level="WARNING",
+            )
+            return
+        self.journal.remove(entry["staged_path"])
+        staging_path = os.path.dirname(entry["staged_path"])
+        with self._staging_lock:
+            try:
+                os.rmdir(staging_path)  # Só some se estiver vazia
+            except OSError:
+                pass
+        self.logger.log_message(
+            f"PURGE: '{entry['item_id']}' de '{entry['project_path']}' apagado em segundo plano: "
+            f"{format_size(deletion['bytes_freed'])} liberados em {deletion['elapsed_seconds']:.1f}s.",
+            level="INFO",
+        )
@@ -0,0 +1,182 @@
+"""
+Registro dos projetos da lista: o modelo de dados, separado dos widgets do Tk.
+
+Os projetos ficam em um dict indexado pela chave do caminho (normalizado e, no Windows, sem
+diferenciar maiúsculas), que mantém a ordem de inserção: adicionar, remover e procurar um
+projeto custam O(1), em vez de percorrer a lista normalizando cada caminho. A thread do Tk
+atualiza os registros quando o usuário mexe nos controles; as threads de segundo plano leem
+cópias (snapshot) e nunca tocam nas variáveis do Tk.
+"""
+
+import os
+import threading
+from types import MappingProxyType
+
+# Chaves do projeto no arquivo de configuração que ficam em campos próprios do registro.
+# As demais (ex: "ddc_eviction_budget_gb", "retention_rules") vão para ProjectRecord.extra.
+_RECORD_DATA_KEYS = {
+    "path": "path",
+    "name": "name",
+    "uproject_file": "uproject_file",
+    "monitor_auto": "monitor_auto",
+    "allow_clean": "allow_clean",
+    "gb_limit": "gb_limit",
+    "gb_low_watermark": "gb_low_watermark",
+    "selected_cleanup_items": "selected_items",
+}
+
+
+def project_key(project_path):
+    """Chave de um projeto no registro (mesma regra de CacheChangeWatcher.project_key)."""
+    return os.path.normcase(os.path.normpath(project_path))
+
+
+class ProjectRecord:
+    """
+    Estado de um projeto: identificação, opções da lista, itens selecionados e os últimos
+    tamanhos medidos. 'extra' guarda as chaves que só existem no arquivo de configuração.
+    """
+
+    __slots__ = (
+        "path",
+        "name",
+        "uproject_file",
+        "monitor_auto",
+        "allow_clean",
+        "gb_limit",
+        "gb_low_watermark",
+        "selected_items",
+        "last_total_bytes",
+        "last_selected_bytes",
+        "extra",
+    )
+
+    def __init__(
+        self,
+        path,
+        name,
+        uproject_file="",
+        monitor_auto=False,
+        allow_clean=False,
+        gb_limit="",
+        gb_low_watermark="",
+        selected_items=(),
+        last_total_bytes=None,
+        last_selected_bytes=None,
+        extra=None,
+    ):
+        self.path = os.path.normpath(path)
+        self.name = name
+        self.uproject_file = uproject_file
+        self.monitor_auto = monitor_auto
+        self.allow_clean = allow_clean
+        self.gb_limit = gb_limit
+        self.gb_low_watermark = gb_low_watermark
+        self.selected_items = tuple(selected_items)
+        self.last_total_bytes = last_total_bytes
+        self.last_selected_bytes = last_selected_bytes
+        self.extra = {} if extra is None else extra
+
+    @classmethod
+    def from_project_data(cls, project_data):
+        """Cria o registro a partir de um projeto do arquivo de configuração ou da descoberta."""
+        fields = {
+            field: project_data[data_key]
+            for data_key, field in _RECORD_DATA_KEYS.items()
+            if project_data.get(data_key) is not None
+        }
+        fields.setdefault("name", os.path.basename(os.path.normpath(fields["path"])))
+        extra = {
+            key: value
+            for key, value in project_data.items()
+            if key not in _RECORD_DATA_KEYS
+        }
+        return cls(extra=extra, **fields)
+
+    @property
+    def key(self):
+        return project_key(self.path)
+
+    def to_project_data(self):
+        """Dict do projeto no formato do arquivo de configuração (e das funções do backend)."""
+        project_data = dict(self.extra)
+        project_data.update(
+            {
+                data_key: getattr(self, field)
+                for data_key, field in _RECORD_DATA_KEYS.items()
+            }
+        )
+        project_data["selected_cleanup_items"] = list(self.selected_items)
+        # Só editáveis no arquivo de configuração; ficam visíveis mesmo quando vazias
+        project_data.setdefault("ddc_eviction_budget_gb", "")
+        project_data.setdefault("retention_rules", {})
+        return project_data
+
+    def snapshot(self):
+        """Cópia para outra thread: os campos não mudam depois e 'extra' é somente leitura."""
+        copy = ProjectRecord.__new__(ProjectRecord)
+        for field in ProjectRecord.__slots__:
+            setattr(copy, field, getattr(self, field))
+        copy.extra = MappingProxyType(dict(self.extra))
+        return copy
+
+
+class ProjectRegistry:
+    """Projetos da lista em ordem de inserção, indexados por project_key. Seguro entre threads."""
+
+    def __init__(self):
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._records)
+
+    def __contains__(self, project_path):
+        with self._lock:
+            return project_key(project_path) in self._records
+
+    def get(self, project_path):
+        """O registro vivo do projeto (só a thread do Tk deve alterá-lo, via update), ou None."""
+        with self._lock:
+            return self._records.get(project_key(project_path))
+
+    def add(self, record):
+        """Adiciona o projeto. Retorna False (sem mudar nada) se o caminho já está no registro."""
+        with self._lock:
+            if record.key in self._records:
+                return False
+            self._records[record.key] = record
+            return True
+
+    def remove(self, project_path):
+        """Remove e retorna o registro do projeto, ou None se ele não estava no registro."""
+        with self._lock:
+            return self._records.pop(project_key(project_path), None)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def update(self, project_path, **fields):
+        """Altera campos de um projeto. Retorna False se o projeto não está no registro."""
+        with self._lock:
+            record = self._records.get(project_key(project_path))
+            if record is None:
+                return False
+            for field, value in fields.items():
+                if field == "selected_items":
+                    value = tuple(value)
+                setattr(record, field, value)
+            return True
+
+    def snapshot(self, project_path):
+        """Cópia do projeto para outra thread, ou None se ele não está no registro."""
+        with self._lock:
+            record = self._records.get(project_key(project_path))
+            return None if record is None else record.snapshot()
+
+    def snapshots(self):
+        """Cópias de todos os projetos, na ordem da lista."""
+        with self._lock:
+            return [record.snapshot() for record in self._records.values()]
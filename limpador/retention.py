@@ -0,0 +1,212 @@
+"""
+Regras de retenção por idade para itens de limpeza (ex: Saved/Logs, Saved/Crashes).
+
+Um item com regra não é apagado inteiro: só os arquivos que a regra não mantém. As regras
+ficam na configuração do projeto, ao lado de "selected_cleanup_items":
+
+    "retention_rules": {"Saved/Logs": {"max_age_days": 7, "keep_newest_files": 20}}
+
+    max_age_days       apaga arquivos modificados há mais de N dias
+    keep_newest_files  mantém só os N arquivos mais novos
+    keep_newest_mb     mantém só os arquivos mais novos que somados cabem em N MB
+
+Com mais de uma chave, um arquivo fica só se todas as regras o mantêm. A árvore é lida em
+fluxo (os.scandir, uma pasta por vez): arquivos vencidos por idade são apagados na hora e,
+para as regras de "mais novos", um heap guarda só os arquivos mantidos até o momento; o mais
+antigo sai do heap (e do disco) quando passa do limite. Pastas que ficam vazias são removidas.
+"""
+
+import heapq
+import os
+import time
+
+from .deletion import DELETE_MAX_REPORTED_ERRORS, _remove_path
+from .eviction import _prune_empty_directories
+from .logger import log_level_enabled
+from .priority import throttle_file_operations
+from .sizes import format_size
+
+RETENTION_RULE_KEYS = ("max_age_days", "keep_newest_files", "keep_newest_mb")
+
+
+def get_project_retention_rules(project_data, logger):
+    """
+    Regras de retenção válidas de "retention_rules" da configuração do projeto:
+    {item_id normalizado: {chave: valor}}. Regras inválidas são ignoradas com um aviso.
+    """
+    raw_rules = project_data.get("retention_rules") or {}
+    if not isinstance(raw_rules, dict):
+        logger.log_message(
+            f"RETENTION: 'retention_rules' inválido em '{project_data.get('path')}'. Ignorando.",
+            level="WARNING",
+        )
+        return {}
+    rules = {}
+    for item_id, raw_rule in raw_rules.items():
+        rule = {}
+        if isinstance(raw_rule, dict):
+            for key in RETENTION_RULE_KEYS:
+                if raw_rule.get(key) in (None, ""):
+                    continue
+                try:
+                    value = float(raw_rule[key])
+                except (TypeError, ValueError):
+                    value = -1
+                if value < 0:
+                    rule = {}
+                    break
+                rule[key] = int(value) if key == "keep_newest_files" else value
+        if not rule:
+            logger.log_message(
+                f"RETENTION: Regra inválida para '{item_id}' em '{project_data.get('path')}': {raw_rule}. Ignorando.",
+                level="WARNING",
+            )
+            continue
+        rules[os.path.normpath(item_id)] = rule
+    return rules
+
+
+def apply_retention_rule(folder_path, rule, stop_event=None):
+    """
+    Apaga de 'folder_path' os arquivos que a regra não mantém (ver o topo do módulo).
+    'stop_event' (opcional): verificado a cada pasta; os arquivos ainda no heap ficam.
+
+    Retorna um dict:
+        {"files_retained", "bytes_retained", "files_deleted", "bytes_reclaimed",
+         "dirs_pruned", "errors", "errors_total", "completed"}
+    """
+    result = {
+        "files_retained": 0,
+        "bytes_retained": 0,
+        "files_deleted": 0,
+        "bytes_reclaimed": 0,
+        "dirs_pruned": 0,
+        "errors": [],
+        "errors_total": 0,
+        "completed": False,
+    }
+    max_age_days = rule.get("max_age_days")
+    age_cutoff = None if max_age_days is None else time.time() - max_age_days * 86400
+    keep_newest_files = rule.get("keep_newest_files")
+    keep_newest_mb = rule.get("keep_newest_mb")
+    keep_newest_bytes = None if keep_newest_mb is None else keep_newest_mb * 1024 * 1024
+    uses_heap = keep_newest_files is not None or keep_newest_bytes is not None
+
+    kept_heap = []  # (mtime, caminho, bytes) dos mantidos até agora; o topo é o mais antigo
+    kept_heap_bytes = 0
+    dirs_with_deletions = set()
+
+    def add_error(message):
+        result["errors_total"] += 1
+        if len(result["errors"]) < DELETE_MAX_REPORTED_ERRORS:
+            result["errors"].append(message)
+
+    def delete_file(file_path, file_size):
+        try:
+            throttle_file_operations()
+            _remove_path(os.unlink, file_path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            add_error(f"{file_path}: {e}")
+            result["files_retained"] += 1
+            result["bytes_retained"] += file_size
+            return
+        result["files_deleted"] += 1
+        result["bytes_reclaimed"] += file_size
+        dirs_with_deletions.add(os.path.dirname(file_path))
+
+    def over_heap_limit():
+        return (
+            keep_newest_files is not None and len(kept_heap) > keep_newest_files
+        ) or (keep_newest_bytes is not None and kept_heap_bytes > keep_newest_bytes)
+
+    pending_dirs = [folder_path]
+    while pending_dirs:
+        if stop_event is not None and stop_event.is_set():
+            break
+        dir_path = pending_dirs.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                throttle_file_operations()
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                            continue
+                        stat_result = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue  # Arquivo apagado durante a listagem
+                    if age_cutoff is not None and stat_result.st_mtime < age_cutoff:
+                        delete_file(entry.path, stat_result.st_size)
+                        continue
+                    if not uses_heap:
+                        result["files_retained"] += 1
+                        result["bytes_retained"] += stat_result.st_size
+                        continue
+                    heapq.heappush(
+                        kept_heap,
+                        (stat_result.st_mtime, entry.path, stat_result.st_size),
+                    )
+                    kept_heap_bytes += stat_result.st_size
+                    while kept_heap and over_heap_limit():
+                        _, oldest_path, oldest_size = heapq.heappop(kept_heap)
+                        kept_heap_bytes -= oldest_size
+                        delete_file(oldest_path, oldest_size)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            add_error(f"{dir_path}: {e}")
+    else:
+        result["completed"] = True
+
+    result["files_retained"] += len(kept_heap)
+    result["bytes_retained"] += kept_heap_bytes
+    result["dirs_pruned"] = _prune_empty_directories(dirs_with_deletions, [folder_path])
+    return result
+
+
+def apply_project_retention(
+    project_path, retention_rules, item_ids, logger, stop_event=None
+):
+    """
+    Aplica as regras de 'retention_rules' aos itens de 'item_ids' que têm regra (uma passada
+    do monitoramento, independente do Limite GB). Itens sem pasta no disco são ignorados.
+
+    Retorna os totais da passada:
+        {"items", "files_retained", "bytes_retained", "files_deleted", "bytes_reclaimed",
+         "errors", "errors_total"}
+    """
+    totals = {
+        "items": [],
+        "files_retained": 0,
+        "bytes_retained": 0,
+        "files_deleted": 0,
+        "bytes_reclaimed": 0,
+        "errors": [],
+        "errors_total": 0,
+    }
+    debug_enabled = log_level_enabled(logger, "DEBUG")
+    for item_id in item_ids:
+        if stop_event is not None and stop_event.is_set():
+            break
+        rule = retention_rules.get(os.path.normpath(item_id))
+        folder_path = os.path.join(project_path, item_id)
+        if rule is None or not os.path.isdir(folder_path):
+            continue
+        result = apply_retention_rule(folder_path, rule, stop_event=stop_event)
+        totals["items"].append(item_id)
+        for key in ("files_retained", "bytes_retained", "files_deleted"):
+            totals[key] += result[key]
+        totals["bytes_reclaimed"] += result["bytes_reclaimed"]
+        totals["errors_total"] += result["errors_total"]
+        free_slots = DELETE_MAX_REPORTED_ERRORS - len(totals["errors"])
+        totals["errors"].extend(result["errors"][:free_slots])
+        if debug_enabled:
+            logger.log_message(
+                f"RETENTION: {rule} em '{item_id}': {format_size(result['bytes_reclaimed'])} "
+                f"liberados ({result['files_deleted']} arquivos), "
+                f"{format_size(result['bytes_retained'])} retidos ({result['files_retained']} arquivos).",
+                level="DEBUG",
+            )
+    return totals
@@ -0,0 +1,380 @@
+"""
+Agendador de E/S por disco físico: análises e limpezas de projeto com concorrência limitada.
+
+Cada tarefa é associada ao dispositivo do caminho do projeto (os.stat().st_dev). Em um
+disco rotativo (HDD) as tarefas rodam uma de cada vez, porque buscas concorrentes na mesma
+cabeça de leitura são mais lentas que em sequência; em SSDs rodam várias ao mesmo tempo.
+Discos diferentes não esperam um pelo outro. Dentro de um disco, análises e limpezas se
+alternam, então uma fila longa de um tipo não bloqueia o outro.
+"""
+
+import ctypes
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+from .priority import background_priority
+
+IO_KIND_SCAN = "scan"
+IO_KIND_DELETE = "delete"
+IO_KINDS = (IO_KIND_SCAN, IO_KIND_DELETE)
+
+# Quantas análises de projeto podem rodar ao mesmo tempo, somando todos os discos
+# (configurável em "settings").
+DEFAULT_MAX_CONCURRENT_SCANS = 2
+# Tarefas simultâneas por disco (análises e limpezas somadas). Discos cujo tipo não pode ser
+# detectado usam o limite de disco rotativo.
+DEFAULT_MAX_IO_PER_ROTATIONAL_DEVICE = 1
+DEFAULT_MAX_IO_PER_SOLID_STATE_DEVICE = 4
+
+_IOCTL_STORAGE_QUERY_PROPERTY = 0x2D1400
+_STORAGE_DEVICE_SEEK_PENALTY_PROPERTY = 7
+_FILE_SHARE_READ_WRITE = 0x1 | 0x2
+_OPEN_EXISTING = 3
+
+
+def get_device_id(path):
+    """Identificador do dispositivo de um caminho (st_dev), ou a letra do drive se o stat falhar."""
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        drive, _ = os.path.splitdrive(os.path.abspath(path))
+        return drive.upper() or path
+
+
+def _linux_is_rotational(path):
+    st_dev = os.stat(path).st_dev
+    device_sys_path = os.path.realpath(
+        f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}"
+    )
+    # Uma partição (sda1) não tem "queue"; o disco (sda) é a pasta pai
+    for candidate in (device_sys_path, os.path.dirname(device_sys_path)):
+        rotational_path = os.path.join(candidate, "queue", "rotational")
+        if os.path.exists(rotational_path):
+            with open(rotational_path, "r", encoding="ascii") as f:
+                return f.read().strip() == "1"
+    return None
+
+
+def _windows_is_rotational(path):
+    from ctypes import wintypes
+
+    class StoragePropertyQuery(ctypes.Structure):
+        _fields_ = [
+            ("PropertyId", wintypes.DWORD),
+            ("QueryType", wintypes.DWORD),
+            ("AdditionalParameters", ctypes.c_ubyte * 1),
+        ]
+
+    class DeviceSeekPenaltyDescriptor(ctypes.Structure):
+        _fields_ = [
+            ("Version", wintypes.DWORD),
+            ("Size", wintypes.DWORD),
+            ("IncursSeekPenalty", wintypes.BOOLEAN),
+        ]
+
+    drive, _ = os.path.splitdrive(os.path.abspath(path))
+    if not drive or drive.startswith("\\\\"):
+        return None  # Compartilhamento de rede
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    handle = kernel32.CreateFileW(
+        f"\\\\.\\{drive}", 0, _FILE_SHARE_READ_WRITE, None, _OPEN_EXISTING, 0, None
+    )
+    if handle in (None, wintypes.HANDLE(-1).value):
+        return None
+    try:
+        query = StoragePropertyQuery(_STORAGE_DEVICE_SEEK_PENALTY_PROPERTY, 0)
+        descriptor = DeviceSeekPenaltyDescriptor()
+        bytes_returned = wintypes.DWORD()
+        if not kernel32.DeviceIoControl(
+            handle,
+            _IOCTL_STORAGE_QUERY_PROPERTY,
+            ctypes.byref(query),
+            ctypes.sizeof(query),
+            ctypes.byref(descriptor),
+            ctypes.sizeof(descriptor),
+            ctypes.byref(bytes_returned),
+            None,
+        ):
+            return None
+        return bool(descriptor.IncursSeekPenalty)
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def is_rotational_device(path):
+    """True para disco rotativo (HDD), False para SSD, None se não for possível detectar."""
+    try:
+        if sys.platform.startswith("linux"):
+            return _linux_is_rotational(path)
+        if sys.platform == "win32":
+            return _windows_is_rotational(path)
+    except (AttributeError, OSError, ValueError):
+        pass
+    return None
+
+
+class IOScheduler:
+    """
+    Fila compartilhada de tarefas de E/S de projeto (análises e limpezas), por disco.
+
+    - Por disco: no máximo 'max_io_per_rotational_device' (HDD ou tipo desconhecido) ou
+      'max_io_per_solid_state_device' (SSD) tarefas ao mesmo tempo, e no máximo
+      'max_deletes_per_device' limpezas entre elas.
+    - No total: no máximo 'max_concurrent_scans' análises ao mesmo tempo.
+    - Os discos são atendidos em rodízio; em cada disco, análise e limpeza se alternam.
+    - Ignora pedidos para uma chave que já está na fila ou em andamento (chave None não é
+      deduplicada).
+    - Com 'collect_result', o resultado vai para uma fila que a thread do Tk aplica em lotes
+      (drain_results); toda tarefa também devolve um Future.
+    - As threads das tarefas são criadas por uma thread despachante de prioridade normal,
+      criada junto com o agendador: no Linux uma thread nova herda o nice de quem a cria, e
+      uma thread que rodou em segundo plano não consegue voltar ao nice normal sem privilégio.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_scans=DEFAULT_MAX_CONCURRENT_SCANS,
+        max_io_per_rotational_device=DEFAULT_MAX_IO_PER_ROTATIONAL_DEVICE,
+        max_io_per_solid_state_device=DEFAULT_MAX_IO_PER_SOLID_STATE_DEVICE,
+        max_deletes_per_device=None,
+    ):
+        self.max_concurrent_scans = max(1, int(max_concurrent_scans))
+        self.max_io_per_rotational_device = max(1, int(max_io_per_rotational_device))
+        self.max_io_per_solid_state_device = max(1, int(max_io_per_solid_state_device))
+        self.max_deletes_per_device = (
+            None if max_deletes_per_device is None else max(1, int(max_deletes_per_device))
+        )
+        self._cond = threading.Condition()
+        self._devices = {}  # device_id -> estado do disco (ver _device_state_locked)
+        self._device_order = deque()  # rodízio entre os discos
+        self._rotational_by_device = {}
+        self._in_flight = set()  # (tipo, chave) na fila ou em andamento
+        self._running = dict.fromkeys(IO_KINDS, 0)  # todas as tarefas, para os limites
+        # Contadores do status por (tipo, collect_result): as análises pedidas pela UI não se
+        # misturam com as chamadas de call() do monitoramento e do pipeline de limpeza
+        self._job_counts = {
+            (kind, collect_result): {"queued": 0, "running": 0, "done": 0}
+            for kind in IO_KINDS
+            for collect_result in (True, False)
+        }
+        self._results = queue.Queue()  # (key, context, result, error)
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="IOScheduler-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+    def set_max_concurrent_scans(self, max_concurrent_scans):
+        """Altera o limite; vale para as próximas análises que forem iniciadas."""
+        with self._cond:
+            self.max_concurrent_scans = max(1, int(max_concurrent_scans))
+            self._cond.notify_all()
+
+    def set_device_limits(
+        self,
+        max_io_per_rotational_device=None,
+        max_io_per_solid_state_device=None,
+        max_deletes_per_device=None,
+    ):
+        """Altera os limites por disco (None mantém o atual); vale para as próximas tarefas."""
+        with self._cond:
+            if max_io_per_rotational_device is not None:
+                self.max_io_per_rotational_device = max(
+                    1, int(max_io_per_rotational_device)
+                )
+            if max_io_per_solid_state_device is not None:
+                self.max_io_per_solid_state_device = max(
+                    1, int(max_io_per_solid_state_device)
+                )
+            if max_deletes_per_device is not None:
+                self.max_deletes_per_device = max(1, int(max_deletes_per_device))
+            for device_id, device in self._devices.items():
+                device["limit"] = self._device_limit_locked(device_id)
+            self._cond.notify_all()
+
+    def device_info(self, path):
+        """(device_id, rotativo) de um caminho; rotativo é True, False ou None (desconhecido)."""
+        device_id = get_device_id(path)
+        with self._cond:
+            if device_id in self._rotational_by_device:
+                return device_id, self._rotational_by_device[device_id]
+        rotational = is_rotational_device(path)
+        with self._cond:
+            self._rotational_by_device[device_id] = rotational
+        return device_id, rotational
+
+    def submit(
+        self,
+        key,
+        func,
+        args=(),
+        context=None,
+        path=None,
+        kind=IO_KIND_SCAN,
+        collect_result=True,
+        background=False,
+    ):
+        """
+        Enfileira func(*args) no disco de 'path'. Retorna um Future, ou None (sem enfileirar)
+        se a mesma chave do mesmo tipo já estiver na fila ou em andamento.
+        Com 'background', a tarefa roda com prioridade baixa de CPU e E/S (ver priority.py).
+        """
+        device_id = None if path is None else self.device_info(path)[0]
+        future = Future()
+        with self._cond:
+            if key is not None:
+                if (kind, key) in self._in_flight:
+                    return None
+                self._in_flight.add((kind, key))
+            device = self._device_state_locked(device_id)
+            device["queues"][kind].append(
+                (key, kind, func, args, context, collect_result, background, future)
+            )
+            self._job_counts[(kind, collect_result)]["queued"] += 1
+            self._cond.notify_all()
+        return future
+
+    def call(self, path, kind, func, *args, background=False, **kwargs):
+        """Roda func(*args, **kwargs) pelo agendador (no disco de 'path') e espera o resultado."""
+        future = self.submit(
+            None,
+            lambda: func(*args, **kwargs),
+            path=path,
+            kind=kind,
+            collect_result=False,
+            background=background,
+        )
+        return future.result()
+
+    def counts(self, kind=IO_KIND_SCAN, collect_result=True):
+        """
+        Retorna (na fila, em andamento, concluídas desde o último reset_done_count) das
+        tarefas de um tipo. Por padrão só as com 'collect_result' (as pedidas pela UI).
+        """
+        with self._cond:
+            job_counts = self._job_counts[(kind, collect_result)]
+            return job_counts["queued"], job_counts["running"], job_counts["done"]
+
+    def is_idle(self, kind=IO_KIND_SCAN, collect_result=True):
+        with self._cond:
+            job_counts = self._job_counts[(kind, collect_result)]
+            return not job_counts["queued"] and job_counts["running"] == 0
+
+    def reset_done_count(self, kind=IO_KIND_SCAN, collect_result=True):
+        with self._cond:
+            self._job_counts[(kind, collect_result)]["done"] = 0
+
+    def drain_results(self):
+        """Retorna (sem bloquear) todos os resultados disponíveis: lista de (key, context, result, error)."""
+        drained = []
+        while True:
+            try:
+                drained.append(self._results.get_nowait())
+            except queue.Empty:
+                return drained
+
+    def _device_limit_locked(self, device_id):
+        if self._rotational_by_device.get(device_id) is False:
+            return self.max_io_per_solid_state_device
+        if device_id is None:  # Tarefa sem caminho: não disputa nenhum disco
+            return self.max_io_per_solid_state_device
+        return self.max_io_per_rotational_device
+
+    def _device_state_locked(self, device_id):
+        device = self._devices.get(device_id)
+        if device is None:
+            device = {
+                "limit": self._device_limit_locked(device_id),
+                "running": dict.fromkeys(IO_KINDS, 0),
+                "queues": {kind: deque() for kind in IO_KINDS},
+                "next_kind": 0,  # tipo que tem a vez na próxima escolha
+            }
+            self._devices[device_id] = device
+            self._device_order.append(device_id)
+        return device
+
+    def _next_job_locked(self, device):
+        if sum(device["running"].values()) >= device["limit"]:
+            return None
+        for offset in range(len(IO_KINDS)):
+            kind_index = (device["next_kind"] + offset) % len(IO_KINDS)
+            kind = IO_KINDS[kind_index]
+            if not device["queues"][kind]:
+                continue
+            if kind == IO_KIND_SCAN and self._running[kind] >= self.max_concurrent_scans:
+                continue
+            if (
+                kind == IO_KIND_DELETE
+                and self.max_deletes_per_device is not None
+                and device["running"][kind] >= self.max_deletes_per_device
+            ):
+                continue
+            device["next_kind"] = kind_index + 1  # O outro tipo tem a vez na próxima
+            return device["queues"][kind].popleft()
+        return None
+
+    def _dispatch_loop(self):
+        """Thread despachante: inicia as tarefas sempre que a fila ou os limites mudam."""
+        with self._cond:
+            while True:
+                self._dispatch_locked()
+                self._cond.wait()
+
+    def _dispatch_locked(self):
+        """
+        Inicia todas as tarefas que cabem nos limites, atendendo os discos em rodízio.
+        Só é chamado pela thread despachante; os demais pontos apenas a acordam.
+        """
+        started = True
+        while started:
+            started = False
+            for _ in range(len(self._device_order)):
+                device_id = self._device_order[0]
+                self._device_order.rotate(-1)
+                device = self._devices[device_id]
+                job = self._next_job_locked(device)
+                if job is None:
+                    continue
+                kind, collect_result = job[1], job[5]
+                job_counts = self._job_counts[(kind, collect_result)]
+                job_counts["queued"] -= 1
+                job_counts["running"] += 1
+                self._running[kind] += 1
+                device["running"][kind] += 1
+                threading.Thread(
+                    target=self._run_job,
+                    args=(device, job),
+                    name=f"IOScheduler-{kind}",
+                    daemon=True,
+                ).start()
+                started = True
+
+    def _run_job(self, device, job):
+        key, kind, func, args, context, collect_result, background, future = job
+        result, error = None, None
+        try:
+            with background_priority(background):
+                result = func(*args)
+        except Exception as e:  # O erro é entregue junto do resultado para a UI
+            error = e
+
+        # O resultado entra na fila ANTES de a tarefa deixar de contar como "em andamento",
+        # assim quem vê o agendador ocioso já encontra todos os resultados na fila.
+        if collect_result:
+            self._results.put((key, context, result, error))
+        with self._cond:
+            job_counts = self._job_counts[(kind, collect_result)]
+            job_counts["running"] -= 1
+            job_counts["done"] += 1
+            self._running[kind] -= 1
+            device["running"][kind] -= 1
+            self._in_flight.discard((kind, key))
+            self._cond.notify_all()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
@@ -0,0 +1,596 @@
+"""
+Cálculo de tamanho das pastas de cache: varredura paralela com os.scandir, índice
+persistente de tamanhos por pasta e detalhamento por item de limpeza.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .config import POTENTIAL_CACHE_MAIN_FOLDERS
+from .logger import log_level_enabled
+from .priority import (
+    enter_background_thread,
+    is_background_thread,
+    throttle_file_operations,
+)
+
+
+def scan_project_cache_breakdown(project_path, logger, size_index=None):
+    """
+    Percorre UMA vez as pastas de POTENTIAL_CACHE_MAIN_FOLDERS de um projeto e retorna o detalhamento:
+
+        {
+            "total": bytes de todas as pastas principais,
+            "total_files": quantidade de arquivos de todas as pastas principais,
+            "main_folders": {
+                "Saved": {
+                    "loose": bytes dos arquivos soltos na raiz de "Saved",
+                    "loose_files": quantidade de arquivos soltos na raiz de "Saved",
+                    "total": bytes de "Saved" inteira,
+                    "total_files": quantidade de arquivos de "Saved" inteira,
+                    "subfolders": {os.path.normpath("Saved/Logs"): bytes, ...},
+                    "subfolder_files": {os.path.normpath("Saved/Logs"): arquivos, ...},
+                },
+                ...
+            },
+        }
+
+    O tamanho potencial e o tamanho dos itens selecionados são somas sobre este resultado
+    (ver calculate_project_total_potential_cache e calculate_project_cache_size).
+    'size_index' (DirectorySizeIndex, opcional) evita relistar pastas que não mudaram.
+    """
+    # Mensagens por pasta só são montadas se o nível estiver ativo (caminho quente do monitor)
+    debug_enabled = log_level_enabled(logger, "DEBUG")
+    trace_enabled = log_level_enabled(logger, "TRACE")
+    breakdown = {"total": 0, "total_files": 0, "main_folders": {}}
+    if debug_enabled:
+        logger.log_message(
+            f"CALC_BREAKDOWN: Iniciando varredura única de '{project_path}'...",
+            level="DEBUG",
+        )
+
+    for folder_name in POTENTIAL_CACHE_MAIN_FOLDERS:
+        abs_folder_path = os.path.join(project_path, folder_name)
+        if not os.path.isdir(abs_folder_path):
+            if debug_enabled:
+                logger.log_message(
+                    f"CALC_BREAKDOWN: Pasta '{abs_folder_path}' não encontrada.",
+                    level="DEBUG",
+                )
+            continue
+
+        folder_info = {
+            "loose": 0,
+            "loose_files": 0,
+            "total": 0,
+            "total_files": 0,
+            "subfolders": {},
+            "subfolder_files": {},
+        }
+        try:
+            # Listagem direta da pasta principal: arquivos soltos + subpastas
+            if size_index is not None:
+                (loose_bytes, loose_files), subdir_paths = (
+                    size_index.list_directory_stats(abs_folder_path)
+                )
+            else:
+                (loose_bytes, loose_files), subdir_paths = _scan_directory_stats(
+                    abs_folder_path
+                )
+            folder_info["loose"] = loose_bytes
+            folder_info["loose_files"] = loose_files
+            folder_info["total"] = loose_bytes
+            folder_info["total_files"] = loose_files
+
+            for subdir_path in subdir_paths:
+                relative_subfolder_path = os.path.normpath(
+                    os.path.join(folder_name, os.path.basename(subdir_path))
+                )
+                subfolder_size, subfolder_files = get_folder_stats(
+                    subdir_path, size_index
+                )
+                folder_info["subfolders"][relative_subfolder_path] = subfolder_size
+                folder_info["subfolder_files"][
+                    relative_subfolder_path
+                ] = subfolder_files
+                folder_info["total"] += subfolder_size
+                folder_info["total_files"] += subfolder_files
+                if trace_enabled:
+                    logger.log_message(
+                        f"CALC_BREAKDOWN: Tamanho de '{relative_subfolder_path}': {format_size(subfolder_size)}",
+                        level="TRACE",
+                    )
+        except Exception as e:
+            logger.log_message(
+                f"CALC_BREAKDOWN: Erro ao calcular tamanho de '{abs_folder_path}': {e}",
+                level="ERROR",
+            )
+
+        breakdown["main_folders"][folder_name] = folder_info
+        breakdown["total"] += folder_info["total"]
+        breakdown["total_files"] += folder_info["total_files"]
+        if debug_enabled:
+            logger.log_message(
+                f"CALC_BREAKDOWN: '{folder_name}': {format_size(folder_info['total'])} (arquivos soltos: {format_size(folder_info['loose'])})",
+                level="DEBUG",
+            )
+
+    return breakdown
+
+
+def calculate_project_total_potential_cache(
+    project_path, logger, breakdown=None, size_index=None
+):
+    """
+    Calcula o tamanho total das pastas de cache "potencial" (ex: Intermediate, DerivedDataCache inteiras).
+    Se 'breakdown' (de scan_project_cache_breakdown) for fornecido, apenas soma sobre ele.
+    """
+    logger.log_message(
+        f"CALC_TOTAL_POTENTIAL: Iniciando para '{project_path}'...", level="DEBUG"
+    )
+    if breakdown is None:
+        breakdown = scan_project_cache_breakdown(project_path, logger, size_index)
+
+    total_size = sum(
+        folder_info["total"] for folder_info in breakdown["main_folders"].values()
+    )
+    logger.log_message(
+        f"CALC_TOTAL_POTENTIAL: Tamanho total potencial para '{project_path}': {format_size(total_size)}",
+        level="INFO",
+    )
+    return total_size
+
+
+# Número máximo de threads usadas para varrer subpastas em paralelo no cálculo de tamanho.
+# Varreduras de projetos diferentes compartilham o mesmo pool, então este é o limite global.
+SIZE_SCAN_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_size_scan_executors = {}  # {em segundo plano?: pool}
+_size_scan_executor_lock = threading.Lock()
+
+
+def _get_size_scan_executor():
+    """
+    Retorna o pool de threads compartilhado do motor de tamanho (criado sob demanda).
+    Chamado de uma thread de segundo plano, retorna o pool de prioridade baixa.
+    """
+    background = is_background_thread()
+    with _size_scan_executor_lock:
+        executor = _size_scan_executors.get(background)
+        if executor is None:
+            executor = _size_scan_executors[background] = ThreadPoolExecutor(
+                max_workers=SIZE_SCAN_MAX_WORKERS,
+                thread_name_prefix="SizeScanBackground" if background else "SizeScan",
+                initializer=enter_background_thread if background else None,
+            )
+        return executor
+
+
+def _scan_directory_stats(dir_path):
+    """
+    Lista uma única pasta com os.scandir e retorna
+    ((bytes dos arquivos diretos, quantidade de arquivos diretos), subpastas).
+    Usa o stat do próprio DirEntry, evitando as chamadas extras de islink/getsize por arquivo.
+    Links simbólicos são ignorados (nem somados nem seguidos), como no os.walk anterior.
+    """
+    own_bytes = 0
+    own_files = 0
+    subdirs = []
+    try:
+        with os.scandir(dir_path) as entries:
+            throttle_file_operations()
+            for entry in entries:
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    else:
+                        own_bytes += entry.stat(follow_symlinks=False).st_size
+                        own_files += 1
+                except FileNotFoundError:
+                    pass  # Arquivo pode ter sido deletado durante a varredura
+                except OSError as e_entry:
+                    print(f"Aviso: Não foi possível ler '{entry.path}': {e_entry}")
+    except OSError as e_list:
+        # Pasta removida ou sem permissão durante a varredura (os.walk também ignorava)
+        print(f"Aviso: Não foi possível listar '{dir_path}': {e_list}")
+    return (own_bytes, own_files), subdirs
+
+
+def _scan_directory_entries(dir_path):
+    """Como _scan_directory_stats, mas retorna só (bytes dos arquivos diretos, subpastas)."""
+    (own_bytes, _), subdirs = _scan_directory_stats(dir_path)
+    return own_bytes, subdirs
+
+
+def _sum_directory_stats(walk_results):
+    """Soma os ((bytes, arquivos)) de _parallel_directory_walk em (bytes, arquivos)."""
+    total_bytes = 0
+    total_files = 0
+    for _, (own_bytes, own_files) in walk_results:
+        total_bytes += own_bytes
+        total_files += own_files
+    return total_bytes, total_files
+
+
+def _parallel_directory_walk(root_path, visit_directory):
+    """
+    Percorre a árvore a partir de root_path distribuindo cada subpasta encontrada
+    como uma tarefa no pool compartilhado (limitado por SIZE_SCAN_MAX_WORKERS).
+
+    visit_directory(dir_path) deve retornar (valor, lista_de_subpastas).
+    Retorna a lista de (dir_path, valor) de todas as pastas visitadas.
+    """
+    executor = _get_size_scan_executor()
+    results = []
+    pending = {executor.submit(visit_directory, root_path): root_path}
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            dir_path = pending.pop(future)
+            value, subdirs = future.result()
+            results.append((dir_path, value))
+            for subdir_path in subdirs:
+                pending[executor.submit(visit_directory, subdir_path)] = subdir_path
+    return results
+
+
+def get_folder_stats(folder_path, size_index=None):
+    """
+    Tamanho total de uma pasta em bytes e quantidade de arquivos: (bytes, arquivos).
+    Se 'size_index' (DirectorySizeIndex) for fornecido, só as pastas cujo mtime mudou são relistadas.
+    """
+    if not os.path.isdir(folder_path):
+        return 0, 0
+    if size_index is not None:
+        return size_index.get_folder_stats(folder_path)
+    return _sum_directory_stats(
+        _parallel_directory_walk(folder_path, _scan_directory_stats)
+    )
+
+
+def get_folder_size(folder_path, size_index=None):
+    """Calcula o tamanho total de uma pasta e seu conteúdo em bytes (ver get_folder_stats)."""
+    return get_folder_stats(folder_path, size_index)[0]
+
+
+# Tempo máximo que uma entrada do índice é reaproveitada sem relistar a pasta.
+# O mtime de uma pasta só muda quando entradas são criadas/removidas/renomeadas; arquivos
+# que crescem "in-place" (ex: logs) só são percebidos quando a entrada expira.
+SIZE_INDEX_MAX_AGE_SECONDS = 6 * 3600
+
+
+class DirectorySizeIndex:
+    """
+    Índice persistente de tamanhos por pasta, salvo em JSON ao lado do arquivo de configuração.
+
+    Para cada pasta guarda: mtime (ns), bytes e quantidade dos arquivos diretos, nomes das
+    subpastas e o horário da última listagem. Uma nova varredura faz um único stat por pasta;
+    só as pastas cujo mtime mudou (ou cuja entrada expirou) são listadas novamente com os.scandir.
+    Assim, reanalisar um projeto inalterado custa um stat por pasta em vez de um por arquivo.
+    """
+
+    FORMAT_VERSION = 2  # 2: quantidade de arquivos diretos em cada entrada
+
+    def __init__(self, index_file_path, max_age_seconds=SIZE_INDEX_MAX_AGE_SECONDS):
+        self.index_file_path = index_file_path
+        self.max_age_seconds = max_age_seconds
+        # dir_path -> [mtime_ns, own_bytes, listed_at, [nomes das subpastas], own_files]
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def load(self):
+        """Carrega o índice do disco. Um arquivo ausente ou inválido resulta em índice vazio."""
+        try:
+            with open(self.index_file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.FORMAT_VERSION:
+                print(
+                    f"SIZE_INDEX: Versão do índice '{self.index_file_path}' incompatível. Ignorando."
+                )
+                return False
+            with self._lock:
+                self._entries = data.get("directories", {})
+                self._dirty = False
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"SIZE_INDEX: Erro ao carregar '{self.index_file_path}': {e}")
+            return False
+
+    def save(self, force=False):
+        """Salva o índice (se houve mudanças) gravando em um arquivo temporário e substituindo."""
+        with self._lock:
+            if not self._dirty and not force:
+                return False
+            payload = json.dumps(
+                {"version": self.FORMAT_VERSION, "directories": self._entries},
+                separators=(",", ":"),
+            )
+            self._dirty = False
+        temp_path = self.index_file_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(temp_path, self.index_file_path)
+            return True
+        except OSError as e:
+            print(f"SIZE_INDEX: Erro ao salvar '{self.index_file_path}': {e}")
+            with self._lock:
+                self._dirty = True
+            return False
+
+    def forget(self, folder_path):
+        """Remove do índice uma pasta e todas as suas subpastas conhecidas."""
+        with self._lock:
+            self._forget_subtree_locked(folder_path)
+
+    def invalidate(self, folder_path):
+        """
+        Descarta só a entrada de uma pasta, sem tocar nas subpastas. Necessário quando um arquivo
+        é alterado no lugar (ex: log crescendo), o que não muda o mtime da pasta.
+        """
+        with self._lock:
+            if self._entries.pop(folder_path, None) is not None:
+                self._dirty = True
+
+    def _forget_subtree_locked(self, folder_path):
+        stack = [folder_path]
+        while stack:
+            current = stack.pop()
+            entry = self._entries.pop(current, None)
+            if entry is not None:
+                self._dirty = True
+                stack.extend(os.path.join(current, name) for name in entry[3])
+
+    def _visit_directory(self, dir_path):
+        """Visita usada por _parallel_directory_walk: reaproveita a entrada se o mtime não mudou."""
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            self.forget(dir_path)
+            return (0, 0), []
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(dir_path)
+            if (
+                entry is not None
+                and entry[0] == mtime_ns
+                and now - entry[2] < self.max_age_seconds
+            ):
+                return (entry[1], entry[4]), [
+                    os.path.join(dir_path, name) for name in entry[3]
+                ]
+
+        (own_bytes, own_files), subdirs = _scan_directory_stats(dir_path)
+        child_names = [os.path.basename(subdir) for subdir in subdirs]
+        with self._lock:
+            if entry is not None:
+                # Subpastas que sumiram desde a última listagem saem do índice
+                for removed_name in set(entry[3]) - set(child_names):
+                    self._forget_subtree_locked(os.path.join(dir_path, removed_name))
+            self._entries[dir_path] = [mtime_ns, own_bytes, now, child_names, own_files]
+            self._dirty = True
+        return (own_bytes, own_files), subdirs
+
+    def list_directory_stats(self, dir_path):
+        """((bytes, arquivos) diretos, subpastas) de uma única pasta, via índice."""
+        return self._visit_directory(dir_path)
+
+    def list_directory(self, dir_path):
+        """Retorna (bytes dos arquivos diretos, subpastas) de uma única pasta, via índice."""
+        (own_bytes, _), subdirs = self._visit_directory(dir_path)
+        return own_bytes, subdirs
+
+    def get_folder_stats(self, folder_path):
+        """(bytes, arquivos) de 'folder_path', atualizando o índice incrementalmente."""
+        if not os.path.isdir(folder_path):
+            self.forget(folder_path)
+            return 0, 0
+        return _sum_directory_stats(
+            _parallel_directory_walk(folder_path, self._visit_directory)
+        )
+
+    def get_folder_size(self, folder_path):
+        """Tamanho total de 'folder_path' em bytes, atualizando o índice incrementalmente."""
+        return self.get_folder_stats(folder_path)[0]
+
+
+def format_size(size_bytes):
+    """Converte bytes para um formato legível (KB, MB, GB)."""
+    if size_bytes == 0:
+        return "0 B"
+    size_name = ("B", "KB", "MB", "GB", "TB")
+    i = int(math.floor(math.log(size_bytes, 1024)))
+    p = math.pow(1024, i)
+    s = round(size_bytes / p, 2)
+    return f"{s} {size_name[i]}"
+
+
+def calculate_selected_size_from_breakdown(breakdown, selected_cleanup_items):
+    """
+    Soma, sobre um detalhamento de scan_project_cache_breakdown, o tamanho dos itens selecionados.
+    Retorna (total_bytes, itens_nao_encontrados).
+    """
+    total_cache_size = 0
+    missing_items = []
+    counted_items = set()
+    main_folders = breakdown.get("main_folders", {})
+
+    for item_id in selected_cleanup_items:
+        normalized_item_id = os.path.normpath(item_id)
+        if normalized_item_id in counted_items:
+            continue
+        counted_items.add(normalized_item_id)
+
+        if normalized_item_id in POTENTIAL_CACHE_MAIN_FOLDERS:
+            folder_info = main_folders.get(normalized_item_id)
+            if folder_info is None:
+                missing_items.append(item_id)
+            else:
+                total_cache_size += folder_info["loose"]
+            continue
+
+        parent_folder_name = normalized_item_id.split(os.sep)[0]
+        subfolder_size = (
+            main_folders.get(parent_folder_name, {})
+            .get("subfolders", {})
+            .get(normalized_item_id)
+        )
+        if subfolder_size is None:
+            missing_items.append(item_id)
+        else:
+            total_cache_size += subfolder_size
+
+    return total_cache_size, missing_items
+
+
+def calculate_item_stats_from_breakdown(breakdown, selected_cleanup_items):
+    """
+    Bytes e quantidade de arquivos de cada item selecionado, sobre um detalhamento de
+    scan_project_cache_breakdown: ({item_id: bytes}, {item_id: arquivos}). Itens que não
+    estão no detalhamento ficam com 0 bytes e 0 arquivos.
+    """
+    item_sizes = {}
+    item_file_counts = {}
+    main_folders = breakdown.get("main_folders", {})
+    for item_id in selected_cleanup_items:
+        normalized_item_id = os.path.normpath(item_id)
+        if normalized_item_id in POTENTIAL_CACHE_MAIN_FOLDERS:
+            folder_info = main_folders.get(normalized_item_id, {})
+            item_sizes[item_id] = folder_info.get("loose", 0)
+            item_file_counts[item_id] = folder_info.get("loose_files", 0)
+            continue
+        folder_info = main_folders.get(normalized_item_id.split(os.sep)[0], {})
+        item_sizes[item_id] = folder_info.get("subfolders", {}).get(
+            normalized_item_id, 0
+        )
+        item_file_counts[item_id] = folder_info.get("subfolder_files", {}).get(
+            normalized_item_id, 0
+        )
+    return item_sizes, item_file_counts
+
+
+def calculate_project_cache_size(
+    project_path, selected_cleanup_items, logger, breakdown=None, size_index=None
+):
+    """
+    Calcula o tamanho total dos itens de cache selecionados para um projeto.
+    'selected_cleanup_items' é uma lista de strings:
+        - Nomes de pastas principais (ex: "Saved") para contar arquivos soltos.
+        - Caminhos relativos normalizados de subpastas (ex: os.path.normpath("Saved/Logs")).
+    Se 'breakdown' (de scan_project_cache_breakdown) for fornecido, o resultado é uma soma
+    sobre ele, sem nenhum novo acesso ao disco. Caso contrário, 'size_index' (opcional)
+    é usado para as subpastas.
+    """
+    total_cache_size = 0
+    # Mensagens por item só são montadas se o nível estiver ativo (caminho quente do monitor)
+    debug_enabled = log_level_enabled(logger, "DEBUG")
+    trace_enabled = log_level_enabled(logger, "TRACE")
+    if debug_enabled:
+        logger.log_message(
+            f"CALC_SIZE: Iniciando cálculo de cache para '{project_path}' com itens selecionados: {selected_cleanup_items}",
+            level="DEBUG",
+        )
+
+    if breakdown is not None:
+        total_cache_size, missing_items = calculate_selected_size_from_breakdown(
+            breakdown, selected_cleanup_items
+        )
+        for item_id in missing_items:
+            logger.log_message(
+                f"CALC_SIZE: Item selecionado '{item_id}' não encontrado no detalhamento de '{project_path}'.",
+                level="WARNING",
+            )
+        logger.log_message(
+            f"CALC_SIZE: Tamanho total do cache selecionado para '{project_path}': {format_size(total_cache_size)}",
+            level="INFO",
+        )
+        return total_cache_size
+
+    processed_main_folders_for_loose_files = (
+        set()
+    )  # Para não contar arquivos soltos duas vezes se "Saved" e "Saved/Logs" estiverem implicitamente relacionados
+
+    for item_id in selected_cleanup_items:
+        item_path_abs = os.path.join(project_path, item_id)  # Monta o caminho completo
+
+        # Verifica se o item_id é um nome de pasta principal (para arquivos soltos)
+        # ou um caminho de subpasta.
+        # Uma forma de distinguir: item_id não contém separador de diretório se for pasta principal.
+        is_main_folder_for_loose_files = os.sep not in item_id and item_id in [
+            "Intermediate",
+            "DerivedDataCache",
+            "Saved",
+        ]
+
+        if is_main_folder_for_loose_files:
+            if item_id in processed_main_folders_for_loose_files:
+                continue  # Já processamos os arquivos soltos desta pasta principal
+
+            if trace_enabled:
+                logger.log_message(
+                    f"CALC_SIZE: Calculando tamanho de arquivos soltos em '{item_path_abs}'...",
+                    level="TRACE",
+                )
+            if os.path.exists(item_path_abs) and os.path.isdir(item_path_abs):
+                try:
+                    # Apenas a listagem direta da pasta (sem recursão), via DirEntry.stat()
+                    size_loose_files, _ = _scan_directory_entries(item_path_abs)
+                    if debug_enabled:
+                        logger.log_message(
+                            f"CALC_SIZE: Tamanho de arquivos soltos em '{item_id}': {format_size(size_loose_files)}",
+                            level="DEBUG",
+                        )
+                    total_cache_size += size_loose_files
+                    processed_main_folders_for_loose_files.add(item_id)
+                except Exception as e_list_loose:
+                    logger.log_message(
+                        f"CALC_SIZE: Erro ao listar arquivos soltos em '{item_path_abs}': {e_list_loose}",
+                        level="ERROR",
+                    )
+            else:
+                logger.log_message(
+                    f"CALC_SIZE: Pasta principal '{item_path_abs}' não encontrada para cálculo de arquivos soltos.",
+                    level="WARNING",
+                )
+
+        else:  # É um caminho de subpasta
+            if trace_enabled:
+                logger.log_message(
+                    f"CALC_SIZE: Calculando tamanho da subpasta '{item_path_abs}'...",
+                    level="TRACE",
+                )
+            if os.path.exists(item_path_abs) and os.path.isdir(item_path_abs):
+                size_subfolder = get_folder_size(
+                    item_path_abs, size_index
+                )  # Recursivo; reaproveita o índice persistente de tamanhos
+                if debug_enabled:
+                    logger.log_message(
+                        f"CALC_SIZE: Tamanho de '{item_id}': {format_size(size_subfolder)}",
+                        level="DEBUG",
+                    )
+                total_cache_size += size_subfolder
+            else:
+                logger.log_message(
+                    f"CALC_SIZE: Subpasta '{item_path_abs}' não encontrada para cálculo.",
+                    level="WARNING",
+                )
+
+    logger.log_message(
+        f"CALC_SIZE: Tamanho total do cache selecionado para '{project_path}': {format_size(total_cache_size)}",
+        level="INFO",
+    )
+    return total_cache_size
@@ -0,0 +1,390 @@
+"""Observação das pastas de cache (inotify no Linux, polling nos demais casos)."""
+
+import ctypes
+import errno
+import os
+import select
+import struct
+import sys
+import time
+
+from .config import POTENTIAL_CACHE_MAIN_FOLDERS
+from .sizes import scan_project_cache_breakdown
+
+
+MONITORING_MODE_INTERVAL = "interval"
+MONITORING_MODE_WATCH = "watch"
+# Tempo sem novos eventos antes de entregar um lote de mudanças (agrupa rajadas de escrita).
+WATCH_SETTLE_SECONDS = 0.5
+# Intervalo mínimo entre varreduras dos projetos que estão no modo de polling (fallback).
+WATCH_POLLING_MIN_INTERVAL_SECONDS = 5
+# Máximo de tamanhos de arquivo lembrados entre eventos. Acima disso os mais antigos são
+# esquecidos; um novo evento neles marca o item para ser medido de novo.
+WATCH_MAX_KNOWN_FILE_SIZES = 50000
+
+# Constantes do inotify (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+_INOTIFY_ROOT_MASK = _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_ONLYDIR
+_INOTIFY_CACHE_MASK = (
+    _INOTIFY_ROOT_MASK | _IN_MODIFY | _IN_CLOSE_WRITE | _IN_ATTRIB | _IN_DELETE_SELF
+)
+
+
+def _load_inotify_libc():
+    """Carrega a libc com as funções do inotify. Retorna None fora do Linux ou se indisponível."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class CacheChangeWatcher:
+    """
+    Observa as pastas de cache (Intermediate, DerivedDataCache, Saved) dos projetos monitorados
+    e acumula, por item de limpeza, a variação de bytes desde a última consulta.
+
+    No Linux usa inotify (um watch por pasta, recursivo); projetos que não puderem ser observados
+    (outro sistema, limite de watches do kernel) caem no modo de polling, que compara o tamanho
+    de cada item via índice de tamanhos. Projetos parados não geram nenhum acesso ao disco no
+    modo inotify.
+
+    wait_for_changes retorna {chave_do_projeto: {item_id: {"delta": bytes, "dirty": bool}}}.
+    "dirty" indica que a variação não é conhecida e o item precisa ser medido de novo; o item
+    especial ALL_ITEMS indica que todos os itens do projeto precisam ser medidos de novo.
+    """
+
+    ALL_ITEMS = "*"
+
+    def __init__(self, logger, size_index=None):
+        self.logger = logger
+        self.size_index = size_index
+        self._watched_projects = {}  # chave -> caminho do projeto
+        self._pending_changes = {}
+        self._libc = _load_inotify_libc()
+        self._inotify_fd = None
+        self._watch_paths = {}  # wd -> (chave, caminho da pasta)
+        self._project_watch_descriptors = {}  # chave -> {wd}
+        # caminho do arquivo -> tamanho visto no último evento (mais antigos primeiro)
+        self._known_file_sizes = {}
+        self._polling_item_sizes = {}  # chave -> {item_id: bytes}
+        self._last_poll_time = 0.0
+
+        if self._libc is not None:
+            fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd >= 0:
+                self._inotify_fd = fd
+            else:
+                logger.log_message(
+                    f"WATCHER: inotify indisponível ({os.strerror(ctypes.get_errno())}). Usando polling.",
+                    level="WARNING",
+                )
+
+    @staticmethod
+    def project_key(project_path):
+        return os.path.normcase(os.path.normpath(project_path))
+
+    @property
+    def uses_inotify(self):
+        return self._inotify_fd is not None
+
+    def set_watched_projects(self, project_paths):
+        """Atualiza o conjunto de projetos observados, adicionando/removendo watches conforme necessário."""
+        wanted = {self.project_key(path): path for path in project_paths}
+        for key in list(self._watched_projects):
+            if key not in wanted:
+                self._unwatch_project(key)
+        for key, path in wanted.items():
+            if key not in self._watched_projects:
+                self._watched_projects[key] = path
+                if self._inotify_fd is not None and self._watch_project_tree(key, path):
+                    continue
+                self._polling_item_sizes[key] = self._measure_items_by_polling(path)
+
+    def close(self):
+        for key in list(self._watched_projects):
+            self._unwatch_project(key)
+        if self._inotify_fd is not None:
+            try:
+                os.close(self._inotify_fd)
+            except OSError:
+                pass
+            self._inotify_fd = None
+
+    def wait_for_changes(self, polling_interval, stop_event):
+        """
+        Bloqueia até haver mudanças (e elas se acalmarem por WATCH_SETTLE_SECONDS), até
+        'polling_interval' segundos se passarem ou até 'stop_event' ser sinalizado.
+        """
+        deadline = time.monotonic() + polling_interval
+        last_event_time = None
+        while not stop_event.is_set():
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wait_slice = min(1.0, deadline - now)
+            if last_event_time is not None:
+                quiet_for = now - last_event_time
+                if quiet_for >= WATCH_SETTLE_SECONDS:
+                    break
+                wait_slice = min(wait_slice, WATCH_SETTLE_SECONDS - quiet_for)
+            if self._inotify_fd is not None:
+                if self._read_inotify_events(wait_slice):
+                    last_event_time = time.monotonic()
+            else:
+                stop_event.wait(wait_slice)
+
+        if self._polling_item_sizes and not stop_event.is_set():
+            now = time.monotonic()
+            if now - self._last_poll_time >= max(
+                polling_interval, WATCH_POLLING_MIN_INTERVAL_SECONDS
+            ):
+                self._last_poll_time = now
+                self._poll_projects()
+
+        changes, self._pending_changes = self._pending_changes, {}
+        return changes
+
+    # --- Registro de mudanças ---
+
+    def _record_change(self, key, item_id, delta=0, dirty=False):
+        change = self._pending_changes.setdefault(key, {}).setdefault(
+            item_id, {"delta": 0, "dirty": False}
+        )
+        change["delta"] += delta
+        change["dirty"] = change["dirty"] or dirty
+
+    def _item_for_path(self, key, path, is_dir):
+        """Mapeia um caminho dentro do projeto para o item de limpeza correspondente (ou None)."""
+        project_path = self._watched_projects.get(key)
+        if project_path is None:
+            return None
+        parts = os.path.relpath(path, project_path).split(os.sep)
+        if parts[0] not in POTENTIAL_CACHE_MAIN_FOLDERS:
+            return None
+        if len(parts) == 1:
+            return self.ALL_ITEMS  # Uma pasta principal inteira surgiu ou sumiu
+        if len(parts) == 2 and not is_dir:
+            return parts[0]  # Arquivo solto na pasta principal
+        return os.path.normpath(os.path.join(parts[0], parts[1]))
+
+    # --- Backend inotify ---
+
+    def _add_watch(self, key, dir_path, mask):
+        wd = self._libc.inotify_add_watch(
+            self._inotify_fd, os.fsencode(dir_path), mask
+        )
+        if wd < 0:
+            return ctypes.get_errno()
+        self._watch_paths[wd] = (key, dir_path)
+        self._project_watch_descriptors.setdefault(key, set()).add(wd)
+        return 0
+
+    def _watch_directory_recursive(self, key, dir_path):
+        """Adiciona watches em 'dir_path' e em todas as subpastas. Retorna False se o limite foi atingido."""
+        stack = [dir_path]
+        while stack:
+            current = stack.pop()
+            error = self._add_watch(key, current, _INOTIFY_CACHE_MASK)
+            if error == errno.ENOSPC:
+                return False
+            if error:
+                continue  # Pasta removida no meio do caminho, sem permissão, etc.
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return True
+
+    def _watch_project_tree(self, key, project_path):
+        ok = self._add_watch(key, project_path, _INOTIFY_ROOT_MASK) != errno.ENOSPC
+        for folder_name in POTENTIAL_CACHE_MAIN_FOLDERS:
+            if not ok:
+                break
+            abs_folder_path = os.path.join(project_path, folder_name)
+            if os.path.isdir(abs_folder_path):
+                ok = self._watch_directory_recursive(key, abs_folder_path)
+        if ok:
+            self.logger.log_message(
+                f"WATCHER: Observando '{project_path}' via inotify ({len(self._project_watch_descriptors.get(key, ()))} pastas).",
+                level="DEBUG",
+            )
+            return True
+        self._remove_project_watches(key)
+        self.logger.log_message(
+            f"WATCHER: Limite de watches do inotify atingido em '{project_path}'. Usando polling para este projeto "
+            "(aumente fs.inotify.max_user_watches para evitar).",
+            level="WARNING",
+        )
+        return False
+
+    def _remove_project_watches(self, key):
+        for wd in self._project_watch_descriptors.pop(key, set()):
+            self._watch_paths.pop(wd, None)
+            if self._inotify_fd is not None:
+                self._libc.inotify_rm_watch(self._inotify_fd, wd)
+
+    def _unwatch_project(self, key):
+        self._remove_project_watches(key)
+        self._polling_item_sizes.pop(key, None)
+        self._pending_changes.pop(key, None)
+        project_path = self._watched_projects.pop(key, None)
+        if project_path is not None:
+            prefix = os.path.join(project_path, "")
+            self._known_file_sizes = {
+                path: size
+                for path, size in self._known_file_sizes.items()
+                if not path.startswith(prefix)
+            }
+
+    def _read_inotify_events(self, timeout):
+        """Lê e processa os eventos disponíveis em até 'timeout' segundos. Retorna True se houve eventos."""
+        try:
+            readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+        except (OSError, ValueError):
+            return False
+        if not readable:
+            return False
+
+        files_to_stat = {}  # caminho -> (chave, item_id, arquivo_novo)
+        got_events = False
+        while True:
+            try:
+                buffer = os.read(self._inotify_fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                break
+            if not buffer:
+                break
+            got_events = True
+            offset = 0
+            while offset + _INOTIFY_EVENT_HEADER.size <= len(buffer):
+                wd, mask, _, name_len = _INOTIFY_EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _INOTIFY_EVENT_HEADER.size
+                raw_name = buffer[offset : offset + name_len].split(b"\0", 1)[0]
+                offset += name_len
+                self._handle_inotify_event(wd, mask, os.fsdecode(raw_name), files_to_stat)
+
+        # Um único stat por arquivo alterado no lote, não importa quantos eventos ele gerou
+        for file_path, (key, item_id, is_new_file) in files_to_stat.items():
+            try:
+                new_size = os.stat(file_path).st_size
+            except OSError:
+                continue  # Já removido; o IN_DELETE correspondente cuida da contagem
+            old_size = self._known_file_sizes.pop(file_path, None)
+            self._remember_file_size(file_path, new_size)
+            if old_size is None and not is_new_file:
+                # Arquivo pré-existente alterado: o tamanho anterior é desconhecido
+                self._record_change(key, item_id, dirty=True)
+            else:
+                self._record_change(key, item_id, delta=new_size - (old_size or 0))
+        return got_events
+
+    def _remember_file_size(self, file_path, size):
+        """Guarda o tamanho do arquivo, esquecendo os mais antigos acima do limite."""
+        self._known_file_sizes[file_path] = size
+        while len(self._known_file_sizes) > WATCH_MAX_KNOWN_FILE_SIZES:
+            del self._known_file_sizes[next(iter(self._known_file_sizes))]
+
+    def _handle_inotify_event(self, wd, mask, name, files_to_stat):
+        if mask & _IN_Q_OVERFLOW:
+            self.logger.log_message(
+                "WATCHER: Fila do inotify estourou; todos os projetos serão medidos novamente.",
+                level="WARNING",
+            )
+            for key, project_path in self._watched_projects.items():
+                if key in self._project_watch_descriptors:
+                    self._record_change(key, self.ALL_ITEMS, dirty=True)
+                    if self.size_index is not None:
+                        for folder_name in POTENTIAL_CACHE_MAIN_FOLDERS:
+                            self.size_index.forget(os.path.join(project_path, folder_name))
+            return
+        if mask & _IN_IGNORED:
+            watch = self._watch_paths.pop(wd, None)
+            if watch is not None:
+                self._project_watch_descriptors.get(watch[0], set()).discard(wd)
+            return
+
+        watch = self._watch_paths.get(wd)
+        if watch is None or not name:
+            return
+        key, dir_path = watch
+        path = os.path.join(dir_path, name)
+        is_dir = bool(mask & _IN_ISDIR)
+        item_id = self._item_for_path(key, path, is_dir)
+        if item_id is None:
+            return
+
+        if is_dir:
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                if not self._watch_directory_recursive(key, path):
+                    self.logger.log_message(
+                        f"WATCHER: Limite de watches do inotify atingido ao observar '{path}'.",
+                        level="WARNING",
+                    )
+            self._record_change(key, item_id, dirty=True)
+        elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+            files_to_stat.pop(path, None)
+            old_size = self._known_file_sizes.pop(path, None)
+            if old_size is None:
+                self._record_change(key, item_id, dirty=True)
+            else:
+                self._record_change(key, item_id, delta=-old_size)
+        elif mask & (_IN_CREATE | _IN_MOVED_TO | _IN_MODIFY | _IN_CLOSE_WRITE | _IN_ATTRIB):
+            is_new_file = bool(mask & (_IN_CREATE | _IN_MOVED_TO))
+            if path in files_to_stat:
+                is_new_file = is_new_file or files_to_stat[path][2]
+            elif not is_new_file and self.size_index is not None:
+                # Alteração no lugar não muda o mtime da pasta: a entrada do índice fica obsoleta
+                self.size_index.invalidate(dir_path)
+            files_to_stat[path] = (key, item_id, is_new_file)
+
+    # --- Backend de polling ---
+
+    def _measure_items_by_polling(self, project_path):
+        """Tamanho de cada item de limpeza do projeto, via índice de tamanhos (um stat por pasta)."""
+        breakdown = scan_project_cache_breakdown(
+            project_path, self.logger, self.size_index
+        )
+        item_sizes = {}
+        for folder_name, folder_info in breakdown["main_folders"].items():
+            item_sizes[folder_name] = folder_info["loose"]
+            item_sizes.update(folder_info["subfolders"])
+        return item_sizes
+
+    def _poll_projects(self):
+        for key, previous_sizes in list(self._polling_item_sizes.items()):
+            current_sizes = self._measure_items_by_polling(self._watched_projects[key])
+            for item_id in set(previous_sizes) | set(current_sizes):
+                delta = current_sizes.get(item_id, 0) - previous_sizes.get(item_id, 0)
+                if delta:
+                    self._record_change(key, item_id, delta=delta)
+            self._polling_item_sizes[key] = current_sizes